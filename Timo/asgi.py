@@ -1,10 +1,19 @@
+import os
+
 from channels.routing import ProtocolTypeRouter, URLRouter
 from django.core.asgi import get_asgi_application
-import chats.routing
-from chats.middleware.jwt_auth_middleware import JWTAuthMiddleware
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Timo.settings')
+
+# Initialize Django (apps registry) before importing consumers/models
+django_asgi_app = get_asgi_application()
+
+import chats.routing  # noqa: E402
+from chats.middleware.jwt_auth_middleware import JWTAuthMiddleware  # noqa: E402
+from utils.metrics import MetricsASGIMiddleware  # noqa: E402
 
 application = ProtocolTypeRouter({
-    "http": get_asgi_application(),
+    "http": MetricsASGIMiddleware(django_asgi_app),
     "websocket": JWTAuthMiddleware(
         URLRouter(
             chats.routing.websocket_urlpatterns
@@ -34,6 +34,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'utils.profiling.RequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -99,6 +100,8 @@ REST_FRAMEWORK = {
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_PAGINATION_CLASS': 'utils.pagination.EnvelopeCursorPagination',
+    'DEFAULT_FILTER_BACKENDS': ('utils.filters.QueryParamFilterBackend',),
 }
 
 SIMPLE_JWT = {
@@ -127,6 +130,97 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Shared cache: Redis when REDIS_CACHE_URL is set (e.g. redis://127.0.0.1:6379/2),
+# otherwise a per-process locmem cache (tests, local development)
+REDIS_CACHE_URL = os.environ.get("REDIS_CACHE_URL")
+if REDIS_CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_CACHE_URL,
+            "KEY_PREFIX": "timo",
+            "TIMEOUT": 300,
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "timo",
+            "TIMEOUT": 300,
+        },
+    }
+# Default lifetime of utils.cache.cached_queryset entries and cached team
+# task boards (tasks.services.dashboard), in seconds
+CACHE_QUERYSET_TIMEOUT = int(os.environ.get("CACHE_QUERYSET_TIMEOUT", 300))
+
 
 MONGO_URI = os.environ.get("MONGO_URI")
 MONGO_DB_NAME = os.environ.get("MONGO_DB_NAME")
+
+# Websocket flood protection: event -> {"user"|"chat": (tokens per second, burst)}
+CHAT_RATE_LIMITS = {
+    "message": {"user": (5, 10), "chat": (50, 100)},
+    "typing": {"user": (2, 5), "chat": (20, 40)},
+    "seen": {"user": (10, 20), "chat": (100, 200)},
+    "edit": {"user": (2, 10), "chat": (20, 40)},
+    "delete": {"user": (2, 10), "chat": (20, 40)},
+    "react": {"user": (5, 20), "chat": (50, 100)},
+    "unreact": {"user": (5, 20), "chat": (50, 100)},
+}
+# Consecutive over-limit frames before the socket is closed
+CHAT_RATE_LIMIT_MAX_VIOLATIONS = int(os.environ.get("CHAT_RATE_LIMIT_MAX_VIOLATIONS", 20))
+# Optional Redis URL to share buckets across processes (e.g. redis://127.0.0.1:6379/1)
+CHAT_RATE_LIMIT_REDIS_URL = os.environ.get("CHAT_RATE_LIMIT_REDIS_URL")
+
+# Websocket frame limits (checked before JSON decoding)
+CHAT_MAX_FRAME_BYTES = int(os.environ.get("CHAT_MAX_FRAME_BYTES", 16 * 1024))
+CHAT_MAX_MESSAGE_LENGTH = int(os.environ.get("CHAT_MAX_MESSAGE_LENGTH", 4000))
+
+# Prometheus-style metrics, scraped from METRICS_PATH on the ASGI app
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "False") == "True"
+METRICS_BACKEND = os.environ.get("METRICS_BACKEND", "utils.metrics.InMemoryBackend")
+METRICS_PATH = os.environ.get("METRICS_PATH", "/metrics")
+
+# Chat attachments: "filesystem" (MEDIA_ROOT) or "gridfs"
+CHAT_ATTACHMENT_STORAGE = os.environ.get("CHAT_ATTACHMENT_STORAGE", "filesystem")
+CHAT_ATTACHMENT_MAX_SIZE = int(os.environ.get("CHAT_ATTACHMENT_MAX_SIZE", 100 * 1024 * 1024))
+CHAT_ATTACHMENT_MAX_CHUNK_SIZE = int(os.environ.get("CHAT_ATTACHMENT_MAX_CHUNK_SIZE", 5 * 1024 * 1024))
+
+# Who broadcasts persisted message events: "consumer" (the writing process)
+# or "change_stream" (run `manage.py run_message_fanout`; needs a replica set)
+CHAT_FANOUT_MODE = os.environ.get("CHAT_FANOUT_MODE", "consumer")
+CHAT_FANOUT_CHECKPOINT_EVERY = int(os.environ.get("CHAT_FANOUT_CHECKPOINT_EVERY", 1))
+
+# Seconds a user's cached chat membership set (chat ACL) is kept
+CHAT_ACL_CACHE_TIMEOUT = int(os.environ.get("CHAT_ACL_CACHE_TIMEOUT", 300))
+
+# List endpoints (utils.pagination.EnvelopeCursorPagination)
+API_PAGE_SIZE = int(os.environ.get("API_PAGE_SIZE", 50))
+API_MAX_PAGE_SIZE = int(os.environ.get("API_MAX_PAGE_SIZE", 200))
+
+# Per-request SQL/Mongo counts and Server-Timing headers (utils.profiling);
+# views declare limits with @query_budget. Budget mode: "log", "raise" (CI) or "off"
+REQUEST_PROFILING_ENABLED = os.environ.get("REQUEST_PROFILING_ENABLED", str(DEBUG)) == "True"
+QUERY_BUDGET_MODE = os.environ.get("QUERY_BUDGET_MODE", "log")
+
+# Bulk task / assignment endpoints: items accepted per request, rows per INSERT
+TASK_BULK_MAX_ITEMS = int(os.environ.get("TASK_BULK_MAX_ITEMS", 1000))
+TASK_BULK_BATCH_SIZE = int(os.environ.get("TASK_BULK_BATCH_SIZE", 500))
+
+# Task deadline events (run `manage.py run_deadline_scheduler`): task writes
+# notify the worker over the channel layer only when enabled
+TASK_DEADLINES_ENABLED = os.environ.get("TASK_DEADLINES_ENABLED", "False") == "True"
+# Seconds before a due date to send task_due_soon (0 = no reminders)
+TASK_DEADLINE_REMINDER_LEAD = int(os.environ.get("TASK_DEADLINE_REMINDER_LEAD", 3600))
+# Seconds of upcoming deadlines the worker keeps in memory, and rows per load
+TASK_DEADLINE_LOOKAHEAD = int(os.environ.get("TASK_DEADLINE_LOOKAHEAD", 900))
+TASK_DEADLINE_BATCH_SIZE = int(os.environ.get("TASK_DEADLINE_BATCH_SIZE", 1000))
+# Status an overdue active task is moved to (e.g. "inactive"); empty = unchanged
+TASK_DEADLINE_EXPIRE_STATUS = os.environ.get("TASK_DEADLINE_EXPIRE_STATUS", "")
+
+# Send task/assignment/note changes to the team websocket on commit (tasks.services.activity)
+TASK_ACTIVITY_ENABLED = os.environ.get("TASK_ACTIVITY_ENABLED", "True") == "True"
+
+# Longest series /api/teams/<id>/analytics/ returns (e.g. 366 daily buckets)
+TEAM_ANALYTICS_MAX_BUCKETS = int(os.environ.get("TEAM_ANALYTICS_MAX_BUCKETS", 366))
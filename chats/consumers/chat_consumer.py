@@ -1,8 +1,30 @@
 import json
+import time
+from django.conf import settings
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
-from ..models.chat_member import ChatMember
+from chats.errors.loader import get_error
+from utils import metrics
+from ..models.attachment import ChatAttachment
 from ..mongo.message_repository import MessageRepository
+from ..services.attachment_service import AttachmentService
+from ..services.chat_acl import ChatACL
+from ..services.message_events import (
+    MESSAGE_CREATED,
+    MESSAGE_DELETED,
+    MESSAGE_EDITED,
+    MESSAGE_REACTION,
+    change_stream_fanout_enabled,
+    chat_group_name,
+    group_message,
+    message_event_payload,
+    reaction_event_payload,
+)
+from ..services.rate_limiter import ChatRateLimiter
+from .frame_schema import EVENT_SCHEMAS, FrameError, parse_frame
+
+# Close code used when a client keeps flooding after being rate limited
+RATE_LIMIT_CLOSE_CODE = 4008
 
 
 class ChatConsumer(AsyncWebsocketConsumer):
@@ -12,23 +34,32 @@ class ChatConsumer(AsyncWebsocketConsumer):
     Features:
       - JWT auth via middleware (scope["user"])
       - Mongo message persistence
-      - Broadcast events: message, typing, seen, presence
+      - Broadcast events: message, edit, delete, reaction, typing, seen, presence
+      - Reply / reaction counters kept on the parent message
+      - Per-user / per-chat rate limiting (token bucket)
+      - Frame size limit and per-event schema validation
+      - Hot-path metrics (utils.metrics; no-op when METRICS_ENABLED is off)
       - Async & high-performance
     """
 
     async def connect(self):
+        started = time.perf_counter()
+        self.rate_limit_violations = 0
         self.user = self.scope["user"]
         self.chat_id = int(self.scope["url_route"]["kwargs"]["chat_id"])
-        self.group_name = f"chat_{self.chat_id}"
+        self.group_name = chat_group_name(self.chat_id)
 
         # 1️⃣ Authentication
         if not self.user or not self.user.is_authenticated:
+            metrics.inc("chat_connect_rejects_total", code="4001")
             await self.close(code=4001)
             return
 
         # 2️⃣ Authorization: check membership
-        is_member = await self._is_chat_member()
+        with metrics.timer("chat_membership_check_seconds"):
+            is_member = await self._is_chat_member()
         if not is_member:
+            metrics.inc("chat_connect_rejects_total", code="4003")
             await self.close(code=4003)
             return
 
@@ -38,6 +69,8 @@ class ChatConsumer(AsyncWebsocketConsumer):
             self.channel_name
         )
         await self.accept()
+        metrics.inc("chat_connects_total")
+        metrics.observe("chat_connect_seconds", time.perf_counter() - started)
 
         # 4️⃣ Notify presence
         await self._broadcast_event(
@@ -59,68 +92,205 @@ class ChatConsumer(AsyncWebsocketConsumer):
         )
 
     async def receive(self, text_data=None, bytes_data=None):
-        data = json.loads(text_data)
-        event = data.get("event")
+        try:
+            data = parse_frame(text_data)
+            event = data.get("event")
+            handler = self.EVENT_HANDLERS.get(event)
+            if handler is None:
+                raise FrameError("CHATS_002004", {"event": event})
+        except FrameError as exc:
+            metrics.inc("chat_frame_rejects_total", code=exc.error_key)
+            await self._send_error(exc.error_key, detail=exc.detail)
+            return
+
+        if not await self._check_rate_limit(event):
+            return
+
+        try:
+            payload = EVENT_SCHEMAS[event](data)
+        except FrameError as exc:
+            metrics.inc("chat_frame_rejects_total", code=exc.error_key)
+            await self._send_error(exc.error_key, detail=exc.detail, rejected_event=event)
+            return
+
+        metrics.inc("chat_events_total", event=event)
+        await handler(self, payload)
+
+    async def _send_error(self, error_key: str, detail=None, **extra):
+        """
+        Send a structured error frame to this socket only.
+        """
+        error = dict(get_error(error_key))
+        if detail is not None:
+            error["detail"] = detail
+        await self.send(text_data=json.dumps({
+            "event": "error",
+            "error": error,
+            **extra,
+        }))
+
+    async def _check_rate_limit(self, event) -> bool:
+        """
+        Consume a token for this event. Over-limit frames get a structured
+        error; clients that keep flooding are disconnected.
+        """
+        allowed, retry_after = await ChatRateLimiter.allow(
+            event=event,
+            user_id=self.user.id,
+            chat_id=self.chat_id,
+        )
+        if allowed:
+            self.rate_limit_violations = 0
+            return True
 
-        # Event dispatch
-        handlers = {
-            "typing": self._handle_typing,
-            "seen": lambda: self._handle_seen(data),
-            "message": lambda: self._handle_message(data),
-        }
+        self.rate_limit_violations += 1
+        metrics.inc("chat_rate_limited_total", event=event)
+        await self._send_error(
+            "CHATS_002001",
+            rejected_event=event,
+            retry_after=round(retry_after, 3),
+        )
 
-        handler = handlers.get(event)
-        if handler:
-            await handler()
+        max_violations = getattr(settings, "CHAT_RATE_LIMIT_MAX_VIOLATIONS", 20)
+        if self.rate_limit_violations >= max_violations:
+            await self.close(code=RATE_LIMIT_CLOSE_CODE)
+        return False
 
-    async def _handle_typing(self):
+    async def _handle_typing(self, payload):
         await self._broadcast_event(
             event="typing",
             payload={"user_id": self.user.id},
         )
 
-    async def _handle_seen(self, data):
+    async def _handle_seen(self, payload):
         await self._broadcast_event(
             event="seen",
             payload={
                 "user_id": self.user.id,
-                "message_id": data.get("message_id"),
+                "message_id": payload["message_id"],
             },
         )
 
-    async def _handle_message(self, data):
+    async def _handle_message(self, payload):
         """
         Persist message to MongoDB and broadcast to group.
+        `payload` has already been validated by frame_schema.validate_message.
         """
-        content = data.get("content")
-        msg_type = data.get("type", "text")
-        reply_to = data.get("reply_to")
-        file_data = data.get("file")  # optional, dict with file info
+        content = payload["content"]
+        msg_type = payload["type"]
+        reply_to = payload["reply_to"]
+        file_data = None
+
+        # Attachment must have been uploaded to this chat
+        if payload["attachment_id"]:
+            attachment = await self._get_attachment(payload["attachment_id"])
+            if attachment is None:
+                await self._send_error(
+                    "CHATS_003006",
+                    detail={"attachment_id": payload["attachment_id"]},
+                    rejected_event="message",
+                )
+                return
+            file_data = AttachmentService.descriptor(attachment)
 
         # 1️⃣ Save to Mongo
-        message = await database_sync_to_async(MessageRepository.create_message)(
-            chat_id=self.chat_id,
-            sender_id=self.user.id,
+        message = await self._persist_message(
             content=content,
             message_type=msg_type,
             file=file_data,
             reply_to=reply_to,
         )
+        if message is None:
+            await self._send_error(
+                "CHATS_002007",
+                detail={"reply_to": reply_to},
+                rejected_event="message",
+            )
+            return
 
         # 2️⃣ Broadcast
+        await self._broadcast_message_event(MESSAGE_CREATED, message)
+
+    async def _handle_edit(self, payload):
+        """
+        Edit one of the user's own messages and broadcast the new content.
+        """
+        with metrics.timer("chat_persist_seconds"):
+            message = await database_sync_to_async(MessageRepository.edit_message)(
+                chat_id=self.chat_id,
+                message_id=payload["message_id"],
+                user_id=self.user.id,
+                content=payload["content"],
+            )
+        if message is None:
+            await self._send_error("CHATS_002006", rejected_event="edit")
+            return
+
+        await self._broadcast_message_event(MESSAGE_EDITED, message)
+
+    async def _handle_delete(self, payload):
+        """
+        Soft-delete one of the user's own messages and broadcast a tombstone.
+        """
+        with metrics.timer("chat_persist_seconds"):
+            message = await database_sync_to_async(MessageRepository.delete_message)(
+                chat_id=self.chat_id,
+                message_id=payload["message_id"],
+                user_id=self.user.id,
+            )
+        if message is None:
+            await self._send_error("CHATS_002006", rejected_event="delete")
+            return
+
+        await self._broadcast_message_event(MESSAGE_DELETED, message)
+
+    async def _handle_react(self, payload):
+        await self._change_reaction(payload, added=True)
+
+    async def _handle_unreact(self, payload):
+        await self._change_reaction(payload, added=False)
+
+    async def _change_reaction(self, payload, *, added: bool):
+        """
+        Add or withdraw the user's reaction and broadcast the message's
+        updated counters.
+        """
+        update = MessageRepository.add_reaction if added else MessageRepository.remove_reaction
+        with metrics.timer("chat_persist_seconds"):
+            message = await database_sync_to_async(update)(
+                chat_id=self.chat_id,
+                message_id=payload["message_id"],
+                user_id=self.user.id,
+                emoji=payload["emoji"],
+            )
+        if message is None:
+            await self._send_error("CHATS_002006", rejected_event="react" if added else "unreact")
+            return
+
         await self._broadcast_event(
-            event="message",
-            payload={
-                "id": str(message["_id"]),
-                "user_id": self.user.id,
-                "content": content,
-                "type": msg_type,
-                "file": file_data,
-                "reply_to": reply_to,
-                "created_at": message["created_at"].isoformat(),
-            },
+            event=MESSAGE_REACTION,
+            payload=reaction_event_payload(message, user_id=self.user.id, emoji=payload["emoji"], added=added),
         )
 
+    async def _persist_message(self, **fields) -> dict:
+        with metrics.timer("chat_persist_seconds"):
+            return await database_sync_to_async(MessageRepository.create_message)(
+                chat_id=self.chat_id,
+                sender_id=self.user.id,
+                **fields,
+            )
+
+    # Built once per class instead of per frame
+    EVENT_HANDLERS = {
+        "typing": _handle_typing,
+        "seen": _handle_seen,
+        "message": _handle_message,
+        "edit": _handle_edit,
+        "delete": _handle_delete,
+        "react": _handle_react,
+        "unreact": _handle_unreact,
+    }
+
     async def chat_event(self, event):
         await self.send(text_data=json.dumps(event["data"]))
 
@@ -128,23 +298,35 @@ class ChatConsumer(AsyncWebsocketConsumer):
         """
         Broadcast a generic chat event to the group.
         """
-        await self.channel_layer.group_send(
-            self.group_name,
-            {
-                "type": "chat.event",
-                "data": {
-                    "event": event,
-                    **payload,
-                },
-            },
+        with metrics.timer("chat_group_send_seconds", event=event):
+            await self.channel_layer.group_send(
+                self.group_name,
+                group_message(event, payload),
+            )
+
+    async def _broadcast_message_event(self, event: str, message: dict):
+        """
+        Broadcast a persisted message change, unless the change-stream
+        listener is responsible for fan-out.
+        """
+        if change_stream_fanout_enabled():
+            return
+        await self._broadcast_event(
+            event=event,
+            payload=message_event_payload(event, message),
         )
 
     @database_sync_to_async
-    def _is_chat_member(self) -> bool:
+    def _get_attachment(self, attachment_id: str):
+        return ChatAttachment.objects.filter(
+            id=attachment_id,
+            chat_id=self.chat_id,
+        ).first()
+
+    async def _is_chat_member(self) -> bool:
         """
-        Check if the user is member of the chat (private/group)
+        Check if the user is member of the chat (private/group), using the
+        user's cached chat ACL (resolved once per connection).
         """
-        return ChatMember.objects.filter(
-            chat_id=self.chat_id,
-            user=self.user,
-        ).exists()
+        self.chat_acl = await ChatACL.achat_ids(self.user.id)
+        return self.chat_id in self.chat_acl
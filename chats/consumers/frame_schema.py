@@ -0,0 +1,162 @@
+import json
+import uuid
+from typing import Optional
+
+from bson import ObjectId
+from django.conf import settings
+
+MESSAGE_TYPES = frozenset(("text", "image", "video", "audio", "file"))
+
+
+class FrameError(Exception):
+    """
+    Raised when an incoming websocket frame is rejected.
+    `error_key` points at an entry in chats/errors/errors.json.
+    """
+
+    def __init__(self, error_key: str, detail=None):
+        super().__init__(error_key)
+        self.error_key = error_key
+        self.detail = detail
+
+
+def max_frame_bytes() -> int:
+    return getattr(settings, "CHAT_MAX_FRAME_BYTES", 16 * 1024)
+
+
+def max_message_length() -> int:
+    return getattr(settings, "CHAT_MAX_MESSAGE_LENGTH", 4000)
+
+
+# Reactions are stored as `reactions.<emoji>` counters, so keys must be
+# short and must not contain Mongo path characters.
+MAX_REACTION_LENGTH = 32
+
+
+def parse_frame(text_data: Optional[str]) -> dict:
+    """
+    Enforce the size limit before decoding, then decode a JSON object.
+    """
+    if not text_data:
+        raise FrameError("CHATS_002002", "Empty frame.")
+
+    # len() of a str counts characters; a UTF-8 frame can be up to 4x larger
+    # in bytes, so only encode when the cheap check is inconclusive.
+    limit = max_frame_bytes()
+    if len(text_data) > limit or (
+            len(text_data) * 4 > limit and len(text_data.encode("utf-8")) > limit
+    ):
+        raise FrameError("CHATS_002003")
+
+    try:
+        data = json.loads(text_data)
+    except ValueError:
+        raise FrameError("CHATS_002002", "Frame is not valid JSON.")
+
+    if not isinstance(data, dict):
+        raise FrameError("CHATS_002002", "Frame must be a JSON object.")
+    return data
+
+
+def _object_id(value, field: str) -> Optional[str]:
+    if value is None:
+        return None
+    if not isinstance(value, str) or not ObjectId.is_valid(value):
+        raise FrameError("CHATS_002005", {field: "Must be a valid message id."})
+    return value
+
+
+def _attachment_id(value) -> Optional[str]:
+    """
+    Attachments are uploaded through the attachment API first; messages
+    only carry the returned id.
+    """
+    if value is None:
+        return None
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        raise FrameError("CHATS_002005", {"attachment_id": "Must be a valid attachment id."})
+
+
+def validate_typing(data: dict) -> dict:
+    return {}
+
+
+def validate_seen(data: dict) -> dict:
+    message_id = _object_id(data.get("message_id"), "message_id")
+    if message_id is None:
+        raise FrameError("CHATS_002005", {"message_id": "This field is required."})
+    return {"message_id": message_id}
+
+
+def _content(value, required: bool = True) -> Optional[str]:
+    if value is not None and not isinstance(value, str):
+        raise FrameError("CHATS_002005", {"content": "Must be a string."})
+    if value and len(value) > max_message_length():
+        raise FrameError("CHATS_002005", {"content": f"Must be at most {max_message_length()} characters."})
+    if required and not (value and value.strip()):
+        raise FrameError("CHATS_002005", {"content": "Text messages cannot be empty."})
+    return value
+
+
+def validate_message(data: dict) -> dict:
+    content = data.get("content")
+    msg_type = data.get("type", "text")
+    attachment_id = _attachment_id(data.get("attachment_id"))
+
+    if msg_type not in MESSAGE_TYPES:
+        raise FrameError("CHATS_002005", {"type": f"Must be one of: {', '.join(sorted(MESSAGE_TYPES))}."})
+
+    content = _content(content, required=msg_type == "text")
+    if msg_type != "text" and attachment_id is None:
+        raise FrameError("CHATS_002005", {"attachment_id": f"Required for '{msg_type}' messages."})
+
+    return {
+        "content": content,
+        "type": msg_type,
+        "attachment_id": attachment_id,
+        "reply_to": _object_id(data.get("reply_to"), "reply_to"),
+    }
+
+
+def validate_edit(data: dict) -> dict:
+    return {
+        **validate_delete(data),
+        "content": _content(data.get("content")),
+    }
+
+
+def validate_delete(data: dict) -> dict:
+    message_id = _object_id(data.get("message_id"), "message_id")
+    if message_id is None:
+        raise FrameError("CHATS_002005", {"message_id": "This field is required."})
+    return {"message_id": message_id}
+
+
+def validate_reaction(data: dict) -> dict:
+    emoji = data.get("emoji")
+    if (
+            not isinstance(emoji, str)
+            or not emoji.strip()
+            or len(emoji) > MAX_REACTION_LENGTH
+            or "." in emoji
+            or "$" in emoji
+    ):
+        raise FrameError("CHATS_002005", {"emoji": f"Must be a reaction of at most {MAX_REACTION_LENGTH} characters."})
+    return {
+        **validate_delete(data),
+        "emoji": emoji,
+    }
+
+
+# event -> validator returning the cleaned payload
+EVENT_SCHEMAS = {
+    "typing": validate_typing,
+    "seen": validate_seen,
+    "message": validate_message,
+    "edit": validate_edit,
+    "delete": validate_delete,
+    "react": validate_reaction,
+    "unreact": validate_reaction,
+}
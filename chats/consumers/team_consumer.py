@@ -0,0 +1,77 @@
+import json
+from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.db import database_sync_to_async
+from teams.models import TeamMember
+from teams.services.membership import ADMIN_ROLES
+from utils import metrics
+from ..services.team_events import team_admins_group_name, team_group_name, team_member_group_name
+
+
+class TeamConsumer(AsyncWebsocketConsumer):
+    """
+    Server-push WebSocket for team-wide events: announcements, task
+    activity (tasks.services.activity) and task deadlines
+    (tasks.services.deadlines).
+
+    Every connected member joins the `team_<id>` group, so one group_send
+    reaches the whole team. Owners and admins also join the team's admins
+    group and other members their own member group, for events scoped to
+    what the REST endpoints let them see. The role is read at connect.
+    """
+
+    async def connect(self):
+        self.user = self.scope["user"]
+        self.team_id = int(self.scope["url_route"]["kwargs"]["team_id"])
+        self.group_names = []
+
+        # 1️⃣ Authentication
+        if not self.user or not self.user.is_authenticated:
+            metrics.inc("team_connect_rejects_total", code="4001")
+            await self.close(code=4001)
+            return
+
+        # 2️⃣ Authorization: active team member
+        membership = await self._membership()
+        if membership is None:
+            metrics.inc("team_connect_rejects_total", code="4003")
+            await self.close(code=4003)
+            return
+
+        member_id, role = membership
+        self.group_names = [
+            team_group_name(self.team_id),
+            team_admins_group_name(self.team_id) if role in ADMIN_ROLES
+            else team_member_group_name(self.team_id, member_id),
+        ]
+        for group_name in self.group_names:
+            await self.channel_layer.group_add(
+                group_name,
+                self.channel_name
+            )
+        await self.accept()
+        metrics.inc("team_connects_total")
+
+    async def disconnect(self, close_code):
+        for group_name in getattr(self, "group_names", ()):
+            await self.channel_layer.group_discard(
+                group_name,
+                self.channel_name
+            )
+
+    async def receive(self, text_data=None, bytes_data=None):
+        # push-only channel; client frames are ignored
+        pass
+
+    async def team_event(self, event):
+        await self.send(text_data=json.dumps(event["data"]))
+
+    @database_sync_to_async
+    def _membership(self):
+        """
+        (member id, role) of the user's active membership, or None.
+        """
+        return TeamMember.objects.filter(
+            team_id=self.team_id,
+            user=self.user,
+            is_active=True,
+        ).values_list("id", "role").first()
@@ -0,0 +1,50 @@
+import asyncio
+import time
+
+from channels.layers import get_channel_layer
+from django.core.management.base import BaseCommand
+
+from chats.services.team_events import ANNOUNCEMENT, team_group_message, team_group_name
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark announcement fan-out: one group_send to a team group with N "
+        "subscribed channels, using the configured channel layer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--members", type=int, default=10000, help="Channels subscribed to the team group.")
+        parser.add_argument("--team", type=int, default=0, help="Team id used for the benchmark group.")
+
+    def handle(self, *args, **options):
+        asyncio.run(self._run(options["members"], options["team"]))
+
+    async def _run(self, members: int, team_id: int):
+        layer = get_channel_layer()
+        group = team_group_name(team_id)
+
+        started = time.perf_counter()
+        channels = [await layer.new_channel() for _ in range(members)]
+        for channel in channels:
+            await layer.group_add(group, channel)
+        subscribe = time.perf_counter() - started
+
+        message = team_group_message(ANNOUNCEMENT, {"team_id": team_id, "content": "benchmark"})
+        started = time.perf_counter()
+        await layer.group_send(group, message)
+        send = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for channel in channels:
+            await layer.receive(channel)
+        drain = time.perf_counter() - started
+
+        for channel in channels:
+            await layer.group_discard(group, channel)
+
+        self.stdout.write(f"layer       {type(layer).__name__}")
+        self.stdout.write(f"members     {members:,}")
+        self.stdout.write(f"group_add   {subscribe * 1000:>10.1f} ms")
+        self.stdout.write(f"group_send  {send * 1000:>10.1f} ms  (single call)")
+        self.stdout.write(f"receive     {drain * 1000:>10.1f} ms  ({members / drain:,.0f} deliveries/sec)")
@@ -0,0 +1,68 @@
+import asyncio
+import json
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+from bson import ObjectId
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from chats.consumers.chat_consumer import ChatConsumer
+
+FRAMES = {
+    "message": json.dumps({"event": "message", "content": "hello world", "type": "text"}),
+    "typing": json.dumps({"event": "typing"}),
+    "seen": json.dumps({"event": "seen", "message_id": str(ObjectId())}),
+    "malformed": '{"event": "message", "content": ',
+    "invalid": json.dumps({"event": "message", "type": "sticker"}),
+    "oversized": json.dumps({"event": "message", "content": "x" * 64 * 1024}),
+}
+
+
+class BenchmarkConsumer(ChatConsumer):
+    """
+    ChatConsumer with I/O replaced by no-ops, so only frame handling is timed.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.user = SimpleNamespace(id=1, is_authenticated=True)
+        self.chat_id = 1
+        self.group_name = "chat_1"
+        self.rate_limit_violations = 0
+
+    async def send(self, text_data=None, bytes_data=None, close=False):
+        pass
+
+    async def _broadcast_event(self, *, event: str, payload: dict):
+        pass
+
+    async def _persist_message(self, **fields) -> dict:
+        return {"_id": ObjectId(), "created_at": datetime.utcnow(), **fields}
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark ChatConsumer.receive throughput (frames/sec per consumer)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--frames", type=int, default=50000, help="Frames per scenario.")
+
+    def handle(self, *args, **options):
+        count = options["frames"]
+        # Rate limiting would reject almost everything; benchmark it disabled.
+        with override_settings(CHAT_RATE_LIMITS={}):
+            for name, frame in FRAMES.items():
+                elapsed = asyncio.run(self._run(frame, count))
+                self.stdout.write(
+                    f"{name:<10} {count / elapsed:>12,.0f} frames/sec  "
+                    f"({elapsed * 1e6 / count:.2f} µs/frame)"
+                )
+
+    @staticmethod
+    async def _run(frame: str, count: int) -> float:
+        consumer = BenchmarkConsumer()
+        started = time.perf_counter()
+        for _ in range(count):
+            await consumer.receive(text_data=frame)
+        return time.perf_counter() - started
@@ -0,0 +1,105 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the message history endpoints of a running server, e.g.\n"
+        "  uvicorn Timo.asgi:application --workers 1\n"
+        "and compare the async history view with the (sync) changes view, "
+        "which performs a similar Mongo read."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Server under test.")
+        parser.add_argument("--token", required=True, help="JWT access token of a member of the chat.")
+        parser.add_argument("--chat", type=int, required=True, help="Chat id to read history from.")
+        parser.add_argument("--requests", type=int, default=5000, help="Requests per target.")
+        parser.add_argument("--concurrency", type=int, default=1000, help="Concurrent keep-alive connections.")
+
+    def handle(self, *args, **options):
+        base = urlsplit(options["base_url"])
+        if base.scheme != "http":
+            raise CommandError("Only plain http:// targets are supported.")
+
+        chat_id = options["chat"]
+        targets = {
+            "history (async)": f"/api/chats/messages/{chat_id}/?limit=50",
+            "chat list (async)": "/api/chats/",
+            "changes (sync)": f"/api/chats/messages/{chat_id}/changes/?since=1970-01-01T00:00:00&limit=50",
+        }
+        for name, path in targets.items():
+            result = asyncio.run(self._run(
+                host=base.hostname,
+                port=base.port or 80,
+                path=path,
+                token=options["token"],
+                total=options["requests"],
+                concurrency=options["concurrency"],
+            ))
+            self._report(name, result)
+
+    async def _run(self, *, host, port, path, token, total, concurrency):
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            f"Authorization: Bearer {token}\r\n"
+            f"Connection: keep-alive\r\n\r\n"
+        ).encode()
+        remaining = [total]
+        latencies, errors = [], []
+
+        async def worker():
+            reader, writer = await asyncio.open_connection(host, port)
+            try:
+                while remaining[0] > 0:
+                    remaining[0] -= 1
+                    started = time.perf_counter()
+                    writer.write(request)
+                    status = await self._read_response(reader)
+                    latencies.append(time.perf_counter() - started)
+                    if status != 200:
+                        errors.append(status)
+            finally:
+                writer.close()
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(worker() for _ in range(concurrency)), return_exceptions=True)
+        elapsed = time.perf_counter() - started
+        errors.extend(type(r).__name__ for r in results if isinstance(r, Exception))
+        return latencies, errors, elapsed
+
+    @staticmethod
+    async def _read_response(reader) -> int:
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split()[1])
+        headers = dict(line.lower().split(": ", 1) for line in lines[1:] if ": " in line)
+
+        if "content-length" in headers:
+            await reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding") == "chunked":
+            while True:
+                size = int((await reader.readline()).strip(), 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        return status
+
+    def _report(self, name, result):
+        latencies, errors, elapsed = result
+        if not latencies:
+            self.stdout.write(self.style.ERROR(f"{name:<18} no successful requests ({len(errors)} errors)"))
+            return
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.stdout.write(
+            f"{name:<18} {len(latencies) / elapsed:>9,.0f} req/s  "
+            f"p50 {statistics.median(latencies) * 1000:>7.1f} ms  "
+            f"p99 {p99 * 1000:>7.1f} ms  "
+            f"errors {len(errors)}"
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from chats.mongo.announcement_repository import AnnouncementRepository
+from chats.mongo.message_repository import MessageRepository
+
+
+class Command(BaseCommand):
+    help = "Create the MongoDB indexes used by chat message and announcement queries (safe to re-run)."
+
+    def handle(self, *args, **options):
+        MessageRepository.ensure_indexes()
+        AnnouncementRepository.ensure_indexes()
+        self.stdout.write(self.style.SUCCESS("Chat indexes are up to date."))
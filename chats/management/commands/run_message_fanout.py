@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from chats.mongo.change_stream import MessageChangeStreamListener
+
+
+class Command(BaseCommand):
+    help = (
+        "Broadcast message inserts/edits/deletes from the MongoDB change stream to "
+        "chat channel groups. Use with CHAT_FANOUT_MODE='change_stream'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--checkpoint-every",
+            type=int,
+            default=getattr(settings, "CHAT_FANOUT_CHECKPOINT_EVERY", 1),
+            help="Persist the resume token after this many changes.",
+        )
+
+    def handle(self, *args, **options):
+        if getattr(settings, "CHAT_FANOUT_MODE", "consumer") != "change_stream":
+            self.stderr.write(self.style.WARNING(
+                "CHAT_FANOUT_MODE is not 'change_stream'; consumers also broadcast, "
+                "so clients will receive duplicate events."
+            ))
+
+        listener = MessageChangeStreamListener(checkpoint_every=options["checkpoint_every"])
+        self.stdout.write("Listening for message changes...")
+        try:
+            listener.run()
+        except KeyboardInterrupt:
+            listener.stop()
@@ -2,3 +2,4 @@ from .chat import Chat
 from .private_chat import PrivateChat
 from .group_chat import GroupChat
 from .chat_member import ChatMember
+from .attachment import ChatAttachment, ChatAttachmentUpload
@@ -0,0 +1,68 @@
+import uuid
+from django.contrib.auth import get_user_model
+from django.db import models
+from .chat import Chat
+
+User = get_user_model()
+
+
+class ChatAttachment(models.Model):
+    """
+    A file attached to a chat. Blobs are content-addressed by `sha256`,
+    so several attachments may share the same stored file.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    chat = models.ForeignKey(
+        Chat,
+        on_delete=models.CASCADE,
+        related_name="attachments",
+    )
+
+    uploaded_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="chat_attachments",
+    )
+
+    filename = models.CharField(max_length=255)
+    mime_type = models.CharField(max_length=100, blank=True)
+    size = models.PositiveBigIntegerField()
+    sha256 = models.CharField(max_length=64, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "chat_attachment"
+
+
+class ChatAttachmentUpload(models.Model):
+    """
+    An in-progress resumable upload. Chunks are appended at `offset`
+    until it reaches `size`, then the upload becomes a ChatAttachment.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    chat = models.ForeignKey(
+        Chat,
+        on_delete=models.CASCADE,
+        related_name="attachment_uploads",
+    )
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="chat_attachment_uploads",
+    )
+
+    filename = models.CharField(max_length=255)
+    mime_type = models.CharField(max_length=100, blank=True)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "chat_attachment_upload"
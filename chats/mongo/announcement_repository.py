@@ -0,0 +1,75 @@
+from typing import List, Optional
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+
+from .client import MongoConnection
+
+
+class AnnouncementRepository:
+    """
+    MongoDB repository for team announcements.
+    One document per announcement, referencing every chat it targets.
+    """
+
+    COLLECTION_NAME = "announcements"
+
+    @classmethod
+    def _collection(cls):
+        return MongoConnection.get_db()[cls.COLLECTION_NAME]
+
+    @classmethod
+    def ensure_indexes(cls):
+        collection = cls._collection()
+        collection.create_index([("team_id", ASCENDING), ("_id", DESCENDING)])
+        # multikey: announcements shown inside a given chat
+        collection.create_index([("chat_ids", ASCENDING), ("_id", DESCENDING)])
+
+    @classmethod
+    def create_announcement(
+            cls,
+            *,
+            team_id: int,
+            author_id: int,
+            content: str,
+            chat_ids: List[int],
+    ) -> dict:
+        document = {
+            "team_id": team_id,
+            "author_id": author_id,
+            "content": content,
+            "chat_ids": chat_ids,
+            "created_at": datetime.utcnow(),
+        }
+
+        result = cls._collection().insert_one(document)
+        document["_id"] = result.inserted_id
+        return document
+
+    @classmethod
+    def fetch_announcements(
+            cls,
+            *,
+            team_id: Optional[int] = None,
+            chat_id: Optional[int] = None,
+            limit: int = 50,
+            before: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Newest first, for a team or for a single chat.
+        """
+        query = {}
+        if team_id is not None:
+            query["team_id"] = team_id
+        if chat_id is not None:
+            query["chat_ids"] = chat_id
+        if before:
+            query["_id"] = {"$lt": ObjectId(before)}
+
+        return list(
+            cls._collection()
+            .find(query)
+            .sort("_id", -1)
+            .limit(limit)
+        )
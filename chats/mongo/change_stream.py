@@ -0,0 +1,154 @@
+import logging
+import time
+from typing import Optional
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from pymongo.errors import OperationFailure, PyMongoError
+
+from .client import MongoConnection
+from .message_repository import MessageRepository
+from ..services.message_events import (
+    MESSAGE_CREATED,
+    MESSAGE_DELETED,
+    MESSAGE_EDITED,
+    chat_group_name,
+    group_message,
+    message_event_payload,
+)
+
+logger = logging.getLogger(__name__)
+
+# Server error code when a resume token is older than the oplog window
+CHANGE_STREAM_HISTORY_LOST = 286
+
+
+class ResumeTokenStore:
+    """
+    Persists the last processed resume token in a small Mongo collection,
+    so a restarted listener continues where the previous one stopped.
+    """
+
+    COLLECTION_NAME = "change_stream_state"
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def _collection(self):
+        return MongoConnection.get_db()[self.COLLECTION_NAME]
+
+    def load(self) -> Optional[dict]:
+        state = self._collection().find_one({"_id": self.name})
+        return state["token"] if state else None
+
+    def save(self, token: dict):
+        self._collection().update_one(
+            {"_id": self.name},
+            {"$set": {"token": token}},
+            upsert=True,
+        )
+
+    def clear(self):
+        self._collection().delete_one({"_id": self.name})
+
+
+class MessageChangeStreamListener:
+    """
+    Fan out message inserts/edits/deletes from the `messages` change stream
+    to chat channel groups, regardless of which process wrote them (REST,
+    admin tools, batch jobs).
+
+    Requires MongoDB running as a replica set.
+    """
+
+    PIPELINE = [
+        {"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}},
+    ]
+
+    def __init__(self, *, channel_layer=None, token_store=None, checkpoint_every: int = 1):
+        self.channel_layer = channel_layer or get_channel_layer()
+        self.token_store = token_store or ResumeTokenStore("messages_fanout")
+        self.checkpoint_every = max(1, checkpoint_every)
+        self._stopped = False
+
+    @staticmethod
+    def event_for_change(change: dict) -> Optional[str]:
+        """
+        Map a change event to the chat event it should produce.
+        """
+        document = change.get("fullDocument")
+        if not document:
+            return None
+        if change["operationType"] == "insert":
+            return MESSAGE_CREATED
+
+        updated = change.get("updateDescription", {}).get("updatedFields", {})
+        if document.get("deleted"):
+            # only the update that performed the delete, not later writes to a tombstone
+            return MESSAGE_DELETED if "deleted" in updated or change["operationType"] == "replace" else None
+        if "content" in updated or change["operationType"] == "replace":
+            return MESSAGE_EDITED
+        return None
+
+    def handle_change(self, change: dict) -> bool:
+        """
+        Broadcast a single change. Returns True if an event was sent.
+        """
+        event = self.event_for_change(change)
+        if event is None:
+            return False
+
+        document = change["fullDocument"]
+        async_to_sync(self.channel_layer.group_send)(
+            chat_group_name(document["chat_id"]),
+            group_message(event, message_event_payload(event, document)),
+        )
+        return True
+
+    def _watch(self, resume_token):
+        return MessageRepository._collection().watch(
+            self.PIPELINE,
+            full_document="updateLookup",
+            resume_after=resume_token,
+        )
+
+    def run_once(self):
+        """
+        Consume the stream until it closes or stop() is called.
+        """
+        processed = 0
+        with self._watch(self.token_store.load()) as stream:
+            for change in stream:
+                self.handle_change(change)
+                processed += 1
+                if processed % self.checkpoint_every == 0:
+                    self.token_store.save(stream.resume_token)
+                if self._stopped:
+                    break
+            if processed % self.checkpoint_every:
+                self.token_store.save(stream.resume_token)
+
+    def run(self, retry_delay: float = 1.0, max_delay: float = 30.0):
+        """
+        Run forever, reconnecting with exponential backoff on errors.
+        """
+        delay = retry_delay
+        while not self._stopped:
+            try:
+                self.run_once()
+                delay = retry_delay
+            except OperationFailure as exc:
+                if exc.code == CHANGE_STREAM_HISTORY_LOST:
+                    logger.error("Resume token expired; restarting change stream from now")
+                    self.token_store.clear()
+                    continue
+                logger.exception("Change stream failed")
+            except PyMongoError:
+                logger.exception("Change stream connection lost")
+
+            if not self._stopped:
+                time.sleep(delay)
+                delay = min(delay * 2, max_delay)
+
+    def stop(self):
+        self._stopped = True
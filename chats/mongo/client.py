@@ -1,4 +1,6 @@
-from pymongo import MongoClient
+import asyncio
+
+from pymongo import AsyncMongoClient, MongoClient
 from django.conf import settings
 
 
@@ -14,3 +16,27 @@ class MongoConnection:
     @classmethod
     def get_db(cls):
         return cls.get_client()[settings.MONGO_DB_NAME]
+
+
+class AsyncMongoConnection:
+    """
+    Native asyncio client for async views. An AsyncMongoClient is bound to
+    the event loop it was first used on, so one client is kept per loop.
+    """
+
+    _clients = {}
+
+    @classmethod
+    def get_client(cls) -> AsyncMongoClient:
+        loop = asyncio.get_running_loop()
+        client = cls._clients.get(loop)
+        if client is None:
+            # drop clients of loops that have been closed (tests, reloads)
+            for closed in [key for key in cls._clients if key.is_closed()]:
+                del cls._clients[closed]
+            client = cls._clients[loop] = AsyncMongoClient(settings.MONGO_URI)
+        return client
+
+    @classmethod
+    def get_db(cls):
+        return cls.get_client()[settings.MONGO_DB_NAME]
@@ -1,22 +1,55 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from datetime import datetime
 
 from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
-from .client import MongoConnection
+from .client import AsyncMongoConnection, MongoConnection
 
 
 class MessageRepository:
     """
     MongoDB repository for chat messages.
+
+    Reply and reaction totals are kept as counters on the parent message
+    (`reply_count`, `reactions.<emoji>`), so a history page renders them
+    without any per-message aggregation. Who reacted with what lives in
+    `message_reactions`, one document per (message, user, emoji).
     """
 
     COLLECTION_NAME = "messages"
+    REACTIONS_COLLECTION_NAME = "message_reactions"
 
     @classmethod
     def _collection(cls):
         return MongoConnection.get_db()[cls.COLLECTION_NAME]
 
+    @classmethod
+    def _reactions(cls):
+        return MongoConnection.get_db()[cls.REACTIONS_COLLECTION_NAME]
+
+    @classmethod
+    def ensure_indexes(cls):
+        """
+        Create the indexes the repository queries rely on (idempotent).
+        """
+        collection = cls._collection()
+        # history pages: chat + _id range
+        collection.create_index([("chat_id", ASCENDING), ("_id", DESCENDING)])
+        # delta sync: chat + (edited_at, _id) cursor
+        collection.create_index([("chat_id", ASCENDING), ("edited_at", ASCENDING), ("_id", ASCENDING)])
+        # threads: replies of one message in order; only replies are indexed
+        collection.create_index(
+            [("reply_to", ASCENDING), ("_id", ASCENDING)],
+            partialFilterExpression={"reply_to": {"$type": "objectId"}},
+        )
+        # one reaction per (message, user, emoji)
+        cls._reactions().create_index(
+            [("message_id", ASCENDING), ("user_id", ASCENDING), ("emoji", ASCENDING)],
+            unique=True,
+        )
+
     @classmethod
     def create_message(
             cls,
@@ -27,31 +60,83 @@ class MessageRepository:
             message_type: str = "text",
             file: Optional[dict] = None,
             reply_to: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Insert a message. Replies bump the parent's `reply_count`; if the
+        parent is not a live message of the same chat, nothing is written
+        and None is returned.
+        """
+        created_at = datetime.utcnow()
+        if reply_to:
+            parent = cls._collection().update_one(
+                {"_id": ObjectId(reply_to), "chat_id": chat_id, "deleted": False},
+                {"$inc": {"reply_count": 1}, "$set": {"last_reply_at": created_at}},
+            )
+            if not parent.matched_count:
+                return None
+
+        document = cls._new_document(
+            chat_id=chat_id,
+            sender_id=sender_id,
+            content=content,
+            message_type=message_type,
+            file=file,
+            reply_to=reply_to,
+            created_at=created_at,
+        )
+
+        result = cls._collection().insert_one(document)
+        document["_id"] = result.inserted_id
+        return document
+
+    @staticmethod
+    def _new_document(
+            *,
+            chat_id: int,
+            sender_id: int,
+            content: str,
+            created_at: datetime,
+            message_type: str = "text",
+            file: Optional[dict] = None,
+            reply_to: Optional[str] = None,
     ) -> dict:
-        document = {
+        return {
             "chat_id": chat_id,
             "sender_id": sender_id,
             "type": message_type,
             "content": content,
             "file": file,
             "reply_to": ObjectId(reply_to) if reply_to else None,
-            "created_at": datetime.utcnow(),
+            "reply_count": 0,
+            "reactions": {},
+            "created_at": created_at,
             "edited_at": None,
             "deleted": False,
         }
 
-        result = cls._collection().insert_one(document)
-        document["_id"] = result.inserted_id
-        return document
+    @classmethod
+    def bulk_create_messages(cls, messages: Iterable[dict], batch_size: int = 5000) -> int:
+        """
+        Insert plain (non-reply) messages in batches, e.g. for seeding.
+        Each item needs chat_id, sender_id, content and created_at.
+        """
+        inserted = 0
+        batch = []
+        for message in messages:
+            batch.append(cls._new_document(**message))
+            if len(batch) >= batch_size:
+                inserted += len(cls._collection().insert_many(batch, ordered=False).inserted_ids)
+                batch = []
+        if batch:
+            inserted += len(cls._collection().insert_many(batch, ordered=False).inserted_ids)
+        return inserted
 
     @classmethod
-    def fetch_messages(
-            cls,
-            *,
-            chat_id: int,
-            limit: int = 100,
-            before: Optional[str] = None,
-    ) -> List[dict]:
+    def _async_collection(cls):
+        return AsyncMongoConnection.get_db()[cls.COLLECTION_NAME]
+
+    @staticmethod
+    def _history_query(chat_id: int, before: Optional[str]) -> dict:
         query = {
             "chat_id": chat_id,
             "deleted": False,
@@ -59,10 +144,19 @@ class MessageRepository:
 
         if before:
             query["_id"] = {"$lt": ObjectId(before)}
+        return query
 
+    @classmethod
+    def fetch_messages(
+            cls,
+            *,
+            chat_id: int,
+            limit: int = 100,
+            before: Optional[str] = None,
+    ) -> List[dict]:
         cursor = (
             cls._collection()
-            .find(query)
+            .find(cls._history_query(chat_id, before))
             .sort("_id", -1)
             .limit(limit)
         )
@@ -72,11 +166,61 @@ class MessageRepository:
         return messages
 
     @classmethod
-    def soft_delete_message(cls, *, message_id: str, user_id: int) -> bool:
-        result = cls._collection().update_one(
+    async def afetch_messages(
+            cls,
+            *,
+            chat_id: int,
+            limit: int = 100,
+            before: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Async variant of fetch_messages for async views.
+        """
+        cursor = (
+            cls._async_collection()
+            .find(cls._history_query(chat_id, before))
+            .sort("_id", -1)
+            .limit(limit)
+        )
+
+        messages = await cursor.to_list()
+        messages.reverse()  # oldest → newest
+        return messages
+
+    @classmethod
+    def edit_message(cls, *, chat_id: int, message_id: str, user_id: int, content: str) -> Optional[dict]:
+        """
+        Update the content of a sender's own, non-deleted message in chat
+        `chat_id`. Returns the updated document, or None if nothing matched.
+        """
+        return cls._collection().find_one_and_update(
+            {
+                "_id": ObjectId(message_id),
+                "chat_id": chat_id,
+                "sender_id": user_id,
+                "deleted": False,
+            },
+            {
+                "$set": {
+                    "content": content,
+                    "edited_at": datetime.utcnow(),
+                }
+            },
+            return_document=ReturnDocument.AFTER,
+        )
+
+    @classmethod
+    def delete_message(cls, *, chat_id: int, message_id: str, user_id: int) -> Optional[dict]:
+        """
+        Soft-delete a sender's own message in chat `chat_id`. Returns the
+        updated document, or None if nothing matched.
+        """
+        message = cls._collection().find_one_and_update(
             {
                 "_id": ObjectId(message_id),
+                "chat_id": chat_id,
                 "sender_id": user_id,
+                "deleted": False,
             },
             {
                 "$set": {
@@ -84,5 +228,134 @@ class MessageRepository:
                     "edited_at": datetime.utcnow(),
                 }
             },
+            return_document=ReturnDocument.AFTER,
+        )
+        if message is not None and message.get("reply_to"):
+            cls._collection().update_one(
+                {"_id": message["reply_to"], "chat_id": chat_id},
+                {"$inc": {"reply_count": -1}},
+            )
+        return message
+
+    @classmethod
+    def soft_delete_message(cls, *, chat_id: int, message_id: str, user_id: int) -> bool:
+        return cls.delete_message(chat_id=chat_id, message_id=message_id, user_id=user_id) is not None
+
+    @classmethod
+    def fetch_changes(
+            cls,
+            *,
+            chat_id: int,
+            since: datetime,
+            after_id: Optional[str] = None,
+            limit: int = 100,
+    ) -> List[dict]:
+        """
+        Messages edited or deleted after the (since, after_id) cursor,
+        oldest change first. Deleted messages are included as tombstones.
+        """
+        if after_id:
+            query = {
+                "chat_id": chat_id,
+                "$or": [
+                    {"edited_at": {"$gt": since}},
+                    {"edited_at": since, "_id": {"$gt": ObjectId(after_id)}},
+                ],
+            }
+        else:
+            query = {
+                "chat_id": chat_id,
+                "edited_at": {"$gt": since},
+            }
+
+        cursor = (
+            cls._collection()
+            .find(query)
+            .sort([("edited_at", ASCENDING), ("_id", ASCENDING)])
+            .limit(limit)
+        )
+        return list(cursor)
+
+    @classmethod
+    def fetch_thread(
+            cls,
+            *,
+            chat_id: int,
+            message_id: str,
+            limit: int = 100,
+            after: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Live replies to a message, oldest first, using the (reply_to, _id) index.
+        """
+        query = {
+            "reply_to": ObjectId(message_id),
+            "chat_id": chat_id,
+            "deleted": False,
+        }
+        if after:
+            query["_id"] = {"$gt": ObjectId(after)}
+
+        cursor = (
+            cls._collection()
+            .find(query)
+            .sort("_id", ASCENDING)
+            .limit(limit)
+        )
+        return list(cursor)
+
+    @classmethod
+    def get_message(cls, *, chat_id: int, message_id: str) -> Optional[dict]:
+        return cls._collection().find_one({"_id": ObjectId(message_id), "chat_id": chat_id})
+
+    @classmethod
+    def add_reaction(cls, *, chat_id: int, message_id: str, user_id: int, emoji: str) -> Optional[dict]:
+        """
+        React to a live message of the chat. Returns the message with its
+        updated counters (unchanged if the user already reacted with this
+        emoji), or None if the message does not exist.
+        """
+        message_oid = ObjectId(message_id)
+        try:
+            cls._reactions().insert_one({
+                "message_id": message_oid,
+                "user_id": user_id,
+                "emoji": emoji,
+                "created_at": datetime.utcnow(),
+            })
+        except DuplicateKeyError:
+            return cls._collection().find_one({"_id": message_oid, "chat_id": chat_id, "deleted": False})
+
+        message = cls._collection().find_one_and_update(
+            {"_id": message_oid, "chat_id": chat_id, "deleted": False},
+            {"$inc": {f"reactions.{emoji}": 1}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if message is None:
+            cls._reactions().delete_one({"message_id": message_oid, "user_id": user_id, "emoji": emoji})
+        return message
+
+    @classmethod
+    def remove_reaction(cls, *, chat_id: int, message_id: str, user_id: int, emoji: str) -> Optional[dict]:
+        """
+        Withdraw a reaction. Returns the message with its updated counters,
+        or None if the message does not exist.
+        """
+        message_oid = ObjectId(message_id)
+        removed = cls._reactions().delete_one({"message_id": message_oid, "user_id": user_id, "emoji": emoji})
+        if not removed.deleted_count:
+            return cls._collection().find_one({"_id": message_oid, "chat_id": chat_id})
+
+        message = cls._collection().find_one_and_update(
+            {"_id": message_oid, "chat_id": chat_id},
+            {"$inc": {f"reactions.{emoji}": -1}},
+            return_document=ReturnDocument.AFTER,
         )
-        return result.modified_count == 1
+        if message is not None and message.get("reactions", {}).get(emoji, 0) <= 0:
+            # keep the counters map limited to emojis that are in use
+            cls._collection().update_one(
+                {"_id": message_oid, f"reactions.{emoji}": {"$lte": 0}},
+                {"$unset": {f"reactions.{emoji}": ""}},
+            )
+            message["reactions"].pop(emoji, None)
+        return message
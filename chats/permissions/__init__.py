@@ -0,0 +1 @@
+from .is_chat_member import IsChatMember
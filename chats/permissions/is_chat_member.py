@@ -0,0 +1,20 @@
+from .base_permission import BaseCustomPermission
+from ..services.chat_acl import ChatACL
+
+
+class IsChatMember(BaseCustomPermission):
+    """
+    Allow access only to members of the chat in the `chat_id` URL kwarg.
+    Backed by the cached ChatACL, so it costs no query per request.
+    """
+
+    error_code = "CHATS_003001"
+
+    def has_permission(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return False
+
+        if int(view.kwargs["chat_id"]) not in ChatACL.for_request(request):
+            self.message = self.deny()
+            return False
+        return True
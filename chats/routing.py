@@ -1,9 +1,14 @@
 from django.urls import re_path
 from .consumers.chat_consumer import ChatConsumer
+from .consumers.team_consumer import TeamConsumer
 
 websocket_urlpatterns = [
     re_path(
         r"^ws/chat/(?P<chat_id>\d+)/$",
         ChatConsumer.as_asgi(),
     ),
+    re_path(
+        r"^ws/teams/(?P<team_id>\d+)/$",
+        TeamConsumer.as_asgi(),
+    ),
 ]
@@ -2,3 +2,8 @@ from .group_chat import GroupChatCreateSerializer, GroupChatReadSerializer
 from .chat import ChatSerializer, ChatListSerializer
 from .private_chat import PrivateChatReadSerializer, PrivateChatCreateSerializer
 from .member import ChatMemberSerializer
+from .attachment import AttachmentSerializer, AttachmentUploadSerializer, AttachmentUploadCreateSerializer
+from .message import (
+    MessageSerializer, MessageHistoryQuerySerializer, MessageChangesQuerySerializer, MessageThreadQuerySerializer
+)
+from .announcement import AnnouncementSerializer, AnnouncementCreateSerializer, AnnouncementListQuerySerializer
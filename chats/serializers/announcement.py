@@ -0,0 +1,28 @@
+from rest_framework import serializers
+
+
+class AnnouncementCreateSerializer(serializers.Serializer):
+    content = serializers.CharField(max_length=4000)
+    chat_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        max_length=500,
+    )
+
+
+class AnnouncementListQuerySerializer(serializers.Serializer):
+    before = serializers.RegexField(r"^[0-9a-f]{24}$", required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=200, default=50)
+
+
+class AnnouncementSerializer(serializers.Serializer):
+    """
+    Read-only representation of a Mongo announcement document.
+    """
+
+    id = serializers.CharField(source="_id", read_only=True)
+    team_id = serializers.IntegerField(read_only=True)
+    author_id = serializers.IntegerField(read_only=True)
+    content = serializers.CharField(read_only=True)
+    chat_ids = serializers.ListField(child=serializers.IntegerField(), read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
@@ -0,0 +1,43 @@
+from rest_framework import serializers
+from ..models.attachment import ChatAttachment, ChatAttachmentUpload
+
+
+class AttachmentUploadCreateSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+    mime_type = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    sha256 = serializers.RegexField(r"^[0-9a-f]{64}$", required=False)
+
+
+class AttachmentUploadSerializer(serializers.ModelSerializer):
+    upload_id = serializers.UUIDField(source="id", read_only=True)
+
+    class Meta:
+        model = ChatAttachmentUpload
+        fields = (
+            "upload_id",
+            "chat",
+            "filename",
+            "mime_type",
+            "size",
+            "offset",
+            "created_at",
+        )
+        read_only_fields = fields
+
+
+class AttachmentSerializer(serializers.ModelSerializer):
+    attachment_id = serializers.UUIDField(source="id", read_only=True)
+
+    class Meta:
+        model = ChatAttachment
+        fields = (
+            "attachment_id",
+            "chat",
+            "filename",
+            "mime_type",
+            "size",
+            "sha256",
+            "created_at",
+        )
+        read_only_fields = fields
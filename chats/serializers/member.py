@@ -3,7 +3,7 @@ from ..models.chat_member import ChatMember
 
 
 class ChatMemberSerializer(serializers.ModelSerializer):
-    user_id = serializers.IntegerField(source="user.id", read_only=True)
+    user_id = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = ChatMember
@@ -0,0 +1,40 @@
+from rest_framework import serializers
+
+
+class MessageSerializer(serializers.Serializer):
+    """
+    Read-only representation of a Mongo message document.
+    """
+
+    id = serializers.CharField(source="_id", read_only=True)
+    chat_id = serializers.IntegerField(read_only=True)
+    sender_id = serializers.IntegerField(read_only=True)
+    type = serializers.CharField(read_only=True)
+    content = serializers.SerializerMethodField()
+    file = serializers.DictField(read_only=True, allow_null=True)
+    reply_to = serializers.CharField(read_only=True, allow_null=True)
+    reply_count = serializers.IntegerField(read_only=True, default=0)
+    reactions = serializers.DictField(child=serializers.IntegerField(), read_only=True, default=dict)
+    created_at = serializers.DateTimeField(read_only=True)
+    edited_at = serializers.DateTimeField(read_only=True, allow_null=True)
+    deleted = serializers.BooleanField(read_only=True)
+
+    def get_content(self, obj):
+        # tombstones never expose the removed content
+        return None if obj.get("deleted") else obj.get("content")
+
+
+class MessageHistoryQuerySerializer(serializers.Serializer):
+    before = serializers.RegexField(r"^[0-9a-f]{24}$", required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=500, default=100)
+
+
+class MessageChangesQuerySerializer(serializers.Serializer):
+    since = serializers.DateTimeField()
+    after_id = serializers.RegexField(r"^[0-9a-f]{24}$", required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=500, default=100)
+
+
+class MessageThreadQuerySerializer(serializers.Serializer):
+    after = serializers.RegexField(r"^[0-9a-f]{24}$", required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=500, default=100)
@@ -0,0 +1,84 @@
+from typing import List, Optional
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+from teams.models import Team, TeamMember
+from ..models.group_chat import GroupChat
+from ..mongo.announcement_repository import AnnouncementRepository
+from .team_events import ANNOUNCEMENT, team_group_message, team_group_name
+
+
+class AnnouncementError(ValueError):
+    """
+    Announcement rejected. `error_key` points at chats/errors/errors.json.
+    """
+
+    def __init__(self, error_key: str, detail=None):
+        super().__init__(error_key)
+        self.error_key = error_key
+        self.detail = detail
+
+
+class AnnouncementService:
+    """
+    Team-wide announcements.
+
+    An announcement is stored once, referencing all of its chats, and sent
+    with a single group_send to the team group. channels_redis resolves a
+    group send into one operation per Redis shard, so the cost does not
+    grow with the number of chats or members.
+    """
+
+    @staticmethod
+    def payload(document: dict) -> dict:
+        return {
+            "id": str(document["_id"]),
+            "team_id": document["team_id"],
+            "author_id": document["author_id"],
+            "content": document["content"],
+            "chat_ids": document["chat_ids"],
+            "created_at": document["created_at"].isoformat(),
+        }
+
+    @staticmethod
+    def _team_chat_ids(team_id: int) -> List[int]:
+        # team group chats are linked by title (see chats/signals/create_group.py)
+        title = Team.objects.filter(id=team_id).values_list("title", flat=True).first()
+        return list(GroupChat.objects.filter(title=title).values_list("chat_id", flat=True))
+
+    @staticmethod
+    def announce(*, user, team_id: int, content: str, chat_ids: Optional[List[int]] = None) -> dict:
+        role = (
+            TeamMember.objects
+            .filter(team_id=team_id, user=user, is_active=True)
+            .values_list("role", flat=True)
+            .first()
+        )
+        if role is None:
+            raise AnnouncementError("CHATS_005001")
+        if role not in ("owner", "admin"):
+            raise AnnouncementError("CHATS_005002")
+
+        team_chat_ids = AnnouncementService._team_chat_ids(team_id)
+        if chat_ids:
+            # only the team's own chats, whatever else the author can see
+            chat_ids = sorted(set(chat_ids))
+            foreign = set(chat_ids).difference(team_chat_ids)
+            if foreign:
+                raise AnnouncementError("CHATS_005003", {"chat_ids": sorted(foreign)})
+        else:
+            chat_ids = team_chat_ids
+
+        document = AnnouncementRepository.create_announcement(
+            team_id=team_id,
+            author_id=user.id,
+            content=content,
+            chat_ids=chat_ids,
+        )
+
+        async_to_sync(get_channel_layer().group_send)(
+            team_group_name(team_id),
+            team_group_message(ANNOUNCEMENT, AnnouncementService.payload(document)),
+        )
+        return document
@@ -0,0 +1,194 @@
+import hashlib
+from typing import Optional, Union
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from ..models.attachment import ChatAttachment, ChatAttachmentUpload
+from .chat_acl import ChatACL
+from .attachment_storage import get_attachment_store, iter_file, staging_path, READ_BLOCK_SIZE
+
+
+class AttachmentUploadError(ValueError):
+    """
+    Upload rejected. `error_key` points at chats/errors/errors.json.
+    """
+
+    def __init__(self, error_key: str, detail=None):
+        super().__init__(error_key)
+        self.error_key = error_key
+        self.detail = detail
+
+
+class AttachmentService:
+    """
+    Resumable, chunked attachment uploads.
+
+    Chunks are streamed straight from the request into a staging file, so
+    neither whole files nor whole chunks are held in memory. When the last
+    byte arrives the staged file is hashed and handed to the configured
+    store (MEDIA_ROOT or GridFS), which keeps one blob per sha256.
+    """
+
+    @staticmethod
+    def max_size() -> int:
+        return getattr(settings, "CHAT_ATTACHMENT_MAX_SIZE", 100 * 1024 * 1024)
+
+    @staticmethod
+    def max_chunk_size() -> int:
+        return getattr(settings, "CHAT_ATTACHMENT_MAX_CHUNK_SIZE", 5 * 1024 * 1024)
+
+    @staticmethod
+    def descriptor(attachment: ChatAttachment) -> dict:
+        """
+        File info embedded in message documents and events.
+        """
+        return {
+            "attachment_id": str(attachment.id),
+            "name": attachment.filename,
+            "size": attachment.size,
+            "mime_type": attachment.mime_type,
+        }
+
+    @staticmethod
+    def start_upload(*, user, chat_id: int, data: dict) -> Union[ChatAttachmentUpload, ChatAttachment]:
+        """
+        Open an upload session. If the client declares a sha256 that it has
+        already uploaded (or that already exists in this chat), the file is
+        not sent again and a new attachment is returned immediately.
+        """
+        if chat_id not in ChatACL.chat_ids(user.id):
+            raise AttachmentUploadError("CHATS_003001")
+
+        if data["size"] > AttachmentService.max_size():
+            raise AttachmentUploadError("CHATS_003002", {"size": f"Maximum is {AttachmentService.max_size()} bytes."})
+
+        sha256 = data.get("sha256", "")
+        if sha256:
+            # Only reuse blobs the user could already read, so knowing a hash
+            # is not enough to obtain someone else's file.
+            existing = (
+                ChatAttachment.objects
+                .filter(Q(uploaded_by=user) | Q(chat_id=chat_id), sha256=sha256, size=data["size"])
+                .first()
+            )
+            if existing:
+                return ChatAttachment.objects.create(
+                    chat_id=chat_id,
+                    uploaded_by=user,
+                    filename=data["filename"],
+                    mime_type=data.get("mime_type", ""),
+                    size=existing.size,
+                    sha256=existing.sha256,
+                )
+
+        return ChatAttachmentUpload.objects.create(
+            chat_id=chat_id,
+            user=user,
+            filename=data["filename"],
+            mime_type=data.get("mime_type", ""),
+            size=data["size"],
+            sha256=sha256,
+        )
+
+    @staticmethod
+    def append_chunk(
+            *,
+            user,
+            upload_id,
+            offset: int,
+            length: int,
+            stream,
+    ) -> Union[ChatAttachmentUpload, ChatAttachment]:
+        """
+        Append `length` bytes read from `stream` at `offset`. Returns the
+        upload (still in progress) or the finished ChatAttachment.
+        """
+        if length > AttachmentService.max_chunk_size():
+            raise AttachmentUploadError(
+                "CHATS_003002",
+                {"chunk": f"Maximum chunk size is {AttachmentService.max_chunk_size()} bytes."},
+            )
+
+        with transaction.atomic():
+            # Row lock serializes concurrent chunks of the same upload
+            upload = (
+                ChatAttachmentUpload.objects
+                .select_for_update()
+                .filter(id=upload_id, user=user)
+                .first()
+            )
+            if upload is None:
+                raise AttachmentUploadError("CHATS_003003")
+
+            if offset != upload.offset:
+                raise AttachmentUploadError("CHATS_003004", {"offset": upload.offset})
+            if offset + length > upload.size:
+                raise AttachmentUploadError("CHATS_003002", {"chunk": "Chunk exceeds declared size."})
+
+            path = staging_path(upload.id)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "ab") as staged:
+                # Drop bytes past the committed offset (e.g. a chunk that was
+                # written but never acknowledged)
+                staged.truncate(upload.offset)
+                remaining = length
+                while remaining:
+                    block = stream.read(min(READ_BLOCK_SIZE, remaining))
+                    if not block:
+                        break
+                    staged.write(block)
+                    remaining -= len(block)
+
+            upload.offset += length - remaining
+            upload.save(update_fields=["offset"])
+
+            if upload.offset < upload.size:
+                return upload
+            attachment = AttachmentService._finalize(upload)
+
+        if attachment is None:
+            raise AttachmentUploadError("CHATS_003005")
+        return attachment
+
+    @staticmethod
+    def _finalize(upload: ChatAttachmentUpload) -> Optional[ChatAttachment]:
+        """
+        Hash the staged file and store it. On a checksum mismatch the upload
+        is rewound to offset 0 and None is returned.
+        """
+        path = staging_path(upload.id)
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as staged:
+            for block in iter_file(staged):
+                digest.update(block)
+        sha256 = digest.hexdigest()
+
+        if upload.sha256 and upload.sha256 != sha256:
+            path.unlink(missing_ok=True)
+            upload.offset = 0
+            upload.save(update_fields=["offset"])
+            return None
+
+        get_attachment_store().save(sha256, path)
+
+        attachment = ChatAttachment.objects.create(
+            chat_id=upload.chat_id,
+            uploaded_by_id=upload.user_id,
+            filename=upload.filename,
+            mime_type=upload.mime_type,
+            size=upload.size,
+            sha256=sha256,
+        )
+        upload.delete()
+        return attachment
+
+    @staticmethod
+    def get_for_member(*, user, attachment_id) -> Optional[ChatAttachment]:
+        return (
+            ChatAttachment.objects
+            .filter(id=attachment_id, chat__members__user=user)
+            .first()
+        )
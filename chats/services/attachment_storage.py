@@ -0,0 +1,92 @@
+import os
+from pathlib import Path
+
+from django.conf import settings
+
+from ..mongo.client import MongoConnection
+
+READ_BLOCK_SIZE = 64 * 1024
+
+
+def iter_file(fileobj, block_size: int = READ_BLOCK_SIZE):
+    """
+    Yield a file object's content in fixed-size blocks.
+    """
+    while True:
+        block = fileobj.read(block_size)
+        if not block:
+            break
+        yield block
+
+
+class FileSystemAttachmentStore:
+    """
+    Content-addressed blobs under MEDIA_ROOT/chat/attachments/<aa>/<sha256>.
+    """
+
+    ROOT = "chat/attachments"
+
+    def _path(self, sha256: str) -> Path:
+        return Path(settings.MEDIA_ROOT) / self.ROOT / sha256[:2] / sha256
+
+    def exists(self, sha256: str) -> bool:
+        return self._path(sha256).exists()
+
+    def save(self, sha256: str, staged_path: Path):
+        """
+        Move a staged file into place; if the blob already exists the
+        staged copy is discarded.
+        """
+        path = self._path(sha256)
+        if path.exists():
+            staged_path.unlink(missing_ok=True)
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(staged_path, path)
+
+    def open(self, sha256: str):
+        return open(self._path(sha256), "rb")
+
+
+class GridFSAttachmentStore:
+    """
+    Content-addressed blobs in a GridFS bucket, one file per sha256.
+    """
+
+    BUCKET_NAME = "chat_attachments"
+
+    def _bucket(self):
+        import gridfs
+
+        return gridfs.GridFSBucket(MongoConnection.get_db(), bucket_name=self.BUCKET_NAME)
+
+    def exists(self, sha256: str) -> bool:
+        db = MongoConnection.get_db()
+        return db[f"{self.BUCKET_NAME}.files"].count_documents({"filename": sha256}, limit=1) > 0
+
+    def save(self, sha256: str, staged_path: Path):
+        if not self.exists(sha256):
+            with open(staged_path, "rb") as staged:
+                self._bucket().upload_from_stream(sha256, staged)
+        staged_path.unlink(missing_ok=True)
+
+    def open(self, sha256: str):
+        return self._bucket().open_download_stream_by_name(sha256)
+
+
+ATTACHMENT_STORES = {
+    "filesystem": FileSystemAttachmentStore,
+    "gridfs": GridFSAttachmentStore,
+}
+
+
+def get_attachment_store():
+    backend = getattr(settings, "CHAT_ATTACHMENT_STORAGE", "filesystem")
+    return ATTACHMENT_STORES[backend]()
+
+
+def staging_path(upload_id) -> Path:
+    """
+    Local file that receives the chunks of an in-progress upload.
+    """
+    return Path(settings.MEDIA_ROOT) / "chat/uploads" / f"{upload_id}.part"
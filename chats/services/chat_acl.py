@@ -0,0 +1,75 @@
+from typing import FrozenSet
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from ..models.chat_member import ChatMember
+
+CHAT_ACL_CACHE_PREFIX = "chat_acl"
+
+
+class ChatACL:
+    """
+    The set of chat ids a user belongs to, cached per user.
+
+    Resolved once per request (memoized on the request) or per websocket
+    connection, so membership checks are a set lookup rather than a
+    ChatMember query. ChatMember signals, and code that writes members in
+    bulk, call invalidate().
+    """
+
+    @staticmethod
+    def cache_key(user_id: int) -> str:
+        return f"{CHAT_ACL_CACHE_PREFIX}:{user_id}"
+
+    @staticmethod
+    def timeout() -> int:
+        return getattr(settings, "CHAT_ACL_CACHE_TIMEOUT", 300)
+
+    @staticmethod
+    def _load(user_id: int) -> FrozenSet[int]:
+        return frozenset(
+            ChatMember.objects
+            .filter(user_id=user_id)
+            .values_list("chat_id", flat=True)
+        )
+
+    @classmethod
+    def chat_ids(cls, user_id: int) -> FrozenSet[int]:
+        key = cls.cache_key(user_id)
+        chat_ids = cache.get(key)
+        if chat_ids is None:
+            chat_ids = cls._load(user_id)
+            cache.set(key, chat_ids, cls.timeout())
+        return chat_ids
+
+    @classmethod
+    async def achat_ids(cls, user_id: int) -> FrozenSet[int]:
+        key = cls.cache_key(user_id)
+        chat_ids = await cache.aget(key)
+        if chat_ids is None:
+            chat_ids = await database_sync_to_async(cls._load)(user_id)
+            await cache.aset(key, chat_ids, cls.timeout())
+        return chat_ids
+
+    @classmethod
+    def for_request(cls, request) -> FrozenSet[int]:
+        """
+        The requesting user's ACL, resolved at most once per request.
+        """
+        chat_ids = getattr(request, "_chat_acl", None)
+        if chat_ids is None:
+            chat_ids = request._chat_acl = cls.chat_ids(request.user.id)
+        return chat_ids
+
+    @classmethod
+    def invalidate(cls, *user_ids: int):
+        """
+        Drop cached ACLs now and again once the surrounding transaction
+        commits, so a concurrent reader cannot re-cache pre-commit state.
+        """
+        keys = [cls.cache_key(user_id) for user_id in user_ids]
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
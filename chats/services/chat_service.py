@@ -1,12 +1,19 @@
+from typing import Optional
+
 from django.contrib.auth import get_user_model
-from django.db import transaction
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from ..models.chat import Chat
 from ..models.private_chat import PrivateChat
 from ..models.group_chat import GroupChat
 from ..models.chat_member import ChatMember
+from .chat_acl import ChatACL
 
 User = get_user_model()
 
+PRIVATE_CHAT_CACHE_PREFIX = "chats:private_pair"
+PRIVATE_CHAT_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 class ChatService:
     """
@@ -15,65 +22,105 @@ class ChatService:
     """
 
     @staticmethod
-    @transaction.atomic
-    def create_private_chat(*, user, target_user_id: int) -> PrivateChat:
+    def _private_chat_cache_key(user1_id: int, user2_id: int) -> str:
+        return f"{PRIVATE_CHAT_CACHE_PREFIX}:{user1_id}:{user2_id}"
+
+    @staticmethod
+    def _fetch_private_chat(**lookup) -> Optional[PrivateChat]:
+        return (
+            PrivateChat.objects
+            .select_related("chat")
+            .filter(**lookup)
+            .first()
+        )
+
+    @classmethod
+    def get_private_chat(cls, *, user1_id: int, user2_id: int) -> Optional[PrivateChat]:
+        """
+        Return the private chat for an ordered user pair, or None.
+        The pair -> chat_id mapping is cached, so a hit costs a single
+        primary-key lookup.
+        """
+        cache_key = cls._private_chat_cache_key(user1_id, user2_id)
+        chat_id = cache.get(cache_key)
+
+        if chat_id is not None:
+            private_chat = cls._fetch_private_chat(chat_id=chat_id)
+            if private_chat:
+                return private_chat
+            # stale mapping (chat was deleted)
+            cache.delete(cache_key)
+
+        private_chat = cls._fetch_private_chat(user1_id=user1_id, user2_id=user2_id)
+        if private_chat:
+            cache.set(cache_key, private_chat.chat_id, PRIVATE_CHAT_CACHE_TIMEOUT)
+        return private_chat
+
+    @classmethod
+    def create_private_chat(cls, *, user, target_user_id: int) -> PrivateChat:
         """
         Create or return an existing private chat between two users.
         This operation is idempotent and race-condition safe.
+
+        The "already exists" case is answered with a single query. Creation
+        runs inside a savepoint; if a concurrent request wins the race on
+        `unique_private_chat_pair`, the savepoint is rolled back and the
+        winner's chat is returned instead.
         """
 
         if user.id == target_user_id:
             raise ValueError("Cannot create private chat with yourself.")
 
-        try:
-            target_user = User.objects.only("id").get(id=target_user_id)
-        except User.DoesNotExist:
-            raise ValueError("Target user does not exist.")
-
         # enforce ordering to prevent duplicate pairs
-        user1, user2 = (
-            (user, target_user)
-            if user.id < target_user.id
-            else (target_user, user)
-        )
-
-        # Try to get existing private chat
-        private_chat = (
-            PrivateChat.objects
-            .select_related("chat")
-            .filter(user1=user1, user2=user2)
-            .first()
-        )
+        user1_id, user2_id = sorted((user.id, target_user_id))
 
+        # Fast path: chat already exists
+        private_chat = cls.get_private_chat(user1_id=user1_id, user2_id=user2_id)
         if private_chat:
             return private_chat
 
-        # Create chat
-        chat = Chat.objects.create(
-            type=Chat.PRIVATE,
-            created_by=user,
-        )
+        if not User.objects.filter(id=target_user_id).exists():
+            raise ValueError("Target user does not exist.")
 
-        private_chat = PrivateChat.objects.create(
-            chat=chat,
-            user1=user1,
-            user2=user2,
+        try:
+            with transaction.atomic():
+                chat = Chat.objects.create(
+                    type=Chat.PRIVATE,
+                    created_by=user,
+                )
+
+                private_chat = PrivateChat.objects.create(
+                    chat=chat,
+                    user1_id=user1_id,
+                    user2_id=user2_id,
+                )
+
+                # Add members
+                ChatMember.objects.bulk_create([
+                    ChatMember(
+                        chat=chat,
+                        user_id=user1_id,
+                        role=ChatMember.MEMBER,
+                    ),
+                    ChatMember(
+                        chat=chat,
+                        user_id=user2_id,
+                        role=ChatMember.MEMBER,
+                    ),
+                ])
+                # bulk_create sends no signals
+                ChatACL.invalidate(user1_id, user2_id)
+        except IntegrityError:
+            # Lost the race: another request created the pair first
+            private_chat = cls._fetch_private_chat(user1_id=user1_id, user2_id=user2_id)
+            if private_chat is None:
+                raise
+
+        cache.set(
+            cls._private_chat_cache_key(user1_id, user2_id),
+            private_chat.chat_id,
+            PRIVATE_CHAT_CACHE_TIMEOUT,
         )
-
-        # Add members
-        ChatMember.objects.bulk_create([
-            ChatMember(
-                chat=chat,
-                user=user1,
-                role=ChatMember.MEMBER,
-            ),
-            ChatMember(
-                chat=chat,
-                user=user2,
-                role=ChatMember.MEMBER,
-            ),
-        ])
-
         return private_chat
 
     @staticmethod
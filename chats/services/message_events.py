@@ -0,0 +1,80 @@
+from typing import Optional
+
+from django.conf import settings
+
+# Message lifecycle events, as broadcast to chat groups
+MESSAGE_CREATED = "message"
+MESSAGE_EDITED = "message_edited"
+MESSAGE_DELETED = "message_deleted"
+MESSAGE_REACTION = "message_reaction"
+
+
+def chat_group_name(chat_id: int) -> str:
+    return f"chat_{chat_id}"
+
+
+def change_stream_fanout_enabled() -> bool:
+    """
+    When true, persisted message events are broadcast by the change-stream
+    listener (run_message_fanout) instead of the consumer that wrote them.
+    """
+    return getattr(settings, "CHAT_FANOUT_MODE", "consumer") == "change_stream"
+
+
+def _optional_str(value) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+def message_event_payload(event: str, document: dict) -> dict:
+    """
+    Build the broadcast payload for a message document.
+    """
+    if event == MESSAGE_CREATED:
+        return {
+            "id": str(document["_id"]),
+            "user_id": document["sender_id"],
+            "content": document["content"],
+            "type": document["type"],
+            "file": document.get("file"),
+            "reply_to": _optional_str(document.get("reply_to")),
+            "created_at": document["created_at"].isoformat(),
+        }
+    if event == MESSAGE_EDITED:
+        return {
+            "id": str(document["_id"]),
+            "user_id": document["sender_id"],
+            "content": document["content"],
+            "edited_at": document["edited_at"].isoformat(),
+        }
+    return {
+        "id": str(document["_id"]),
+        "user_id": document["sender_id"],
+        "edited_at": document["edited_at"].isoformat(),
+    }
+
+
+def reaction_event_payload(document: dict, *, user_id: int, emoji: str, added: bool) -> dict:
+    """
+    Payload for a reaction change; carries the message's current counters
+    so clients can replace theirs instead of recomputing.
+    """
+    return {
+        "id": str(document["_id"]),
+        "user_id": user_id,
+        "emoji": emoji,
+        "added": added,
+        "reactions": document.get("reactions", {}),
+    }
+
+
+def group_message(event: str, payload: dict) -> dict:
+    """
+    Channel-layer message handled by ChatConsumer.chat_event.
+    """
+    return {
+        "type": "chat.event",
+        "data": {
+            "event": event,
+            **payload,
+        },
+    }
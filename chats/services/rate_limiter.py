@@ -0,0 +1,217 @@
+import time
+import logging
+from collections import OrderedDict
+from itertools import islice
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# event -> scope ("user" / "chat") -> (refill rate per second, burst capacity)
+DEFAULT_RATE_LIMITS = {
+    "message": {"user": (5, 10), "chat": (50, 100)},
+    "typing": {"user": (2, 5), "chat": (20, 40)},
+    "seen": {"user": (10, 20), "chat": (100, 200)},
+    "edit": {"user": (2, 10), "chat": (20, 40)},
+    "delete": {"user": (2, 10), "chat": (20, 40)},
+    "react": {"user": (5, 20), "chat": (50, 100)},
+    "unreact": {"user": (5, 20), "chat": (50, 100)},
+}
+
+# Atomic token buckets stored in Redis hashes: {tokens, ts}. KEYS are the
+# buckets, ARGV their (rate, capacity) pairs; one token is taken from every
+# bucket or, if any is empty, from none.
+REDIS_TOKEN_BUCKET_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+
+local tokens = {}
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i - 1])
+    local capacity = tonumber(ARGV[2 * i])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local ts = tonumber(state[2]) or now
+    tokens[i] = math.min(capacity, (tonumber(state[1]) or capacity) + (now - ts) * rate)
+    if tokens[i] < 1 then
+        retry_after = math.max(retry_after, (1 - tokens[i]) / rate)
+    end
+end
+
+local allowed = 0
+if retry_after == 0 then
+    allowed = 1
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i - 1])
+    local capacity = tonumber(ARGV[2 * i])
+    redis.call('HSET', key, 'tokens', tokens[i] - allowed, 'ts', now)
+    redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+end
+return {allowed, tostring(retry_after)}
+"""
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, up to `capacity`.
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def retry_after(self) -> float:
+        """
+        Seconds until a token is available; 0 when one is.
+        """
+        self._refill(time.monotonic())
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        # callers check retry_after() first
+        self.tokens -= 1
+
+    def give_back(self):
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def consume(self) -> Tuple[bool, float]:
+        """
+        Take one token. Returns (allowed, retry_after_seconds).
+        """
+        retry_after = self.retry_after()
+        if retry_after:
+            return False, retry_after
+        self.take()
+        return True, 0.0
+
+    def is_full(self) -> bool:
+        self._refill(time.monotonic())
+        return self.tokens >= self.capacity
+
+
+class ChatRateLimiter:
+    """
+    Per-user and per-chat rate limiting for websocket events.
+
+    An event takes a token from both the user and the chat bucket, or from
+    neither when either is empty. Buckets live in process memory and are
+    shared by every consumer of the process, at most MAX_LOCAL_BUCKETS of
+    them. When CHAT_RATE_LIMIT_REDIS_URL is set, events that pass the local
+    buckets are also checked against Redis buckets so limits hold across
+    processes; if Redis is unreachable the local decision stands.
+    """
+
+    REDIS_PREFIX = "chat_ratelimit"
+    MAX_LOCAL_BUCKETS = 10000
+
+    # least recently used first
+    _buckets: "OrderedDict[tuple, TokenBucket]" = OrderedDict()
+    _redis = None
+    _redis_script = None
+
+    @classmethod
+    def get_limits(cls, event: str) -> Optional[dict]:
+        limits = getattr(settings, "CHAT_RATE_LIMITS", DEFAULT_RATE_LIMITS)
+        return limits.get(event)
+
+    @classmethod
+    def _get_redis(cls):
+        url = getattr(settings, "CHAT_RATE_LIMIT_REDIS_URL", None)
+        if not url:
+            return None
+        if cls._redis is None:
+            from redis import asyncio as aioredis
+
+            cls._redis = aioredis.from_url(url)
+            cls._redis_script = cls._redis.register_script(REDIS_TOKEN_BUCKET_SCRIPT)
+        return cls._redis
+
+    @classmethod
+    def _prune(cls, room: int):
+        """
+        Drop buckets that have refilled completely; they carry no state. If
+        that leaves less than `room` (at least a tenth of MAX_LOCAL_BUCKETS)
+        free, drop the least recently used ones too (they start over full),
+        so the map never outgrows MAX_LOCAL_BUCKETS and pruning runs at most
+        once per that many new keys.
+        """
+        for key in [key for key, bucket in cls._buckets.items() if bucket.is_full()]:
+            del cls._buckets[key]
+        excess = len(cls._buckets) - (cls.MAX_LOCAL_BUCKETS - max(room, cls.MAX_LOCAL_BUCKETS // 10))
+        for key in list(islice(cls._buckets, max(excess, 0))):
+            del cls._buckets[key]
+
+    @classmethod
+    def _local_bucket(cls, key: tuple, rate: float, capacity: float) -> TokenBucket:
+        bucket = cls._buckets.get(key)
+        if bucket is None:
+            bucket = cls._buckets[key] = TokenBucket(rate, capacity)
+        else:
+            cls._buckets.move_to_end(key)
+        return bucket
+
+    @classmethod
+    async def _redis_consume(cls, keys: List[tuple]) -> Tuple[bool, float]:
+        redis_keys = [":".join(str(part) for part in (cls.REDIS_PREFIX, *key)) for key, _, _ in keys]
+        args = [arg for _, rate, capacity in keys for arg in (rate, capacity)]
+        try:
+            allowed, retry_after = await cls._redis_script(keys=redis_keys, args=args)
+        except Exception:
+            logger.warning("Redis rate limit sync failed; using local buckets", exc_info=True)
+            return True, 0.0
+        return bool(allowed), float(retry_after)
+
+    @classmethod
+    async def allow(cls, *, event: str, user_id: int, chat_id: int) -> Tuple[bool, float]:
+        """
+        Check and consume one token for `event` from the user and chat
+        buckets, from both or neither.
+        Returns (allowed, retry_after_seconds). Events without configured
+        limits are always allowed.
+        """
+        limits = cls.get_limits(event)
+        if not limits:
+            return True, 0.0
+
+        keys = []
+        if "user" in limits:
+            keys.append((("user", event, user_id), *limits["user"]))
+        if "chat" in limits:
+            keys.append((("chat", event, chat_id), *limits["chat"]))
+
+        if len(cls._buckets) + len(keys) > cls.MAX_LOCAL_BUCKETS:
+            cls._prune(len(keys))
+        buckets = [cls._local_bucket(key, rate, capacity) for key, rate, capacity in keys]
+        retry_after = max((bucket.retry_after() for bucket in buckets), default=0.0)
+        if retry_after:
+            return False, retry_after
+        for bucket in buckets:
+            bucket.take()
+
+        if keys and cls._get_redis() is not None:
+            allowed, retry_after = await cls._redis_consume(keys)
+            if not allowed:
+                # the event is dropped; don't charge it locally either
+                for bucket in buckets:
+                    bucket.give_back()
+                return False, retry_after
+
+        return True, 0.0
+
+    @classmethod
+    def reset(cls):
+        cls._buckets.clear()
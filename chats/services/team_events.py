@@ -0,0 +1,45 @@
+from typing import Iterable, List
+
+ANNOUNCEMENT = "announcement"
+
+
+def team_group_name(team_id: int) -> str:
+    return f"team_{team_id}"
+
+
+def team_admins_group_name(team_id: int) -> str:
+    """
+    Sockets of the team's owners and admins.
+    """
+    return f"team_{team_id}_admins"
+
+
+def team_member_group_name(team_id: int, member_id: int) -> str:
+    """
+    Sockets of one non-admin member (TeamMember id).
+    """
+    return f"team_{team_id}_member_{member_id}"
+
+
+def team_audience_groups(team_id: int, member_ids: Iterable[int]) -> List[str]:
+    """
+    Groups reaching the team's owners/admins and the members `member_ids`,
+    for events plain members may only see about their own work.
+    """
+    return [
+        team_admins_group_name(team_id),
+        *(team_member_group_name(team_id, member_id) for member_id in sorted(set(member_ids))),
+    ]
+
+
+def team_group_message(event: str, payload: dict) -> dict:
+    """
+    Channel-layer message handled by TeamConsumer.team_event.
+    """
+    return {
+        "type": "team.event",
+        "data": {
+            "event": event,
+            **payload,
+        },
+    }
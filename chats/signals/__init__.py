@@ -1,2 +1,4 @@
 from .add_member import add_team_member_to_group
 from .create_group import create_group_chat_for_team
+from .acl import invalidate_chat_acl
+from . import cache_invalidation
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from chats.models import ChatMember
+from chats.services.chat_acl import ChatACL
+
+
+@receiver(post_save, sender=ChatMember)
+@receiver(post_delete, sender=ChatMember)
+def invalidate_chat_acl(sender, instance: ChatMember, **kwargs):
+    ChatACL.invalidate(instance.user_id)
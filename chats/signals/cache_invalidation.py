@@ -0,0 +1,4 @@
+from chats.models import ChatMember
+from utils.cache import invalidate_on_change
+
+invalidate_on_change(ChatMember, "chats")
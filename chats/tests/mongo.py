@@ -0,0 +1,72 @@
+import unittest
+from unittest.mock import patch
+
+try:
+    import mongomock
+except ImportError:  # pragma: no cover
+    mongomock = None
+
+
+class AsyncCursor:
+    """
+    Awaitable facade over a mongomock cursor (find/sort/limit/to_list).
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def sort(self, *args, **kwargs):
+        self._cursor = self._cursor.sort(*args, **kwargs)
+        return self
+
+    def limit(self, *args):
+        self._cursor = self._cursor.limit(*args)
+        return self
+
+    async def to_list(self, length=None):
+        documents = list(self._cursor)
+        return documents if length is None else documents[:length]
+
+
+class AsyncCollection:
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def find(self, *args, **kwargs):
+        return AsyncCursor(self._collection.find(*args, **kwargs))
+
+    async def find_one(self, *args, **kwargs):
+        return self._collection.find_one(*args, **kwargs)
+
+
+class AsyncDatabase:
+    """
+    Stand-in for an AsyncMongoClient database backed by the same mongomock
+    database as the sync connection, so both see the same documents.
+    """
+
+    def __init__(self, db):
+        self._db = db
+
+    def __getitem__(self, name):
+        return AsyncCollection(self._db[name])
+
+
+@unittest.skipIf(mongomock is None, "mongomock is not installed")
+class MongoTestMixin:
+    """
+    Point MongoConnection (and AsyncMongoConnection) at an in-memory
+    mongomock database per test.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.mongo_db = mongomock.MongoClient()["timo_test"]
+        for target, db in (
+                ("chats.mongo.client.MongoConnection.get_db", self.mongo_db),
+                ("chats.mongo.client.AsyncMongoConnection.get_db", AsyncDatabase(self.mongo_db)),
+        ):
+            patcher = patch(target, return_value=db)
+            patcher.start()
+            self.addCleanup(patcher.stop)
@@ -0,0 +1,142 @@
+from unittest.mock import AsyncMock, patch
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.tests.factories import UserFactory
+from teams.models import Team, TeamMember
+from chats.models import ChatMember, GroupChat
+from chats.routing import websocket_urlpatterns
+from chats.tests.mongo import MongoTestMixin
+
+
+class AnnouncementApiTestCase(MongoTestMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.owner = UserFactory()
+        self.member = UserFactory()
+        self.team = Team.objects.create(title="Core")
+        TeamMember.objects.create(team=self.team, user=self.owner, role="owner")
+        TeamMember.objects.create(team=self.team, user=self.member, role="member")
+        self.url = reverse("chats:team_announcements", kwargs={"team_id": self.team.id})
+
+        self.group_send = AsyncMock()
+        patcher = patch(
+            "chats.services.announcement_service.get_channel_layer",
+            return_value=AsyncMock(group_send=self.group_send),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_owner_announcement_is_stored_once_and_sent_once(self):
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.post(self.url, {"content": "Release at 5pm"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(self.mongo_db["announcements"].count_documents({}), 1)
+        self.group_send.assert_awaited_once()
+        group, message = self.group_send.await_args.args
+        self.assertEqual(group, f"team_{self.team.id}")
+        self.assertEqual(message["type"], "team.event")
+        self.assertEqual(message["data"]["event"], "announcement")
+        self.assertEqual(message["data"]["content"], "Release at 5pm")
+
+    def test_announcement_defaults_to_team_group_chat(self):
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.post(self.url, {"content": "hi"}, format="json")
+
+        team_chats = list(ChatMember.objects.filter(user=self.owner).values_list("chat_id", flat=True))
+        self.assertEqual(response.data["data"]["chat_ids"], team_chats)
+
+    def test_member_cannot_announce(self):
+        self.client.force_authenticate(user=self.member)
+        response = self.client.post(self.url, {"content": "hi"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.group_send.assert_not_awaited()
+
+    def test_foreign_chat_ids_are_rejected(self):
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.post(self.url, {"content": "hi", "chat_ids": [999999]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.mongo_db["announcements"].count_documents({}), 0)
+
+    def test_only_the_teams_chats_can_be_targeted(self):
+        # the owner is in the other team's chat too, but it is not this team's
+        other = Team.objects.create(title="Other")
+        TeamMember.objects.create(team=other, user=self.owner, role="owner")
+        other_chat = GroupChat.objects.get(title=other.title).chat_id
+        self.assertTrue(ChatMember.objects.filter(chat_id=other_chat, user=self.owner).exists())
+        team_chat = GroupChat.objects.get(title=self.team.title).chat_id
+
+        self.client.force_authenticate(user=self.owner)
+        response = self.client.post(self.url, {"content": "hi", "chat_ids": [team_chat, other_chat]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"]["detail"], {"chat_ids": [other_chat]})
+        self.group_send.assert_not_awaited()
+
+        response = self.client.post(self.url, {"content": "hi", "chat_ids": [team_chat]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["data"]["chat_ids"], [team_chat])
+
+    def test_members_list_announcements(self):
+        self.client.force_authenticate(user=self.owner)
+        for i in range(3):
+            self.client.post(self.url, {"content": f"a{i}"}, format="json")
+
+        self.client.force_authenticate(user=self.member)
+        response = self.client.get(self.url, {"limit": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([a["content"] for a in response.data["data"]], ["a2", "a1"])
+
+        response = self.client.get(self.url, {"before": response.data["data"][-1]["id"]})
+        self.assertEqual([a["content"] for a in response.data["data"]], ["a0"])
+
+        outsider = UserFactory()
+        self.client.force_authenticate(user=outsider)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalid_list_query_is_rejected(self):
+        self.client.force_authenticate(user=self.member)
+        for params in ({"limit": "abc"}, {"limit": -5}, {"limit": 0}, {"limit": 201}, {"before": "nope"}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+            self.assertEqual(response.data["error"]["code"], "CHATS_005004")
+
+
+class TeamConsumerTestCase(TransactionTestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.team = Team.objects.create(title="Core")
+        TeamMember.objects.create(team=self.team, user=self.user, role="member")
+        self.outsider = UserFactory()
+
+    def _communicator(self, user):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), f"/ws/teams/{self.team.id}/")
+        communicator.scope["user"] = user
+        return communicator
+
+    async def test_member_receives_team_events(self):
+        communicator = self._communicator(self.user)
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        await get_channel_layer().group_send(
+            f"team_{self.team.id}",
+            {"type": "team.event", "data": {"event": "announcement", "content": "hi"}},
+        )
+        self.assertEqual(
+            await communicator.receive_json_from(),
+            {"event": "announcement", "content": "hi"},
+        )
+        await communicator.disconnect()
+
+    async def test_non_member_is_rejected(self):
+        communicator = self._communicator(self.outsider)
+        connected, code = await communicator.connect()
+        self.assertFalse(connected)
+        self.assertEqual(code, 4003)
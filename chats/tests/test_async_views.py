@@ -0,0 +1,67 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.tests.factories import UserFactory
+from chats.models import Chat, ChatMember
+from chats.mongo.message_repository import MessageRepository
+from chats.tests.mongo import MongoTestMixin
+from chats.views import ChatListApi, ChatMessageListApi
+
+
+class AsyncChatViewsTestCase(MongoTestMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory()
+        self.chat = Chat.objects.create(type=Chat.GROUP, created_by=self.user)
+        ChatMember.objects.create(chat=self.chat, user=self.user, role=ChatMember.OWNER)
+        Chat.objects.create(type=Chat.GROUP, created_by=self.user)  # not a member
+        self.client.force_authenticate(user=self.user)
+
+        self.messages = [
+            MessageRepository.create_message(chat_id=self.chat.id, sender_id=self.user.id, content=f"m{i}")
+            for i in range(5)
+        ]
+
+    def test_views_are_served_natively_async(self):
+        self.assertTrue(ChatMessageListApi.view_is_async)
+        self.assertTrue(ChatListApi.view_is_async)
+
+    def test_history_pages_backwards_oldest_first(self):
+        url = reverse("chats:get_messages", kwargs={"chat_id": self.chat.id})
+
+        response = self.client.get(url, {"limit": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([m["content"] for m in response.data["data"]], ["m3", "m4"])
+
+        response = self.client.get(url, {"limit": 2, "before": response.data["data"][0]["id"]})
+        self.assertEqual([m["content"] for m in response.data["data"]], ["m1", "m2"])
+
+    def test_history_rejects_invalid_limit_and_cursor(self):
+        url = reverse("chats:get_messages", kwargs={"chat_id": self.chat.id})
+        for params in ({"limit": "abc"}, {"limit": 0}, {"limit": 501}, {"before": "not-an-id"}):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+            self.assertEqual(response.data["error"]["code"], "CHATS_004002")
+
+    def test_chat_list_contains_only_member_chats(self):
+        response = self.client.get(reverse("chats:chat_list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([c["id"] for c in response.data["data"]], [self.chat.id])
+        self.assertFalse(response.data["pagination"]["has_more"])
+
+    def test_chat_list_filters_by_type(self):
+        response = self.client.get(reverse("chats:chat_list"), {"type": Chat.PRIVATE})
+        self.assertEqual(response.data["data"], [])
+        response = self.client.get(reverse("chats:chat_list"), {"type": "nope"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"]["code"], "CHATS_001004")
+        self.assertIn("type", response.data["error"]["detail"])
+
+    def test_async_views_require_authentication(self):
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(reverse("chats:chat_list")).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(
+            self.client.get(reverse("chats:get_messages", kwargs={"chat_id": self.chat.id})).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
@@ -0,0 +1,108 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.tests.factories import UserFactory
+from chats.models import Chat, ChatMember, ChatAttachment, ChatAttachmentUpload
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, CHAT_ATTACHMENT_STORAGE="filesystem")
+class AttachmentUploadTestCase(APITestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.outsider = UserFactory()
+        self.chat = Chat.objects.create(type=Chat.GROUP, created_by=self.user)
+        ChatMember.objects.create(chat=self.chat, user=self.user, role=ChatMember.OWNER)
+        self.client.force_authenticate(user=self.user)
+
+        self.content = b"0123456789" * 10
+        self.sha256 = hashlib.sha256(self.content).hexdigest()
+        self.create_url = reverse("chats:attachment_upload_create", kwargs={"chat_id": self.chat.id})
+
+    def start(self, **extra):
+        data = {"filename": "notes.txt", "size": len(self.content), "mime_type": "text/plain", **extra}
+        return self.client.post(self.create_url, data, format="json")
+
+    def send_chunk(self, upload_id, offset, chunk):
+        return self.client.patch(
+            reverse("chats:attachment_upload_detail", kwargs={"pk": upload_id}),
+            chunk,
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def upload(self):
+        upload_id = self.start().data["data"]["upload_id"]
+        self.send_chunk(upload_id, 0, self.content[:60])
+        return self.send_chunk(upload_id, 60, self.content[60:])
+
+    def test_chunked_upload_creates_attachment(self):
+        response = self.start()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        upload_id = response.data["data"]["upload_id"]
+
+        response = self.send_chunk(upload_id, 0, self.content[:60])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["data"]["completed"])
+        self.assertEqual(response.data["data"]["offset"], 60)
+
+        response = self.send_chunk(upload_id, 60, self.content[60:])
+        self.assertTrue(response.data["data"]["completed"])
+        self.assertEqual(response.data["data"]["sha256"], self.sha256)
+        self.assertFalse(ChatAttachmentUpload.objects.exists())
+
+        download = self.client.get(
+            reverse("chats:attachment_download", kwargs={"pk": response.data["data"]["attachment_id"]})
+        )
+        self.assertEqual(download.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(download.streaming_content), self.content)
+
+    def test_offset_mismatch_returns_current_offset(self):
+        upload_id = self.start().data["data"]["upload_id"]
+        self.send_chunk(upload_id, 0, self.content[:30])
+
+        response = self.send_chunk(upload_id, 50, self.content[50:])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["error"]["detail"]["offset"], 30)
+
+        resume = self.client.get(reverse("chats:attachment_upload_detail", kwargs={"pk": upload_id}))
+        self.assertEqual(resume.data["data"]["offset"], 30)
+
+    def test_checksum_mismatch_resets_upload(self):
+        upload_id = self.start(sha256="0" * 64).data["data"]["upload_id"]
+        response = self.send_chunk(upload_id, 0, self.content)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(ChatAttachmentUpload.objects.get(id=upload_id).offset, 0)
+
+    def test_known_hash_skips_upload(self):
+        self.upload()
+
+        response = self.start(sha256=self.sha256)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(response.data["data"]["completed"])
+        self.assertEqual(ChatAttachment.objects.filter(sha256=self.sha256).count(), 2)
+
+    def test_same_content_is_stored_once(self):
+        self.upload()
+        self.upload()
+
+        self.assertEqual(ChatAttachment.objects.filter(sha256=self.sha256).count(), 2)
+        blob_dir = os.path.join(MEDIA_ROOT, "chat", "attachments", self.sha256[:2])
+        self.assertEqual(os.listdir(blob_dir), [self.sha256])
+
+    def test_non_member_cannot_upload(self):
+        self.client.force_authenticate(user=self.outsider)
+        response = self.start()
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
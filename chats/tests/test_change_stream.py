@@ -0,0 +1,130 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from bson import ObjectId
+from django.test import SimpleTestCase, override_settings
+from pymongo.errors import OperationFailure
+from chats.consumers.chat_consumer import ChatConsumer
+from chats.mongo.change_stream import MessageChangeStreamListener, ResumeTokenStore
+from chats.tests.mongo import MongoTestMixin
+
+
+class FakeChangeStream:
+    """
+    Stand-in for pymongo's ChangeStream: iterates canned changes and
+    exposes the token of the last one.
+    """
+
+    def __init__(self, changes):
+        self.changes = changes
+        self.resume_token = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        for index, change in enumerate(self.changes):
+            self.resume_token = {"_data": str(index)}
+            yield change
+
+
+def make_document(**extra):
+    return {
+        "_id": ObjectId(),
+        "chat_id": 3,
+        "sender_id": 1,
+        "type": "text",
+        "content": "hello",
+        "file": None,
+        "reply_to": None,
+        "created_at": datetime.utcnow(),
+        "edited_at": datetime.utcnow(),
+        "deleted": False,
+        **extra,
+    }
+
+
+class MessageChangeStreamListenerTestCase(MongoTestMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.channel_layer = MagicMock(group_send=AsyncMock())
+        self.token_store = ResumeTokenStore("test")
+        self.listener = MessageChangeStreamListener(channel_layer=self.channel_layer, token_store=self.token_store)
+
+    def sent_events(self):
+        return [
+            (call.args[0], call.args[1]["data"]["event"])
+            for call in self.channel_layer.group_send.call_args_list
+        ]
+
+    def test_changes_are_broadcast_to_chat_groups(self):
+        changes = [
+            {"operationType": "insert", "fullDocument": make_document()},
+            {
+                "operationType": "update",
+                "fullDocument": make_document(content="edited"),
+                "updateDescription": {"updatedFields": {"content": "edited", "edited_at": 1}},
+            },
+            {
+                "operationType": "update",
+                "fullDocument": make_document(deleted=True),
+                "updateDescription": {"updatedFields": {"deleted": True, "edited_at": 1}},
+            },
+            {
+                "operationType": "update",
+                "fullDocument": make_document(),
+                "updateDescription": {"updatedFields": {"reactions": 1}},
+            },
+        ]
+        with patch.object(self.listener, "_watch", return_value=FakeChangeStream(changes)):
+            self.listener.run_once()
+
+        self.assertEqual(self.sent_events(), [
+            ("chat_3", "message"),
+            ("chat_3", "message_edited"),
+            ("chat_3", "message_deleted"),
+        ])
+        self.assertEqual(self.token_store.load(), {"_data": "3"})
+
+    def test_listener_resumes_from_saved_token(self):
+        self.token_store.save({"_data": "7"})
+        with patch.object(self.listener, "_watch", return_value=FakeChangeStream([])) as watch:
+            self.listener.run_once()
+        watch.assert_called_once_with({"_data": "7"})
+
+    def test_expired_token_is_discarded(self):
+        self.token_store.save({"_data": "old"})
+        calls = []
+
+        def watch(token):
+            calls.append(token)
+            if token is not None:
+                raise OperationFailure("history lost", code=286)
+            self.listener.stop()
+            return FakeChangeStream([])
+
+        with patch.object(self.listener, "_watch", side_effect=watch), \
+                self.assertLogs("chats.mongo.change_stream", level="ERROR"):
+            self.listener.run(retry_delay=0)
+
+        self.assertEqual(calls, [{"_data": "old"}, None])
+
+
+@override_settings(CHAT_FANOUT_MODE="change_stream", CHAT_RATE_LIMITS={})
+class ConsumerChangeStreamModeTestCase(MongoTestMixin, SimpleTestCase):
+
+    async def test_consumer_persists_without_broadcasting(self):
+        consumer = ChatConsumer()
+        consumer.user = MagicMock(id=1, is_authenticated=True)
+        consumer.chat_id = 3
+        consumer.rate_limit_violations = 0
+        consumer.channel_layer = MagicMock(group_send=AsyncMock())
+        consumer.group_name = "chat_3"
+
+        await consumer.receive(text_data='{"event": "message", "content": "hi"}')
+
+        consumer.channel_layer.group_send.assert_not_called()
+        self.assertEqual(self.mongo_db["messages"].count_documents({"chat_id": 3}), 1)
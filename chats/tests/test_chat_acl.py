@@ -0,0 +1,49 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.tests.factories import UserFactory
+from chats.models import Chat, ChatMember
+from chats.services.chat_acl import ChatACL
+from chats.services.chat_service import ChatService
+from chats.tests.mongo import MongoTestMixin
+
+
+class ChatACLTestCase(MongoTestMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user = UserFactory()
+        self.chat = Chat.objects.create(type=Chat.GROUP, created_by=self.user)
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse("chats:get_messages", kwargs={"chat_id": self.chat.id})
+
+    def test_non_member_cannot_read_history(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data["code"], "CHATS_003001")
+
+    def test_cached_acl_costs_no_query(self):
+        ChatMember.objects.create(chat=self.chat, user=self.user, role=ChatMember.OWNER)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+    def test_membership_changes_invalidate_acl(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+        member = ChatMember.objects.create(chat=self.chat, user=self.user, role=ChatMember.MEMBER)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        member.delete()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_created_private_chat_members_are_visible(self):
+        other = UserFactory()
+        self.assertEqual(ChatACL.chat_ids(other.id), frozenset())
+
+        private_chat = ChatService.create_private_chat(user=self.user, target_user_id=other.id)
+        self.assertIn(private_chat.chat_id, ChatACL.chat_ids(other.id))
+        self.assertIn(private_chat.chat_id, ChatACL.chat_ids(self.user.id))
@@ -0,0 +1,72 @@
+import json
+from unittest.mock import AsyncMock
+from types import SimpleNamespace
+from bson import ObjectId
+from django.test import SimpleTestCase, override_settings
+from chats.consumers.chat_consumer import ChatConsumer
+from chats.consumers.frame_schema import FrameError, parse_frame, validate_message, validate_seen
+
+
+class FrameSchemaTestCase(SimpleTestCase):
+
+    def assertRejected(self, error_key, func, *args):
+        with self.assertRaises(FrameError) as ctx:
+            func(*args)
+        self.assertEqual(ctx.exception.error_key, error_key)
+
+    def test_parse_frame_rejects_malformed_json(self):
+        self.assertRejected("CHATS_002002", parse_frame, '{"event": ')
+        self.assertRejected("CHATS_002002", parse_frame, "[1, 2]")
+        self.assertRejected("CHATS_002002", parse_frame, "")
+
+    @override_settings(CHAT_MAX_FRAME_BYTES=64)
+    def test_parse_frame_enforces_size_before_parsing(self):
+        self.assertRejected("CHATS_002003", parse_frame, json.dumps({"content": "x" * 100}))
+        # 40 characters but 80 bytes in UTF-8
+        self.assertRejected("CHATS_002003", parse_frame, "ب" * 40)
+
+    def test_validate_message(self):
+        payload = validate_message({"content": "hi", "reply_to": str(ObjectId())})
+        self.assertEqual(payload["type"], "text")
+
+        self.assertRejected("CHATS_002005", validate_message, {"content": "hi", "type": "sticker"})
+        self.assertRejected("CHATS_002005", validate_message, {"content": "   "})
+        self.assertRejected("CHATS_002005", validate_message, {"content": "hi", "reply_to": "nope"})
+        self.assertRejected("CHATS_002005", validate_message, {"type": "image"})
+        self.assertRejected("CHATS_002005", validate_message, {"type": "image", "attachment_id": "abc"})
+
+    @override_settings(CHAT_MAX_MESSAGE_LENGTH=10)
+    def test_validate_message_content_length(self):
+        self.assertRejected("CHATS_002005", validate_message, {"content": "x" * 11})
+
+    def test_validate_seen_requires_message_id(self):
+        self.assertRejected("CHATS_002005", validate_seen, {})
+
+
+@override_settings(CHAT_RATE_LIMITS={})
+class ChatConsumerReceiveTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.consumer = ChatConsumer()
+        self.consumer.user = SimpleNamespace(id=1, is_authenticated=True)
+        self.consumer.chat_id = 1
+        self.consumer.rate_limit_violations = 0
+        self.consumer.send = AsyncMock()
+        self.consumer._broadcast_event = AsyncMock()
+
+    def sent_frame(self):
+        return json.loads(self.consumer.send.call_args.kwargs["text_data"])
+
+    async def test_malformed_frame_gets_error_and_keeps_connection(self):
+        await self.consumer.receive(text_data="not json")
+        self.assertEqual(self.sent_frame()["error"]["code"], "CHATS_002002")
+        self.consumer._broadcast_event.assert_not_called()
+
+    async def test_unknown_event(self):
+        await self.consumer.receive(text_data=json.dumps({"event": "explode"}))
+        self.assertEqual(self.sent_frame()["error"]["code"], "CHATS_002004")
+
+    async def test_valid_event_is_dispatched(self):
+        await self.consumer.receive(text_data=json.dumps({"event": "typing"}))
+        self.consumer._broadcast_event.assert_awaited_once()
+        self.consumer.send.assert_not_called()
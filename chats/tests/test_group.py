@@ -1,3 +1,4 @@
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -34,6 +35,21 @@ class GroupChatViewSetTestCase(APITestCase):
         self.assertEqual(len(data), 1)
         self.assertEqual(data[0]["title"], "Test Group")
 
+    @override_settings(REQUEST_PROFILING_ENABLED=True, QUERY_BUDGET_MODE="raise")
+    def test_list_members_without_n_plus_one(self):
+        """Member lists are prefetched: query count does not grow with chats/members"""
+        for n in range(5):
+            chat = Chat.objects.create(type=Chat.GROUP, created_by=self.user)
+            GroupChat.objects.create(chat=chat, title=f"Group {n}")
+            ChatMember.objects.bulk_create(
+                [ChatMember(chat=chat, user=self.user, role=ChatMember.OWNER)]
+                + [ChatMember(chat=chat, user=UserFactory()) for _ in range(4)]
+            )
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["data"]), 6)
+        self.assertIn('desc="2 queries"', response["Server-Timing"])
+
     def test_create_group_chat_success(self):
         """Create a new group chat successfully"""
         data = {
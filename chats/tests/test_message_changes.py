@@ -0,0 +1,151 @@
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.tests.factories import UserFactory
+from chats.consumers.chat_consumer import ChatConsumer
+from chats.models import Chat, ChatMember
+from chats.mongo.message_repository import MessageRepository
+from chats.tests.mongo import MongoTestMixin
+
+
+class MessageEditDeleteTestCase(MongoTestMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory()
+        self.other = UserFactory()
+        self.chat = Chat.objects.create(type=Chat.GROUP, created_by=self.user)
+        ChatMember.objects.create(chat=self.chat, user=self.user, role=ChatMember.OWNER)
+        self.client.force_authenticate(user=self.user)
+
+        self.since = datetime.utcnow() - timedelta(seconds=1)
+        self.messages = [
+            MessageRepository.create_message(chat_id=self.chat.id, sender_id=self.user.id, content=f"m{i}")
+            for i in range(3)
+        ]
+        self.url = reverse("chats:get_message_changes", kwargs={"chat_id": self.chat.id})
+
+    def _edit(self, message_id, user_id, content):
+        return MessageRepository.edit_message(
+            chat_id=self.chat.id, message_id=message_id, user_id=user_id, content=content,
+        )
+
+    def test_edit_only_own_message(self):
+        message_id = str(self.messages[0]["_id"])
+        self.assertIsNone(self._edit(message_id, self.other.id, "x"))
+        edited = self._edit(message_id, self.user.id, "fixed")
+        self.assertEqual(edited["content"], "fixed")
+        self.assertIsNotNone(edited["edited_at"])
+
+    def test_edit_of_other_chat_message_is_ignored(self):
+        other_chat = Chat.objects.create(type=Chat.GROUP, created_by=self.user)
+        message = MessageRepository.create_message(chat_id=other_chat.id, sender_id=self.user.id, content="m")
+        self.assertIsNone(self._edit(str(message["_id"]), self.user.id, "x"))
+        self.assertFalse(
+            MessageRepository.soft_delete_message(
+                chat_id=self.chat.id, message_id=str(message["_id"]), user_id=self.user.id,
+            )
+        )
+
+    def test_deleted_message_cannot_be_edited(self):
+        message_id = str(self.messages[0]["_id"])
+        self.assertTrue(
+            MessageRepository.soft_delete_message(chat_id=self.chat.id, message_id=message_id, user_id=self.user.id)
+        )
+        self.assertIsNone(self._edit(message_id, self.user.id, "x"))
+
+    def test_changes_since_returns_edits_and_tombstones(self):
+        self._edit(str(self.messages[0]["_id"]), self.user.id, "e")
+        MessageRepository.delete_message(
+            chat_id=self.chat.id, message_id=str(self.messages[2]["_id"]), user_id=self.user.id,
+        )
+
+        response = self.client.get(self.url, {"since": self.since.isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        changes = response.data["data"]["changes"]
+        self.assertEqual([c["id"] for c in changes], [str(self.messages[0]["_id"]), str(self.messages[2]["_id"])])
+        self.assertEqual(changes[0]["content"], "e")
+        self.assertTrue(changes[1]["deleted"])
+        self.assertIsNone(changes[1]["content"])
+
+        # Cursor from the last response yields nothing new
+        response = self.client.get(self.url, {
+            "since": response.data["data"]["next_since"],
+            "after_id": response.data["data"]["next_after_id"],
+        })
+        self.assertEqual(response.data["data"]["changes"], [])
+
+    def test_changes_paginate_with_cursor(self):
+        for message in self.messages:
+            self._edit(str(message["_id"]), self.user.id, "e")
+
+        first = self.client.get(self.url, {"since": self.since.isoformat(), "limit": 2}).data["data"]
+        self.assertTrue(first["has_more"])
+        second = self.client.get(self.url, {
+            "since": first["next_since"],
+            "after_id": first["next_after_id"],
+            "limit": 2,
+        }).data["data"]
+
+        ids = [c["id"] for c in first["changes"] + second["changes"]]
+        self.assertEqual(sorted(ids), sorted(str(m["_id"]) for m in self.messages))
+
+    def test_changes_require_membership(self):
+        self.client.force_authenticate(user=self.other)
+        response = self.client.get(self.url, {"since": self.since.isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"since": "yesterday"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(CHAT_RATE_LIMITS={})
+class ChatConsumerEditEventTestCase(MongoTestMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.consumer = ChatConsumer()
+        self.consumer.user = SimpleNamespace(id=1, is_authenticated=True)
+        self.consumer.chat_id = 5
+        self.consumer.rate_limit_violations = 0
+        self.consumer.send = AsyncMock()
+        self.consumer._broadcast_event = AsyncMock()
+        self.message = MessageRepository.create_message(chat_id=5, sender_id=1, content="hello")
+
+    async def test_edit_is_broadcast(self):
+        await self.consumer.receive(text_data=json.dumps({
+            "event": "edit", "message_id": str(self.message["_id"]), "content": "hi",
+        }))
+        kwargs = self.consumer._broadcast_event.call_args.kwargs
+        self.assertEqual(kwargs["event"], "message_edited")
+        self.assertEqual(kwargs["payload"]["content"], "hi")
+
+    async def test_delete_of_foreign_message_is_rejected(self):
+        self.consumer.user = SimpleNamespace(id=2, is_authenticated=True)
+        await self.consumer.receive(text_data=json.dumps({
+            "event": "delete", "message_id": str(self.message["_id"]),
+        }))
+        self.consumer._broadcast_event.assert_not_called()
+        sent = json.loads(self.consumer.send.call_args.kwargs["text_data"])
+        self.assertEqual(sent["error"]["code"], "CHATS_002006")
+
+    async def test_message_of_other_chat_is_rejected(self):
+        other = MessageRepository.create_message(chat_id=6, sender_id=1, content="elsewhere")
+        for frame in (
+            {"event": "edit", "message_id": str(other["_id"]), "content": "hi"},
+            {"event": "delete", "message_id": str(other["_id"])},
+        ):
+            await self.consumer.receive(text_data=json.dumps(frame))
+            sent = json.loads(self.consumer.send.call_args.kwargs["text_data"])
+            self.assertEqual(sent["error"]["code"], "CHATS_002006")
+        self.consumer._broadcast_event.assert_not_called()
+
+        stored = self.mongo_db["messages"].find_one({"_id": other["_id"]})
+        self.assertEqual((stored["content"], stored["deleted"]), ("elsewhere", False))
@@ -0,0 +1,79 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from django.test import SimpleTestCase, override_settings
+from chats.consumers.chat_consumer import ChatConsumer
+from utils import metrics
+
+
+class MetricsBackendTestCase(SimpleTestCase):
+
+    def tearDown(self):
+        metrics.configure()
+
+    def test_disabled_metrics_record_nothing(self):
+        backend = metrics.configure(enabled=False)
+        metrics.inc("chat_events_total", event="message")
+        with metrics.timer("chat_persist_seconds"):
+            pass
+        self.assertEqual(backend.render(), "")
+
+    def test_render_prometheus_text(self):
+        backend = metrics.configure(backend=metrics.InMemoryBackend(buckets=(0.1, 1.0)), enabled=True)
+        metrics.inc("chat_events_total", event="message")
+        metrics.inc("chat_events_total", event="message")
+        metrics.observe("chat_persist_seconds", 0.5)
+
+        text = backend.render()
+        self.assertIn("# TYPE chat_events_total counter", text)
+        self.assertIn('chat_events_total{event="message"} 2', text)
+        self.assertIn('chat_persist_seconds_bucket{le="0.1"} 0', text)
+        self.assertIn('chat_persist_seconds_bucket{le="1.0"} 1', text)
+        self.assertIn("chat_persist_seconds_count 1", text)
+
+    async def test_scrape_endpoint(self):
+        metrics.configure(backend=metrics.InMemoryBackend(), enabled=True)
+        metrics.inc("chat_connects_total")
+        inner = AsyncMock()
+        app = metrics.MetricsASGIMiddleware(inner)
+        send = AsyncMock()
+
+        await app({"type": "http", "path": "/metrics"}, AsyncMock(), send)
+        inner.assert_not_called()
+        self.assertEqual(send.call_args_list[0].args[0]["status"], 200)
+        self.assertIn(b"chat_connects_total 1", send.call_args_list[1].args[0]["body"])
+
+        await app({"type": "http", "path": "/api/chats/"}, AsyncMock(), send)
+        inner.assert_awaited_once()
+
+
+@override_settings(CHAT_RATE_LIMITS={})
+class ChatConsumerMetricsTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.backend = metrics.configure(backend=metrics.InMemoryBackend(), enabled=True)
+        self.consumer = ChatConsumer()
+        self.consumer.scope = {"user": None, "url_route": {"kwargs": {"chat_id": "1"}}}
+        self.consumer.close = AsyncMock()
+        self.consumer.send = AsyncMock()
+        self.consumer.channel_layer = SimpleNamespace(group_send=AsyncMock())
+        self.consumer.group_name = "chat_1"
+
+    def tearDown(self):
+        metrics.configure()
+
+    async def test_unauthenticated_connect_counts_reject(self):
+        await self.consumer.connect()
+        self.assertEqual(self.backend.get("chat_connect_rejects_total", code="4001"), 1)
+
+    async def test_events_and_fan_out_are_recorded(self):
+        self.consumer.user = SimpleNamespace(id=1, is_authenticated=True)
+        self.consumer.chat_id = 1
+        self.consumer.rate_limit_violations = 0
+
+        await self.consumer.receive(text_data=json.dumps({"event": "typing"}))
+        await self.consumer.receive(text_data="{")
+
+        self.assertEqual(self.backend.get("chat_events_total", event="typing"), 1)
+        self.assertEqual(self.backend.get("chat_group_send_seconds", event="typing"), 1)
+        self.assertEqual(self.backend.get("chat_frame_rejects_total", code="CHATS_002002"), 1)
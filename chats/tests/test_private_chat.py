@@ -1,3 +1,5 @@
+from django.core.cache import cache
+from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -13,6 +15,7 @@ class PrivateChatViewSetTestCase(APITestCase):
         self.user = UserFactory()
         self.user2 = UserFactory()
         self.client.force_authenticate(user=self.user)
+        cache.clear()
 
         self.create_url = reverse("chats:chat_private_create")
 
@@ -55,3 +58,49 @@ class PrivateChatViewSetTestCase(APITestCase):
         data = {"user_id": self.user2.id}
         response = self.client.post(self.create_url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_create_private_chat_is_idempotent(self):
+        """Creating the same pair twice returns the existing chat"""
+        data = {"user_id": self.user2.id}
+        first = self.client.post(self.create_url, data, format="json")
+        second = self.client.post(self.create_url, data, format="json")
+
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(first.data["data"]["chat_id"], second.data["data"]["chat_id"])
+        self.assertEqual(PrivateChat.objects.count(), 1)
+        self.assertEqual(Chat.objects.filter(type=Chat.PRIVATE).count(), 1)
+
+    def test_create_private_chat_unknown_user(self):
+        """Target user must exist"""
+        data = {"user_id": self.user2.id + 1000}
+        response = self.client.post(self.create_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(PrivateChat.objects.exists())
+
+
+class ChatServicePrivateChatTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        self.user2 = UserFactory()
+
+    def test_existing_chat_is_returned_from_cache(self):
+        private_chat = ChatService.create_private_chat(user=self.user, target_user_id=self.user2.id)
+
+        with self.assertNumQueries(1):
+            again = ChatService.create_private_chat(user=self.user2, target_user_id=self.user.id)
+
+        self.assertEqual(again.chat_id, private_chat.chat_id)
+
+    def test_lost_race_returns_winner(self):
+        """An IntegrityError on the pair constraint falls back to the committed chat"""
+        winner = ChatService.create_private_chat(user=self.user, target_user_id=self.user2.id)
+        cache.clear()
+
+        with patch.object(ChatService, "get_private_chat", return_value=None):
+            private_chat = ChatService.create_private_chat(user=self.user, target_user_id=self.user2.id)
+
+        self.assertEqual(private_chat.chat_id, winner.chat_id)
+        self.assertEqual(PrivateChat.objects.count(), 1)
+        self.assertEqual(Chat.objects.filter(type=Chat.PRIVATE).count(), 1)
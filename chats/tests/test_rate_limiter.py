@@ -0,0 +1,84 @@
+from unittest.mock import AsyncMock, patch
+from django.test import SimpleTestCase, override_settings
+from chats.services.rate_limiter import ChatRateLimiter, TokenBucket
+
+LIMITS = {
+    "message": {"user": (1, 3), "chat": (1, 5)},
+}
+
+
+@override_settings(CHAT_RATE_LIMITS=LIMITS, CHAT_RATE_LIMIT_REDIS_URL=None)
+class ChatRateLimiterTestCase(SimpleTestCase):
+
+    def setUp(self):
+        ChatRateLimiter.reset()
+
+    def test_token_bucket_refills_over_time(self):
+        with patch("chats.services.rate_limiter.time.monotonic", return_value=100.0):
+            bucket = TokenBucket(rate=2, capacity=2)
+            self.assertTrue(bucket.consume()[0])
+            self.assertTrue(bucket.consume()[0])
+            allowed, retry_after = bucket.consume()
+            self.assertFalse(allowed)
+            self.assertAlmostEqual(retry_after, 0.5)
+
+        with patch("chats.services.rate_limiter.time.monotonic", return_value=100.5):
+            self.assertTrue(bucket.consume()[0])
+
+    async def test_user_burst_is_enforced(self):
+        for _ in range(3):
+            allowed, _ = await ChatRateLimiter.allow(event="message", user_id=1, chat_id=1)
+            self.assertTrue(allowed)
+
+        allowed, retry_after = await ChatRateLimiter.allow(event="message", user_id=1, chat_id=1)
+        self.assertFalse(allowed)
+        self.assertGreater(retry_after, 0)
+
+    async def test_chat_bucket_is_shared_between_users(self):
+        results = [
+            (await ChatRateLimiter.allow(event="message", user_id=user_id, chat_id=7))[0]
+            for user_id in range(6)
+        ]
+        self.assertEqual(results, [True] * 5 + [False])
+
+    async def test_unlimited_event_is_allowed(self):
+        for _ in range(100):
+            allowed, _ = await ChatRateLimiter.allow(event="typing", user_id=1, chat_id=1)
+            self.assertTrue(allowed)
+
+    @override_settings(CHAT_RATE_LIMITS={"message": {"user": (1, 3), "chat": (1, 2)}})
+    async def test_denied_event_consumes_no_token(self):
+        with patch("chats.services.rate_limiter.time.monotonic", return_value=100.0):
+            self.assertTrue((await ChatRateLimiter.allow(event="message", user_id=1, chat_id=7))[0])
+            self.assertTrue((await ChatRateLimiter.allow(event="message", user_id=2, chat_id=7))[0])
+            for _ in range(2):
+                self.assertFalse((await ChatRateLimiter.allow(event="message", user_id=1, chat_id=7))[0])
+            # the full chat bucket did not drain user 1's
+            self.assertEqual(ChatRateLimiter._buckets[("user", "message", 1)].tokens, 2)
+            self.assertTrue((await ChatRateLimiter.allow(event="message", user_id=1, chat_id=8))[0])
+
+    async def test_local_buckets_stay_bounded(self):
+        with patch.object(ChatRateLimiter, "MAX_LOCAL_BUCKETS", 10), \
+                patch("chats.services.rate_limiter.time.monotonic", return_value=100.0):
+            for user_id in range(50):
+                await ChatRateLimiter.allow(event="message", user_id=user_id, chat_id=user_id)
+                # the first user keeps sending, so its bucket is never the least recently used
+                await ChatRateLimiter.allow(event="message", user_id=0, chat_id=0)
+                self.assertLessEqual(len(ChatRateLimiter._buckets), 10)
+
+            allowed, _ = await ChatRateLimiter.allow(event="message", user_id=0, chat_id=0)
+            self.assertFalse(allowed)
+
+    @override_settings(CHAT_RATE_LIMIT_REDIS_URL="redis://localhost:6379/9")
+    async def test_redis_checks_both_buckets_in_one_call(self):
+        script = AsyncMock(return_value=[0, "1.5"])
+        with patch.object(ChatRateLimiter, "_redis", object()), patch.object(ChatRateLimiter, "_redis_script", script):
+            allowed, retry_after = await ChatRateLimiter.allow(event="message", user_id=1, chat_id=7)
+
+        self.assertEqual((allowed, retry_after), (False, 1.5))
+        script.assert_awaited_once_with(
+            keys=["chat_ratelimit:user:message:1", "chat_ratelimit:chat:message:7"],
+            args=[1, 3, 1, 5],
+        )
+        # denied by Redis, so not charged locally
+        self.assertTrue(ChatRateLimiter._buckets[("user", "message", 1)].is_full())
@@ -0,0 +1,145 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.tests.factories import UserFactory
+from chats.consumers.chat_consumer import ChatConsumer
+from chats.models import Chat, ChatMember
+from chats.mongo.message_repository import MessageRepository
+from chats.services.rate_limiter import ChatRateLimiter
+from chats.tests.mongo import MongoTestMixin
+
+
+class MessageCountersTestCase(MongoTestMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        MessageRepository.ensure_indexes()
+        self.parent = MessageRepository.create_message(chat_id=1, sender_id=1, content="root")
+
+    def _reload(self):
+        return MessageRepository.get_message(chat_id=1, message_id=str(self.parent["_id"]))
+
+    def test_replies_increment_and_decrement_parent_counter(self):
+        replies = [
+            MessageRepository.create_message(chat_id=1, sender_id=2, content=f"r{i}", reply_to=str(self.parent["_id"]))
+            for i in range(3)
+        ]
+        self.assertEqual(self._reload()["reply_count"], 3)
+
+        MessageRepository.delete_message(chat_id=1, message_id=str(replies[0]["_id"]), user_id=2)
+        self.assertEqual(self._reload()["reply_count"], 2)
+
+        thread = MessageRepository.fetch_thread(chat_id=1, message_id=str(self.parent["_id"]))
+        self.assertEqual([m["content"] for m in thread], ["r1", "r2"])
+
+    def test_reply_to_message_of_other_chat_is_rejected(self):
+        self.assertIsNone(
+            MessageRepository.create_message(chat_id=2, sender_id=2, content="x", reply_to=str(self.parent["_id"]))
+        )
+        self.assertEqual(self.mongo_db["messages"].count_documents({}), 1)
+
+    def test_reactions_are_counted_once_per_user(self):
+        message_id = str(self.parent["_id"])
+        for user_id in (1, 2, 2):
+            MessageRepository.add_reaction(chat_id=1, message_id=message_id, user_id=user_id, emoji="👍")
+        MessageRepository.add_reaction(chat_id=1, message_id=message_id, user_id=1, emoji="🎉")
+        self.assertEqual(self._reload()["reactions"], {"👍": 2, "🎉": 1})
+
+        message = MessageRepository.remove_reaction(chat_id=1, message_id=message_id, user_id=1, emoji="🎉")
+        self.assertEqual(message["reactions"], {"👍": 2})
+        self.assertEqual(self._reload()["reactions"], {"👍": 2})
+
+    def test_reaction_on_missing_message_leaves_no_trace(self):
+        message_id = str(self.parent["_id"])
+        self.assertIsNone(MessageRepository.add_reaction(chat_id=2, message_id=message_id, user_id=1, emoji="👍"))
+        self.assertEqual(self.mongo_db["message_reactions"].count_documents({}), 0)
+
+
+class MessageThreadApiTestCase(MongoTestMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory()
+        self.chat = Chat.objects.create(type=Chat.GROUP, created_by=self.user)
+        ChatMember.objects.create(chat=self.chat, user=self.user, role=ChatMember.OWNER)
+        self.client.force_authenticate(user=self.user)
+
+        self.parent = MessageRepository.create_message(chat_id=self.chat.id, sender_id=self.user.id, content="root")
+        for i in range(3):
+            MessageRepository.create_message(
+                chat_id=self.chat.id, sender_id=self.user.id, content=f"r{i}", reply_to=str(self.parent["_id"])
+            )
+        self.url = reverse(
+            "chats:get_message_thread",
+            kwargs={"chat_id": self.chat.id, "message_id": str(self.parent["_id"])},
+        )
+
+    def test_thread_returns_parent_counters_and_replies(self):
+        response = self.client.get(self.url, {"limit": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.data["data"]
+        self.assertEqual(data["message"]["reply_count"], 3)
+        self.assertEqual([m["content"] for m in data["replies"]], ["r0", "r1"])
+        self.assertTrue(data["has_more"])
+
+        response = self.client.get(self.url, {"after": data["replies"][-1]["id"]})
+        self.assertEqual([m["content"] for m in response.data["data"]["replies"]], ["r2"])
+
+    def test_history_includes_counters(self):
+        response = self.client.get(reverse("chats:get_messages", kwargs={"chat_id": self.chat.id}))
+        root = response.data["data"][0]
+        self.assertEqual(root["reply_count"], 3)
+        self.assertEqual(root["reactions"], {})
+
+    def test_unknown_message_returns_404(self):
+        url = reverse("chats:get_message_thread", kwargs={"chat_id": self.chat.id, "message_id": "nope"})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_thread_requires_membership(self):
+        self.client.force_authenticate(user=UserFactory())
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ChatConsumerReactionTestCase(MongoTestMixin, SimpleTestCase):
+
+    def setUp(self):
+        super().setUp()
+        MessageRepository.ensure_indexes()
+        ChatRateLimiter.reset()
+        self.consumer = ChatConsumer()
+        self.consumer.user = SimpleNamespace(id=1, is_authenticated=True)
+        self.consumer.chat_id = 5
+        self.consumer.rate_limit_violations = 0
+        self.consumer.send = AsyncMock()
+        self.consumer._broadcast_event = AsyncMock()
+        self.message = MessageRepository.create_message(chat_id=5, sender_id=2, content="hello")
+
+    async def test_reaction_broadcasts_counters(self):
+        await self.consumer.receive(text_data=json.dumps({
+            "event": "react", "message_id": str(self.message["_id"]), "emoji": "👍",
+        }))
+        kwargs = self.consumer._broadcast_event.call_args.kwargs
+        self.assertEqual(kwargs["event"], "message_reaction")
+        self.assertEqual(kwargs["payload"]["reactions"], {"👍": 1})
+        self.assertTrue(kwargs["payload"]["added"])
+
+    async def test_reaction_key_cannot_be_a_mongo_path(self):
+        await self.consumer.receive(text_data=json.dumps({
+            "event": "react", "message_id": str(self.message["_id"]), "emoji": "a.b",
+        }))
+        self.consumer._broadcast_event.assert_not_called()
+        sent = json.loads(self.consumer.send.call_args.kwargs["text_data"])
+        self.assertEqual(sent["error"]["code"], "CHATS_002005")
+
+    async def test_reply_to_unknown_message_is_rejected(self):
+        await self.consumer.receive(text_data=json.dumps({
+            "event": "message", "content": "hi", "reply_to": "0" * 24,
+        }))
+        self.consumer._broadcast_event.assert_not_called()
+        sent = json.loads(self.consumer.send.call_args.kwargs["text_data"])
+        self.assertEqual(sent["error"]["code"], "CHATS_002007")
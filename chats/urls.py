@@ -1,5 +1,16 @@
 from django.urls import path
-from .views import (PrivateChatViewSet, ChatViewSet, GroupChatViewSet, ChatMessageListApi)
+from .views import (
+    PrivateChatViewSet,
+    ChatViewSet,
+    ChatListApi,
+    GroupChatViewSet,
+    ChatMessageListApi,
+    ChatMessageChangesApi,
+    ChatMessageThreadApi,
+    AttachmentUploadViewSet,
+    AttachmentDownloadApi,
+    AnnouncementViewSet,
+)
 
 app_name = "chats"
 
@@ -24,12 +35,42 @@ urlpatterns = [
         name="chat_group_detail"
     ),
 
-    path("messages/<chat_id>/", ChatMessageListApi.as_view(), name="get_messages"),
+    path("messages/<int:chat_id>/", ChatMessageListApi.as_view(), name="get_messages"),
+    path("messages/<int:chat_id>/changes/", ChatMessageChangesApi.as_view(), name="get_message_changes"),
+    path(
+        "messages/<int:chat_id>/threads/<str:message_id>/",
+        ChatMessageThreadApi.as_view(),
+        name="get_message_thread"
+    ),
+
+    # Attachments
+    path(
+        "<int:chat_id>/attachments/uploads/",
+        AttachmentUploadViewSet.as_view({"post": "create"}),
+        name="attachment_upload_create"
+    ),
+    path(
+        "attachments/uploads/<uuid:pk>/",
+        AttachmentUploadViewSet.as_view({"get": "retrieve", "patch": "append"}),
+        name="attachment_upload_detail"
+    ),
+    path(
+        "attachments/<uuid:pk>/",
+        AttachmentDownloadApi.as_view(),
+        name="attachment_download"
+    ),
+
+    # Team announcements
+    path(
+        "teams/<int:team_id>/announcements/",
+        AnnouncementViewSet.as_view({"get": "list", "post": "create"}),
+        name="team_announcements"
+    ),
 
     # Chats
     path(
         "",
-        ChatViewSet.as_view({"get": "list"}),
+        ChatListApi.as_view(),
         name="chat_list"
     ),
     path(
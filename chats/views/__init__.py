@@ -1,4 +1,6 @@
-from .chat_viewset import ChatViewSet
+from .chat_viewset import ChatViewSet, ChatListApi
 from .group_chat_viewset import GroupChatViewSet
 from .private_chat_viewset import PrivateChatViewSet
-from .message_view import ChatMessageListApi
+from .message_view import ChatMessageListApi, ChatMessageChangesApi, ChatMessageThreadApi
+from .attachment_view import AttachmentUploadViewSet, AttachmentDownloadApi
+from .announcement_view import AnnouncementViewSet
@@ -0,0 +1,95 @@
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.viewsets import ViewSet
+from drf_spectacular.utils import extend_schema, OpenApiResponse
+
+from utils.response import success_response, error_response
+from utils.profiling import query_budget
+from chats.errors.loader import get_error
+from teams.models import TeamMember
+from ..mongo.announcement_repository import AnnouncementRepository
+from ..serializers.announcement import (
+    AnnouncementCreateSerializer,
+    AnnouncementListQuerySerializer,
+    AnnouncementSerializer,
+)
+from ..services.announcement_service import AnnouncementError, AnnouncementService
+
+
+class AnnouncementViewSet(ViewSet):
+    """
+    Team-wide announcements, delivered over ws/teams/<team_id>/.
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(
+        summary="Send a team announcement",
+        description=(
+                "Stores one announcement referencing the given chats (default: the team's group chat) "
+                "and pushes it to every connected team member. Only team owners or admins may announce."
+        ),
+        request=AnnouncementCreateSerializer,
+        responses={
+            201: OpenApiResponse(description="Announcement sent", response=AnnouncementSerializer),
+            400: OpenApiResponse(description="Invalid data"),
+            403: OpenApiResponse(description="Not an owner/admin of the team"),
+        }
+    )
+    def create(self, request, team_id: int = None):
+        serializer = AnnouncementCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(
+                error_dict=get_error(key="CHATS_005003", details=serializer.errors),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            document = AnnouncementService.announce(
+                user=request.user,
+                team_id=team_id,
+                content=serializer.validated_data["content"],
+                chat_ids=serializer.validated_data.get("chat_ids"),
+            )
+        except AnnouncementError as exc:
+            error = dict(get_error(key=exc.error_key))
+            if exc.detail is not None:
+                error["detail"] = exc.detail
+            return error_response(
+                error_dict=error,
+                status=status.HTTP_400_BAD_REQUEST if exc.error_key == "CHATS_005003" else status.HTTP_403_FORBIDDEN
+            )
+
+        return success_response(AnnouncementSerializer(document).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="List team announcements",
+        description="Newest first. Use `before` (announcement id) to page back.",
+        parameters=[AnnouncementListQuerySerializer],
+        responses={
+            200: OpenApiResponse(description="Announcements", response=AnnouncementSerializer(many=True)),
+            400: OpenApiResponse(description="Invalid limit or cursor"),
+            403: OpenApiResponse(description="Not a team member"),
+        }
+    )
+    @query_budget(2, mongo=1)
+    def list(self, request, team_id: int = None):
+        if not TeamMember.objects.filter(team_id=team_id, user=request.user, is_active=True).exists():
+            return error_response(
+                error_dict=get_error(key="CHATS_005001"),
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        query = AnnouncementListQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return error_response(
+                error_dict=get_error(key="CHATS_005004", details=query.errors),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        announcements = AnnouncementRepository.fetch_announcements(
+            team_id=team_id,
+            limit=query.validated_data["limit"],
+            before=query.validated_data.get("before"),
+        )
+        return success_response(AnnouncementSerializer(announcements, many=True).data)
@@ -0,0 +1,170 @@
+from django.http import FileResponse, StreamingHttpResponse
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from rest_framework.viewsets import ViewSet
+from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
+
+from utils.response import success_response, error_response
+from chats.errors.loader import get_error
+from ..models.attachment import ChatAttachment, ChatAttachmentUpload
+from ..serializers.attachment import (
+    AttachmentSerializer,
+    AttachmentUploadCreateSerializer,
+    AttachmentUploadSerializer,
+)
+from ..services.attachment_service import AttachmentService, AttachmentUploadError
+from ..services.attachment_storage import get_attachment_store, iter_file
+
+UPLOAD_ERROR_STATUS = {
+    "CHATS_003001": status.HTTP_403_FORBIDDEN,
+    "CHATS_003003": status.HTTP_404_NOT_FOUND,
+    "CHATS_003004": status.HTTP_409_CONFLICT,
+}
+
+
+def upload_error_response(exc: AttachmentUploadError):
+    error = dict(get_error(key=exc.error_key))
+    if exc.detail is not None:
+        error["detail"] = exc.detail
+    return error_response(
+        error_dict=error,
+        status=UPLOAD_ERROR_STATUS.get(exc.error_key, status.HTTP_400_BAD_REQUEST)
+    )
+
+
+def upload_result_response(result, status_code=status.HTTP_200_OK):
+    """
+    In-progress uploads report their offset; finished ones their attachment.
+    """
+    if isinstance(result, ChatAttachment):
+        return success_response(
+            {"completed": True, **AttachmentSerializer(result).data},
+            status=status_code
+        )
+    return success_response(
+        {"completed": False, **AttachmentUploadSerializer(result).data},
+        status=status_code
+    )
+
+
+class AttachmentUploadViewSet(ViewSet):
+    """
+    Resumable chunked uploads for chat attachments.
+
+    1. POST   /<chat_id>/attachments/uploads/        -> upload_id (or attachment if already stored)
+    2. PATCH  /attachments/uploads/<upload_id>/      raw chunk body + `Upload-Offset` header
+    3. GET    /attachments/uploads/<upload_id>/      current offset, to resume after a failure
+
+    The chunk that completes the upload returns the attachment id, which
+    messages reference via `attachment_id`.
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(
+        summary="Start attachment upload",
+        description=(
+                "Opens a resumable upload for a chat the user is a member of. "
+                "If `sha256` matches a file the user already uploaded, the attachment "
+                "is created immediately and no bytes need to be sent."
+        ),
+        request=AttachmentUploadCreateSerializer,
+        responses={
+            201: OpenApiResponse(description="Upload started or attachment created"),
+            400: OpenApiResponse(description="Invalid request"),
+            403: OpenApiResponse(description="Not a chat member"),
+        }
+    )
+    def create(self, request, chat_id: int = None):
+        serializer = AttachmentUploadCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(
+                error_dict=get_error(key="CHATS_003002", details=serializer.errors),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            result = AttachmentService.start_upload(
+                user=request.user,
+                chat_id=chat_id,
+                data=serializer.validated_data,
+            )
+        except AttachmentUploadError as exc:
+            return upload_error_response(exc)
+
+        return upload_result_response(result, status_code=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="Get upload offset",
+        description="Returns how many bytes of the upload have been stored, so the client can resume.",
+        responses={200: AttachmentUploadSerializer, 404: OpenApiResponse(description="Upload not found")}
+    )
+    def retrieve(self, request, pk=None):
+        upload = ChatAttachmentUpload.objects.filter(id=pk, user=request.user).first()
+        if upload is None:
+            return upload_error_response(AttachmentUploadError("CHATS_003003"))
+        return upload_result_response(upload)
+
+    @extend_schema(
+        summary="Upload a chunk",
+        description=(
+                "Appends the raw request body at `Upload-Offset`. The offset must equal the "
+                "stored offset; on mismatch a 409 with the current offset is returned."
+        ),
+        parameters=[OpenApiParameter("Upload-Offset", int, OpenApiParameter.HEADER, required=True)],
+        responses={
+            200: OpenApiResponse(description="Chunk stored; attachment returned when complete"),
+            409: OpenApiResponse(description="Offset mismatch"),
+        }
+    )
+    def append(self, request, pk=None):
+        try:
+            offset = int(request.headers.get("Upload-Offset", ""))
+            length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            return upload_error_response(
+                AttachmentUploadError("CHATS_003002", {"Upload-Offset": "Header is required."})
+            )
+
+        try:
+            result = AttachmentService.append_chunk(
+                user=request.user,
+                upload_id=pk,
+                offset=offset,
+                length=length,
+                stream=request.stream,
+            )
+        except AttachmentUploadError as exc:
+            return upload_error_response(exc)
+
+        return upload_result_response(result)
+
+
+class AttachmentDownloadApi(APIView):
+    """
+    Stream an attachment's content to a member of its chat.
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(
+        summary="Download attachment",
+        responses={200: OpenApiResponse(description="File content"), 404: OpenApiResponse(description="Not found")}
+    )
+    def get(self, request, pk):
+        attachment = AttachmentService.get_for_member(user=request.user, attachment_id=pk)
+        if attachment is None:
+            return error_response(
+                error_dict=get_error(key="CHATS_003006"),
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        blob = get_attachment_store().open(attachment.sha256)
+        if hasattr(blob, "fileno"):
+            response = FileResponse(blob, content_type=attachment.mime_type or None)
+        else:
+            response = StreamingHttpResponse(iter_file(blob), content_type=attachment.mime_type or None)
+        response["Content-Length"] = attachment.size
+        response["Content-Disposition"] = f'attachment; filename="{attachment.filename}"'
+        return response
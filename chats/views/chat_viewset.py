@@ -1,45 +1,75 @@
-from rest_framework.viewsets import ReadOnlyModelViewSet
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.mixins import RetrieveModelMixin
+from rest_framework.viewsets import GenericViewSet
 from rest_framework.permissions import IsAuthenticated
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
-from utils.response import success_response
+from utils.async_views import AsyncAPIView
+from utils.filters import InvalidFilter, QueryParamFilterBackend
+from utils.pagination import EnvelopeCursorPagination
+from utils.response import success_response, error_response
+from utils.profiling import query_budget
+from chats.errors.loader import get_error
 from ..models.chat import Chat
 from ..serializers.chat import ChatListSerializer, ChatSerializer
 
 
-class ChatViewSet(ReadOnlyModelViewSet):
+def user_chats(user):
+    return (
+        Chat.objects
+        .filter(members__user=user)
+        .distinct()
+        .select_related("created_by")
+    )
+
+
+class ChatListApi(AsyncAPIView):
     """
-    List and retrieve chats that the authenticated user is a member of.
+    List chats that the authenticated user is a member of, cursor-paginated
+    like the generic list endpoints. The page query runs in a worker thread
+    through sync_to_async, as CursorPagination evaluates it synchronously.
     """
 
     permission_classes = (IsAuthenticated,)
-
-    def get_queryset(self):
-        return (
-            Chat.objects
-            .filter(members__user=self.request.user)
-            .distinct()
-            .select_related("created_by")
-        )
-
-    def get_serializer_class(self):
-        if self.action == "list":
-            return ChatListSerializer
-        return ChatSerializer
+    filter_fields = {"type": "type"}
 
     @extend_schema(
         summary="List user chats",
         description="Returns all chats (private and group) the authenticated user is a member of.",
         responses={
             200: OpenApiResponse(
-                description="List of user chats",
-                response=ChatListSerializer
-            )
+                description="List of user chats (cursor-paginated)",
+                response=ChatListSerializer(many=True)
+            ),
+            400: OpenApiResponse(description="Invalid filter value")
         }
     )
-    def list(self, request, *args, **kwargs):
-        serializer = self.get_serializer(self.get_queryset(), many=True)
-        return success_response(serializer.data)
+    @query_budget(2)
+    async def get(self, request):
+        try:
+            queryset = QueryParamFilterBackend().filter_queryset(request, user_chats(request.user), self)
+        except InvalidFilter as exc:
+            return error_response(
+                error_dict=get_error(key="CHATS_001004", details=exc.detail),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        paginator = EnvelopeCursorPagination()
+        # CursorPagination evaluates the page itself (list(queryset[...]))
+        chats = await sync_to_async(paginator.paginate_queryset)(queryset, request, self)
+        return paginator.get_paginated_response(ChatListSerializer(chats, many=True).data)
+
+
+class ChatViewSet(RetrieveModelMixin, GenericViewSet):
+    """
+    Retrieve chats that the authenticated user is a member of.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    serializer_class = ChatSerializer
+
+    def get_queryset(self):
+        return user_chats(self.request.user)
 
     @extend_schema(
         summary="Retrieve chat details",
@@ -51,6 +81,7 @@ class ChatViewSet(ReadOnlyModelViewSet):
             )
         }
     )
+    @query_budget(2)
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
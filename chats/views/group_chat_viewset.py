@@ -3,6 +3,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 from utils.response import success_response, error_response
+from utils.profiling import query_budget
 from chats.errors.loader import get_error
 from ..models.group_chat import GroupChat
 from ..serializers.group_chat import (
@@ -18,7 +19,7 @@ class GroupChatViewSet(ModelViewSet):
     """
 
     permission_classes = (IsAuthenticated,)
-    queryset = GroupChat.objects.select_related("chat")
+    queryset = GroupChat.objects.select_related("chat").prefetch_related("chat__members")
     http_method_names = ["post", "get"]
 
     def get_serializer_class(self):
@@ -67,6 +68,8 @@ class GroupChatViewSet(ModelViewSet):
             )
         }
     )
+    @query_budget(3)
     def list(self, request, *args, **kwargs):
-        serializer = self.get_serializer(self.get_queryset(), many=True)
-        return success_response(serializer.data)
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
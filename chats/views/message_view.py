@@ -1,17 +1,153 @@
+from bson import ObjectId
+from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
-from utils.response import success_response
+from drf_spectacular.utils import extend_schema, OpenApiResponse
+from utils.async_views import AsyncAPIView
+from utils.response import success_response, error_response
+from utils.profiling import query_budget
+from chats.errors.loader import get_error
 
+from ..permissions import IsChatMember
 from ..mongo.message_repository import MessageRepository
+from ..serializers.message import (
+    MessageSerializer, MessageHistoryQuerySerializer, MessageChangesQuerySerializer, MessageThreadQuerySerializer
+)
 
 
-class ChatMessageListApi(APIView):
-    permission_classes = (IsAuthenticated,)
+class ChatMessageListApi(AsyncAPIView):
+    """
+    Message history, served as an async view awaiting the async Mongo client.
+    Membership is checked against the cached chat ACL.
+    """
 
-    def get(self, request, chat_id):
-        messages = MessageRepository.fetch_messages(
+    permission_classes = (IsAuthenticated, IsChatMember)
+
+    @extend_schema(
+        summary="List chat messages",
+        description="Returns up to `limit` messages, oldest first. Pass `before` (message id) to page backwards.",
+        parameters=[MessageHistoryQuerySerializer],
+        responses={
+            200: OpenApiResponse(description="Messages, oldest first"),
+            400: OpenApiResponse(description="Invalid limit or cursor"),
+            403: OpenApiResponse(description="Not a chat member"),
+        }
+    )
+    @query_budget(2, mongo=1)
+    async def get(self, request, chat_id: int):
+        query = MessageHistoryQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return error_response(
+                error_dict=get_error(key="CHATS_004002", details=query.errors),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        messages = await MessageRepository.afetch_messages(
+            chat_id=chat_id,
+            limit=query.validated_data["limit"],
+            before=query.validated_data.get("before"),
+        )
+        return success_response(MessageSerializer(messages, many=True).data)
+
+
+class ChatMessageChangesApi(APIView):
+    """
+    Incremental sync of edits and deletes.
+
+    Clients keep the `next_since` / `next_after_id` cursor from the previous
+    call and only receive messages changed after it, instead of refetching
+    history pages.
+    """
+
+    permission_classes = (IsAuthenticated, IsChatMember)
+
+    @extend_schema(
+        summary="List message changes since a cursor",
+        description=(
+                "Returns messages of the chat edited or deleted after `since` (and `after_id` for "
+                "changes sharing the same timestamp), oldest first. Deleted messages are returned "
+                "as tombstones with `deleted=true` and no content."
+        ),
+        parameters=[MessageChangesQuerySerializer],
+        responses={
+            200: OpenApiResponse(description="Changed messages and the next cursor"),
+            400: OpenApiResponse(description="Invalid cursor"),
+            403: OpenApiResponse(description="Not a chat member"),
+        }
+    )
+    @query_budget(2, mongo=1)
+    def get(self, request, chat_id: int):
+        query = MessageChangesQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return error_response(
+                error_dict=get_error(key="CHATS_004001", details=query.errors),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        limit = query.validated_data["limit"]
+        changes = MessageRepository.fetch_changes(
+            chat_id=chat_id,
+            since=query.validated_data["since"],
+            after_id=query.validated_data.get("after_id"),
+            limit=limit,
+        )
+
+        last = changes[-1] if changes else None
+        return success_response({
+            "changes": MessageSerializer(changes, many=True).data,
+            "next_since": last["edited_at"].isoformat() if last else request.query_params["since"],
+            "next_after_id": str(last["_id"]) if last else query.validated_data.get("after_id"),
+            "has_more": len(changes) == limit,
+        })
+
+
+class ChatMessageThreadApi(APIView):
+    """
+    Replies to a single message. The parent carries `reply_count` and
+    `reactions` counters, so no aggregation runs per request.
+    """
+
+    permission_classes = (IsAuthenticated, IsChatMember)
+
+    @extend_schema(
+        summary="List replies to a message",
+        description="Returns the parent message and its replies, oldest first. Use `after` (reply id) to page.",
+        parameters=[MessageThreadQuerySerializer],
+        responses={
+            200: OpenApiResponse(description="Parent message and replies"),
+            400: OpenApiResponse(description="Invalid cursor"),
+            403: OpenApiResponse(description="Not a chat member"),
+            404: OpenApiResponse(description="Message not found"),
+        }
+    )
+    @query_budget(2, mongo=2)
+    def get(self, request, chat_id: int, message_id: str):
+        query = MessageThreadQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return error_response(
+                error_dict=get_error(key="CHATS_004001", details=query.errors),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        parent = (
+            MessageRepository.get_message(chat_id=chat_id, message_id=message_id)
+            if ObjectId.is_valid(message_id) else None
+        )
+        if parent is None:
+            return error_response(
+                error_dict=get_error(key="CHATS_002006"),
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        limit = query.validated_data["limit"]
+        replies = MessageRepository.fetch_thread(
             chat_id=chat_id,
-            limit=int(request.query_params.get("limit", 100)),
-            before=request.query_params.get("before"),
+            message_id=message_id,
+            limit=limit,
+            after=query.validated_data.get("after"),
         )
-        return success_response(messages)
+        return success_response({
+            "message": MessageSerializer(parent).data,
+            "replies": MessageSerializer(replies, many=True).data,
+            "has_more": len(replies) == limit,
+        })
@@ -54,9 +54,9 @@ class PrivateChatViewSet(ModelViewSet):
                 user=request.user,
                 target_user_id=serializer.validated_data["user_id"],
             )
-        except Exception as exc:
+        except ValueError as exc:
             return error_response(
-                error_dict=get_error(key="CHAT_001002", details=str(exc)),
+                error_dict=get_error(key="CHATS_001002", details=str(exc)),
                 status=status.HTTP_400_BAD_REQUEST
             )
 
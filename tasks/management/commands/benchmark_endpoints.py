@@ -0,0 +1,313 @@
+import json
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from utils.seed import DataSeeder, SeedConfig, sample_fixture
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "endpoints.json"
+
+
+@dataclass
+class Case:
+    """
+    One endpoint call. `kwargs`, `user` and `data` are built from the
+    sample fixture; `kwargs` returning None skips the case.
+    """
+
+    url_name: str
+    method: str = "get"
+    kwargs: Callable = lambda s: {}
+    user: Callable = lambda s: s.admin_user
+    data: Optional[Callable] = None
+    query: dict = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return f"{self.method.upper()} {self.url_name}"
+
+
+def _chat(s):
+    return {"chat_id": s.chat.id} if s.chat else None
+
+
+def _first_message(s):
+    if not s.chat:
+        return None
+    from chats.mongo.message_repository import MessageRepository
+
+    messages = MessageRepository.fetch_messages(chat_id=s.chat.id, limit=1)
+    return {"chat_id": s.chat.id, "message_id": str(messages[0]["_id"])} if messages else None
+
+
+CASES = [
+    Case("users:register", "post", user=lambda s: None, data=lambda s: {
+        "full_name": "Bench User", "email": "bench@example.com", "password": "bench-pass-123",
+    }),
+    Case("users:profile"),
+    Case("users:profile", "patch", data=lambda s: {"bio": "benchmark"}),
+
+    Case("teams:team-public-list"),
+    Case("teams:team-my-teams"),
+    Case("teams:team-list"),
+    Case("teams:team-list", "post", data=lambda s: {"title": "Bench team"}),
+    Case("teams:team-detail", kwargs=lambda s: {"pk": s.team.id}),
+    Case("teams:team-detail", "patch", kwargs=lambda s: {"pk": s.team.id}, data=lambda s: {"description": "bench"}),
+    Case("teams:team-analytics", kwargs=lambda s: {"pk": s.team.id}),
+    Case("teams:team-analytics", kwargs=lambda s: {"pk": s.team.id}, query={"bucket": "week", "start": (
+        timezone.localdate() - timedelta(days=365)
+    ).isoformat()}),
+    Case("teams:team-activate", "patch", kwargs=lambda s: {"pk": s.team.id}),
+    Case("teams:team-deactivate", "patch", kwargs=lambda s: {"pk": s.team.id}),
+    Case("teams:membership_request_list"),
+    Case("teams:membership_request_admin_team", kwargs=lambda s: {"pk": s.team.id}),
+    Case(
+        "teams:membership_request_detail_admin",
+        kwargs=lambda s: {"pk": s.request.id} if s.request else None,
+    ),
+    Case("teams:membership_request", user=lambda s: s.request.user if s.request else s.member_user),
+    Case(
+        "teams:membership_request_detail",
+        kwargs=lambda s: {"pk": s.request.id} if s.request else None,
+        user=lambda s: s.request.user if s.request else None,
+    ),
+
+    Case("tasks:team_tasks", kwargs=lambda s: {"team_id": s.team.id}),
+    Case("tasks:team_tasks", kwargs=lambda s: {"team_id": s.team.id}, query={"status": "active"}),
+    Case("tasks:team_tasks", "post", kwargs=lambda s: {"team_id": s.team.id}, data=lambda s: {"title": "Bench"}),
+    Case(
+        "tasks:team_tasks_bulk", "post",
+        kwargs=lambda s: {"team_id": s.team.id},
+        data=lambda s: {"items": [{"title": f"Bench {n}"} for n in range(100)]},
+    ),
+    Case(
+        "tasks:team_assignments_bulk", "post",
+        kwargs=lambda s: {"team_id": s.team.id},
+        data=lambda s: {"items": [
+            {"task": task_id, "member": s.admin.id}
+            for task_id in s.team.tasks.exclude(assignments__member=s.admin).values_list("id", flat=True)[:100]
+        ] or [{"task": s.task.id, "member": s.admin.id}]},
+    ),
+    Case("tasks:team_dashboard", kwargs=lambda s: {"team_id": s.team.id}),
+    Case("tasks:task", kwargs=lambda s: {"pk": s.task.id}),
+    Case("tasks:task", "patch", kwargs=lambda s: {"pk": s.task.id}, data=lambda s: {"title": "Bench"}),
+    Case("tasks:task_assignments", kwargs=lambda s: {"task_id": s.task.id}),
+    Case("tasks:task_assignments", kwargs=lambda s: {"task_id": s.task.id}, user=lambda s: s.member_user),
+    Case(
+        "tasks:task_assignments", "post",
+        kwargs=lambda s: {"task_id": s.task.id},
+        data=lambda s: {"member": s.admin.id},
+    ),
+    Case("tasks:task_assignment_detail", kwargs=lambda s: {"pk": s.assignment.id}),
+    Case(
+        "tasks:task_assignment_detail", "patch",
+        kwargs=lambda s: {"pk": s.assignment.id},
+        user=lambda s: s.member_user,
+        data=lambda s: {"progress": 50},
+    ),
+    Case("tasks:task_notes", kwargs=lambda s: {"task_id": s.task.id}),
+    Case("tasks:task_notes", kwargs=lambda s: {"task_id": s.task.id}, user=lambda s: s.member_user),
+    Case(
+        "tasks:task_notes", "post",
+        kwargs=lambda s: {"task_id": s.task.id},
+        user=lambda s: s.member_user,
+        data=lambda s: {"content": "bench"},
+    ),
+    Case("tasks:task_note_detail", kwargs=lambda s: {"pk": s.note.id} if s.note else None),
+    Case(
+        "tasks:task_note_detail",
+        kwargs=lambda s: {"pk": s.note.id} if s.note else None,
+        query={"mark_read": "false"},
+    ),
+    Case("tasks:task_notes_unread", kwargs=lambda s: {"task_id": s.task.id}),
+    Case("tasks:task_notes_unread", kwargs=lambda s: {"task_id": s.task.id}, user=lambda s: s.member_user),
+    Case(
+        "tasks:task_notes_read", "post",
+        kwargs=lambda s: {"task_id": s.task.id},
+        user=lambda s: s.member_user,
+        data=lambda s: {},
+    ),
+
+    Case("chats:chat_list"),
+    Case("chats:chat_detail", kwargs=lambda s: {"pk": s.chat.id} if s.chat else None),
+    Case("chats:chat_group"),
+    Case("chats:chat_group", "post", data=lambda s: {"title": "Bench group"}),
+    Case("chats:chat_group_detail", kwargs=lambda s: {"pk": s.chat.group.id} if s.chat else None),
+    Case("chats:chat_private_create", "post", data=lambda s: {"user_id": s.member_user.id}),
+    Case("chats:get_messages", kwargs=_chat),
+    Case(
+        "chats:get_message_changes",
+        kwargs=_chat,
+        query={"since": (timezone.now() - timedelta(days=1)).isoformat()},
+    ),
+    Case("chats:get_message_thread", kwargs=_first_message),
+    Case("chats:team_announcements", kwargs=lambda s: {"team_id": s.team.id}),
+
+    Case("schema"),
+]
+
+
+def _url_names(patterns, namespace=""):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            prefix = f"{namespace}{pattern.namespace}:" if pattern.namespace else namespace
+            yield from _url_names(pattern.url_patterns, prefix)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield f"{namespace}{pattern.name}"
+
+
+def _host() -> str:
+    # the test client's default "testserver" is rejected outside the test runner
+    for host in settings.ALLOWED_HOSTS:
+        if host and host != "*" and not host.startswith("."):
+            return host
+    return "localhost"
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the API endpoints in Timo/urls.py with sample data, record latency and SQL query "
+        "counts, and compare them against a baseline file. Writes are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=30)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0, help="Seed N throwaway teams first (rolled back).")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON file.")
+        parser.add_argument("--save-baseline", action="store_true", help="Write this run as the new baseline.")
+        parser.add_argument(
+            "--tolerance", type=float, default=0.25,
+            help="Allowed p50 slowdown against the baseline (0.25 = 25%%).",
+        )
+        parser.add_argument("--fail", action="store_true", help="Exit non-zero on a regression.")
+        parser.add_argument("--only", default="", help="Only run cases whose key contains this text.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options["seed"]:
+                DataSeeder(SeedConfig(users=max(50, options["seed"] * 20), teams=options["seed"])).run()
+            sample = sample_fixture()
+            if sample is None:
+                raise CommandError("No team with assigned tasks to benchmark against; pass --seed N or run seed_data.")
+            results = self._run_cases(sample, options)
+            transaction.set_rollback(True)
+
+        self._report_uncovered()
+        baseline_path = Path(options["baseline"])
+        regressions = self._compare(results, baseline_path, options["tolerance"])
+
+        if options["save_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps({
+                "database": connection.vendor,
+                "iterations": options["iterations"],
+                "endpoints": results,
+            }, indent=2, sort_keys=True))
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {baseline_path}"))
+
+        if regressions:
+            message = f"{len(regressions)} endpoint(s) regressed: {', '.join(regressions)}"
+            if options["fail"]:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+
+    def _run_cases(self, sample, options):
+        results = {}
+        for case in CASES:
+            if options["only"] and options["only"] not in case.key:
+                continue
+            try:
+                result = self._run_case(case, sample, options["warmup"], options["iterations"])
+            except Exception as exc:  # a broken endpoint must not stop the run
+                result = {"error": f"{type(exc).__name__}: {exc}"}
+            if result is None:
+                self.stdout.write(f"skip  {case.key}  (no sample data)")
+                continue
+            name = case.key + (f" ?{'&'.join(case.query)}" if case.query else "")
+            results[name] = result
+        return results
+
+    def _run_case(self, case: Case, sample, warmup: int, iterations: int):
+        kwargs = case.kwargs(sample)
+        if kwargs is None:
+            return None
+        path = reverse(case.url_name, kwargs=kwargs)
+        client = APIClient(HTTP_HOST=_host())
+        user = case.user(sample)
+        if user is not None:
+            client.force_authenticate(user)
+        data = case.data(sample) if case.data else None
+
+        timings, queries, status_code = [], [], None
+        for n in range(warmup + iterations):
+            with transaction.atomic(), CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                if case.method == "get":
+                    response = client.get(path, case.query)
+                else:
+                    response = getattr(client, case.method)(path, data, format="json")
+                elapsed = time.perf_counter() - started
+                transaction.set_rollback(True)
+            status_code = response.status_code
+            if n >= warmup:
+                timings.append(elapsed * 1000)
+                queries.append(len(captured.captured_queries))
+
+        return {
+            "status": status_code,
+            "p50_ms": round(statistics.median(timings), 3),
+            "p95_ms": round(_percentile(timings, 0.95), 3),
+            "queries": max(queries),
+        }
+
+    def _report_uncovered(self):
+        covered = {case.url_name for case in CASES}
+        uncovered = sorted(set(_url_names(get_resolver().url_patterns)) - covered)
+        if uncovered:
+            self.stdout.write(f"not benchmarked: {', '.join(uncovered)}")
+
+    def _compare(self, results, baseline_path: Path, tolerance: float):
+        baseline = {}
+        if baseline_path.exists():
+            baseline = json.loads(baseline_path.read_text()).get("endpoints", {})
+
+        regressions = []
+        self.stdout.write(f"{'endpoint':<58} {'status':>6} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8}  vs baseline")
+        for name, result in results.items():
+            if "error" in result:
+                self.stdout.write(self.style.ERROR(f"{name:<58} {result['error']}"))
+                continue
+            line = (
+                f"{name:<58} {result['status']:>6} {result['p50_ms']:>9.2f} "
+                f"{result['p95_ms']:>9.2f} {result['queries']:>8}"
+            )
+            base = baseline.get(name)
+            if not base or "error" in base:
+                self.stdout.write(f"{line}  (new)")
+                continue
+            slower = result["p50_ms"] > base["p50_ms"] * (1 + tolerance)
+            more_queries = result["queries"] > base["queries"]
+            delta = f"p50 {result['p50_ms'] / max(base['p50_ms'], 0.001) - 1:+.0%}, queries {result['queries'] - base['queries']:+d}"
+            if slower or more_queries:
+                regressions.append(name)
+                self.stdout.write(self.style.WARNING(f"{line}  {delta}  REGRESSION"))
+            else:
+                self.stdout.write(f"{line}  {delta}")
+        return regressions
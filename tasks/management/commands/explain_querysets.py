@@ -0,0 +1,164 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import DateField, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from tasks.models import Task, TaskAssignment, TeamCycleTime
+from tasks.views import TaskAssignmentViewSet, TaskNoteViewSet
+from teams.models import TeamMember
+from teams.views import TeamMembershipAdminViewSet, TeamViewSet
+from utils.seed import DataSeeder, SeedConfig, sample_fixture
+
+# Full-table scans in EXPLAIN output: PostgreSQL and SQLite ("SCAN t" without "USING ... INDEX")
+SEQ_SCAN_PATTERNS = (
+    re.compile(r"Seq Scan on (\w+)"),
+    re.compile(r"\bSCAN (\w+)(?!.*\bUSING\b)"),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on the querysets behind the team and task list endpoints "
+        "and flag sequential scans."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed", type=int, default=0,
+            help="Seed N throwaway teams (members, tasks, assignments, notes, requests) "
+                 "before explaining; rolled back afterwards.",
+        )
+        parser.add_argument(
+            "--allow-seqscan", action="store_true",
+            help="PostgreSQL: keep enable_seqscan on. By default it is switched off for the run, so a "
+                 "remaining seq scan means no index can serve the query (small tables would "
+                 "otherwise always be scanned).",
+        )
+        parser.add_argument("--plans", action="store_true", help="Print every plan, not only flagged ones.")
+        parser.add_argument("--fail", action="store_true", help="Exit non-zero if any sequential scan is found.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options["seed"]:
+                self._seed(options["seed"])
+            if connection.vendor == "postgresql" and not options["allow_seqscan"]:
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+            flagged = self._explain_all(options["plans"])
+            transaction.set_rollback(True)
+
+        if flagged:
+            message = f"{len(flagged)} queryset(s) use sequential scans: {', '.join(flagged)}"
+            if options["fail"]:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS("No sequential scans."))
+
+    def _explain_all(self, print_plans: bool):
+        flagged = []
+        for label, queryset in self._cases():
+            plan = queryset.explain()
+            tables = sorted({
+                match.group(1)
+                for pattern in SEQ_SCAN_PATTERNS
+                for match in pattern.finditer(plan)
+            })
+            if tables:
+                flagged.append(label)
+                self.stdout.write(self.style.WARNING(f"SEQ SCAN  {label}  ({', '.join(tables)})"))
+            else:
+                self.stdout.write(f"ok        {label}")
+            if tables or print_plans:
+                self.stdout.write(self._indent(plan))
+        return flagged
+
+    def _cases(self):
+        """
+        (label, queryset) pairs mirroring what each list endpoint executes
+        for a sample owner/admin and a sample assigned member.
+        """
+        sample = sample_fixture()
+        if sample is None:
+            raise CommandError("No team with assigned tasks to explain against; pass --seed N or run seed_data.")
+        admin, task, member = sample.admin, sample.task, sample.member_user
+        team_id = admin.team_id
+
+        def view_queryset(viewset_class, action, user, kwargs=None, params=None):
+            request = Request(APIRequestFactory().get("/", params or {}))
+            request.user = user
+            view = viewset_class(action=action, kwargs=kwargs or {}, request=request, format_kwarg=None)
+            return page(view.filter_queryset(view.get_queryset()))
+
+        page = self._page
+        return [
+            ("MembershipResolver.memberships", TeamMember.objects.filter(user=admin.user)),
+            ("TeamViewSet.my_teams", view_queryset(TeamViewSet, "my_teams", admin.user)),
+            ("TeamViewSet.public_teams", view_queryset(TeamViewSet, "public_teams", admin.user)),
+            ("TaskViewSet.list", page(Task.objects.filter(team_id=team_id))),
+            ("TaskViewSet.list ?status", page(Task.objects.filter(team_id=team_id, status="active"))),
+            (
+                "tasks due soon",
+                Task.objects.filter(status="active", due_date__isnull=False).order_by("due_date")[:50],
+            ),
+            (
+                "TaskAssignmentViewSet.list (admin)",
+                view_queryset(TaskAssignmentViewSet, "list", admin.user, {"task_id": task.id}),
+            ),
+            (
+                "TaskAssignmentViewSet.list (member)",
+                view_queryset(TaskAssignmentViewSet, "list", member, {"task_id": task.id}),
+            ),
+            (
+                "TaskNoteViewSet.list (member)",
+                view_queryset(TaskNoteViewSet, "list", member, {"task_id": task.id}, {"is_read": "false"}),
+            ),
+            (
+                "team analytics buckets",
+                TeamCycleTime.objects
+                .filter(team_id=team_id, day__gte=timezone.localdate() - timedelta(days=365))
+                .annotate(bucket=Trunc("day", "week", output_field=DateField()))
+                .values("bucket")
+                .annotate(completed=Sum("completed")),
+            ),
+            (
+                "team analytics open overdue",
+                TaskAssignment.objects.filter(
+                    task__team_id=team_id, task__status="active", task__due_date__lt=timezone.now(),
+                ).exclude(status="done"),
+            ),
+            (
+                "TeamMembershipAdminViewSet.list",
+                view_queryset(TeamMembershipAdminViewSet, "list", admin.user),
+            ),
+            (
+                "TeamMembershipAdminViewSet.list_team_requests",
+                view_queryset(TeamMembershipAdminViewSet, "list_team_requests", admin.user, {"pk": team_id}),
+            ),
+        ]
+
+    @staticmethod
+    def _page(queryset):
+        """
+        First cursor page, as EnvelopeCursorPagination fetches it.
+        """
+        return queryset.order_by("-id")[:51]
+
+    @staticmethod
+    def _indent(plan: str) -> str:
+        return "\n".join(f"          {line}" for line in plan.splitlines())
+
+    def _seed(self, teams: int):
+        config = SeedConfig(users=max(50, teams * 20), teams=teams, team_size="uniform:5-40", tasks_per_team="50")
+        counts = DataSeeder(config).run()
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+        self.stdout.write(f"seeded {counts['teams']} teams, {counts['tasks']} tasks, {counts['assignments']} assignments")
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tasks.services.lifecycle import rebuild_cycle_times, rebuild_workloads
+
+
+class Command(BaseCommand):
+    help = (
+        "Recreate the analytics summary tables (daily cycle times per team, workload per member) "
+        "from the assignments. Run once after deploying them and after writes that bypass "
+        "tasks.services.lifecycle (imports, raw SQL)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--team", type=int, action="append", dest="teams", help="Only this team (repeatable).")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rebuild_cycle_times(options["teams"])
+        rebuild_workloads(options["teams"])
+        self.stdout.write(self.style.SUCCESS(f"Analytics rebuilt in {time.perf_counter() - started:.1f}s"))
@@ -0,0 +1,48 @@
+import asyncio
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.services.deadlines import DeadlineScheduler, DeadlineWorker
+
+
+class Command(BaseCommand):
+    help = (
+        "Send task_due_soon / task_overdue events to team channel groups as task "
+        "deadlines pass. Run a single instance; set TASK_DEADLINES_ENABLED so task "
+        "writes reach it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--catch-up",
+            type=int,
+            default=0,
+            help="Also announce deadlines that passed up to this many seconds ago (e.g. after downtime).",
+        )
+        parser.add_argument(
+            "--expire-status",
+            default=getattr(settings, "TASK_DEADLINE_EXPIRE_STATUS", ""),
+            help="Move overdue active tasks to this status.",
+        )
+        parser.add_argument("--max-sleep", type=float, default=60.0, help="Longest wait between checks (seconds).")
+
+    def handle(self, *args, **options):
+        expire_status = options["expire_status"]
+        if expire_status and expire_status not in dict(Task.STATUS_CHOICES):
+            raise CommandError(f"Unknown task status: {expire_status!r}")
+        if not getattr(settings, "TASK_DEADLINES_ENABLED", False):
+            self.stderr.write(self.style.WARNING(
+                "TASK_DEADLINES_ENABLED is off; due dates set after startup are only seen "
+                "if they fall beyond the window already loaded."
+            ))
+
+        worker = DeadlineWorker(DeadlineScheduler(), expire_status=expire_status, max_sleep=options["max_sleep"])
+        self.stdout.write("Scheduling task deadlines...")
+        try:
+            asyncio.run(worker.run(since=timezone.now() - timedelta(seconds=options["catch_up"])))
+        except KeyboardInterrupt:
+            worker.stop()
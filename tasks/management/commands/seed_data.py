@@ -0,0 +1,54 @@
+import time
+from dataclasses import fields
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from utils.seed import DataSeeder, SeedConfig, parse_distribution
+
+DISTRIBUTION_OPTIONS = (
+    "team_size",
+    "tasks_per_team",
+    "assignees_per_task",
+    "notes_per_assignment",
+    "requests_per_team",
+    "messages_per_chat",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a production-like dataset: users, profiles, teams, memberships, requests, "
+        "tasks, assignments, notes, team group chats and Mongo messages. Volumes take "
+        "distribution specs: N, uniform:A-B or pareto:MEAN."
+    )
+
+    def add_arguments(self, parser):
+        defaults = SeedConfig()
+        parser.add_argument("--users", type=int, default=defaults.users)
+        parser.add_argument("--teams", type=int, default=defaults.teams)
+        for name in DISTRIBUTION_OPTIONS:
+            parser.add_argument(f"--{name.replace('_', '-')}", default=getattr(defaults, name))
+        parser.add_argument("--admins-per-team", type=int, default=defaults.admins_per_team)
+        parser.add_argument("--password", default=defaults.password, help="Password of every seeded user.")
+        parser.add_argument("--random-seed", type=int, default=defaults.random_seed)
+
+    def handle(self, *args, **options):
+        config = SeedConfig(**{
+            f.name: options[f.name]
+            for f in fields(SeedConfig)
+            if f.name in options
+        })
+        for name in DISTRIBUTION_OPTIONS:
+            try:
+                parse_distribution(getattr(config, name))
+            except ValueError as exc:
+                raise CommandError(f"--{name.replace('_', '-')}: {exc}")
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            counts = DataSeeder(config, log=self.stdout.write).run()
+        elapsed = time.perf_counter() - started
+
+        summary = ", ".join(f"{count:,} {name}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Seeded {summary} in {elapsed:.1f}s (tag {config.tag})."))
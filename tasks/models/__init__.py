@@ -1,3 +1,7 @@
 from .task import Task
 from .task_assignment import TaskAssignment
 from .task_note import TaskNote
+from .task_note_unread_counter import TaskNoteUnreadCounter
+from .task_assignment_transition import TaskAssignmentTransition
+from .team_cycle_time import TeamCycleTime
+from .member_workload import MemberWorkload
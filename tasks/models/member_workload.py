@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class MemberWorkload(models.Model):
+    """
+    Number of assignments of a team member in each status.
+
+    Maintained by tasks.services.lifecycle; never written directly.
+    """
+
+    member = models.OneToOneField(
+        to='teams.TeamMember',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="workload"
+    )
+    assigned = models.PositiveIntegerField(default=0)
+    in_progress = models.PositiveIntegerField(default=0)
+    blocked = models.PositiveIntegerField(default=0)
+    done = models.PositiveIntegerField(default=0)
@@ -40,3 +40,15 @@ class Task(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # team task lists, filtered by status and sorted/filtered by deadline
+            models.Index(fields=["team", "status", "due_date"], name="task_team_status_due_idx"),
+            # upcoming deadlines across all teams (only live tasks with a due date)
+            models.Index(
+                fields=["due_date"],
+                condition=models.Q(status="active", due_date__isnull=False),
+                name="task_active_due_idx",
+            ),
+        ]
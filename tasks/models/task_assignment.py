@@ -40,3 +40,12 @@ class TaskAssignment(models.Model):
 
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    # completed after the task's due date, as it was at completion
+    completed_late = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["task", "member"], name="taskassign_task_member_idx"),
+            # a member's assignments by status, across tasks
+            models.Index(fields=["member", "status"], name="taskassign_member_status_idx"),
+        ]
@@ -0,0 +1,39 @@
+from django.db import models
+from django.utils import timezone
+from .task_assignment import TaskAssignment
+
+
+class TaskAssignmentTransition(models.Model):
+    """
+    One status change of an assignment. Append-only: rows are written by
+    tasks.services.lifecycle and never updated.
+
+    The first row of an assignment has an empty `from_status`.
+    """
+
+    assignment = models.ForeignKey(
+        to=TaskAssignment,
+        on_delete=models.CASCADE,
+        related_name="transitions"
+    )
+    from_status = models.CharField(max_length=20, blank=True, default="")
+    to_status = models.CharField(max_length=20, choices=TaskAssignment.STATUS_CHOICES)
+    changed_by = models.ForeignKey(
+        to='teams.TeamMember',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+"
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ("created_at", "id")
+        indexes = [
+            models.Index(fields=["assignment", "created_at"], name="taskassign_transition_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Assignment transitions are append-only.")
+        super().save(*args, **kwargs)
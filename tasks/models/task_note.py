@@ -25,3 +25,8 @@ class TaskNote(models.Model):
     is_read = models.BooleanField(default=False)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["task", "assignment", "is_read"], name="tasknote_task_assign_read_idx"),
+        ]
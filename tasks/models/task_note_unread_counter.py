@@ -0,0 +1,32 @@
+from django.db import models
+from .task_assignment import TaskAssignment
+
+
+class TaskNoteUnreadCounter(models.Model):
+    """
+    Number of unread notes on an assignment for one side of the
+    conversation: the assigned member (notes written by owners/admins) or
+    the team's admins (notes written by members).
+
+    Maintained by tasks.services.note_reads; never written directly.
+    """
+
+    READER_MEMBER = "member"
+    READER_ADMINS = "admins"
+    READER_CHOICES = (
+        (READER_MEMBER, "Assigned member"),
+        (READER_ADMINS, "Owners and admins"),
+    )
+
+    assignment = models.ForeignKey(
+        to=TaskAssignment,
+        on_delete=models.CASCADE,
+        related_name="unread_note_counters"
+    )
+    reader = models.CharField(max_length=10, choices=READER_CHOICES)
+    unread = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["assignment", "reader"], name="tasknote_unread_uniq"),
+        ]
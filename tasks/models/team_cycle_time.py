@@ -0,0 +1,27 @@
+from django.db import models
+
+
+class TeamCycleTime(models.Model):
+    """
+    Assignments of a team completed on one day, how many of them were
+    completed after their task's due date and the sum of their cycle
+    times (completed_at - started_at), so averages over any date range
+    are a sum over a few rows.
+
+    Maintained by tasks.services.lifecycle; never written directly.
+    """
+
+    team = models.ForeignKey(
+        to='teams.Team',
+        on_delete=models.CASCADE,
+        related_name="cycle_times"
+    )
+    day = models.DateField()
+    completed = models.PositiveIntegerField(default=0)
+    late = models.PositiveIntegerField(default=0)
+    cycle_seconds = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["team", "day"], name="team_cycle_time_uniq"),
+        ]
@@ -1,5 +1,5 @@
 from .base_permission import BaseCustomPermission
-from teams.models import TeamMember
+from teams.services import get_membership_resolver
 
 
 class IsTeamOwnerOrAdmin(BaseCustomPermission):
@@ -19,17 +19,13 @@ class IsTeamOwnerOrAdmin(BaseCustomPermission):
             self.message = self.deny()
             return False
 
-        try:
-            membership = TeamMember.objects.get(
-                team_id=team_id,
-                user=request.user
-            )
-        except TeamMember.DoesNotExist:
+        role = get_membership_resolver(request).role(team_id)
+        if role is None:
             self.error_code = "TASK_001010"
             self.message = self.deny()
             return False
 
-        if membership.role not in ("owner", "admin"):
+        if role not in ("owner", "admin"):
             self.error_code = "TASK_001011"
             self.message = self.deny()
             return False
@@ -1,5 +1,5 @@
 from .base_permission import BaseCustomPermission
-from teams.models import TeamMember
+from teams.services import get_membership_resolver
 
 
 class IsTaskTeamOwnerOrAdmin(BaseCustomPermission):
@@ -13,14 +13,13 @@ class IsTaskTeamOwnerOrAdmin(BaseCustomPermission):
         """
         Check if the authenticated user is Owner or Admin of the team instance (obj).
         """
-        try:
-            membership = obj.team.members.get(user=request.user)
-        except TeamMember.DoesNotExist:
+        role = get_membership_resolver(request).role(obj.team_id)
+        if role is None:
             self.error_code = "TASK_001000"
             self.message = self.deny()
             return False
 
-        if membership.role not in ['owner', 'admin']:
+        if role not in ['owner', 'admin']:
             self.error_code = "TASK_001001"
             self.message = self.deny()
             return False
@@ -1,3 +1,5 @@
 from .task import TaskSerializer
-from .task_assignment import TaskAssignmentSerializer
-from .task_note import TaskNoteSerializer
+from .task_assignment import TaskAssignmentSerializer, TaskAssignmentTransitionSerializer
+from .task_note import TaskNoteSerializer, MarkNotesReadSerializer, NoteUnreadSerializer
+from .dashboard import TeamDashboardSerializer
+from .bulk import BulkRequestSerializer, BulkAssignmentItemSerializer, BulkResultSerializer
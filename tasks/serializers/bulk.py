@@ -0,0 +1,49 @@
+from django.conf import settings
+from rest_framework import serializers
+from tasks.models import TaskAssignment
+
+
+class BulkRequestSerializer(serializers.Serializer):
+    """
+    Envelope of a bulk create request. Items are validated one by one by
+    the bulk service so every item gets its own result.
+    """
+
+    items = serializers.ListField(child=serializers.DictField(), allow_empty=False)
+    atomic = serializers.BooleanField(
+        default=False,
+        help_text="Create nothing unless every item is valid.",
+    )
+
+    def validate_items(self, items):
+        limit = getattr(settings, "TASK_BULK_MAX_ITEMS", 1000)
+        if len(items) > limit:
+            raise serializers.ValidationError(f"At most {limit} items per request.")
+        return items
+
+
+class BulkAssignmentItemSerializer(serializers.ModelSerializer):
+    """
+    One item of a bulk assignment request. Task and member are plain ids,
+    checked against the team in one query each rather than per item.
+    """
+
+    task = serializers.IntegerField()
+    member = serializers.IntegerField()
+
+    class Meta:
+        model = TaskAssignment
+        fields = ("task", "member", "status", "progress", "answer")
+
+
+class BulkItemResultSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False)
+    errors = serializers.DictField(required=False)
+
+
+class BulkResultSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    results = BulkItemResultSerializer(many=True)
@@ -0,0 +1,47 @@
+from rest_framework import serializers
+from tasks.models import Task
+
+
+class AssignmentCountsSerializer(serializers.Serializer):
+    total = serializers.IntegerField()
+    assigned = serializers.IntegerField()
+    in_progress = serializers.IntegerField()
+    done = serializers.IntegerField()
+    blocked = serializers.IntegerField()
+
+
+class DashboardTaskSerializer(serializers.ModelSerializer):
+    assignments = AssignmentCountsSerializer()
+    average_progress = serializers.FloatField(allow_null=True)
+    is_overdue = serializers.BooleanField()
+
+    class Meta:
+        model = Task
+        fields = (
+            "id",
+            "title",
+            "status",
+            "is_team_task",
+            "due_date",
+            "created_at",
+            "assignments",
+            "average_progress",
+            "is_overdue",
+        )
+
+
+class DashboardSummarySerializer(serializers.Serializer):
+    tasks = serializers.IntegerField()
+    overdue = serializers.IntegerField()
+    assignments = AssignmentCountsSerializer()
+    average_progress = serializers.FloatField(allow_null=True)
+
+
+class TeamDashboardSerializer(serializers.Serializer):
+    """
+    Response schema of the team dashboard (built by tasks.services.TeamDashboard).
+    """
+
+    team_id = serializers.IntegerField()
+    summary = DashboardSummarySerializer()
+    tasks = DashboardTaskSerializer(many=True)
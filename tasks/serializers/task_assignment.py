@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from tasks.models import TaskAssignment
+from tasks.models import TaskAssignment, TaskAssignmentTransition
 
 
 class TaskAssignmentSerializer(serializers.ModelSerializer):
@@ -7,3 +7,20 @@ class TaskAssignmentSerializer(serializers.ModelSerializer):
         model = TaskAssignment
         fields = ("id", "task", "member", "status", "progress", "answer", "file", "started_at", "completed_at",)
         read_only_fields = ("id", "started_at", "completed_at", 'task')
+
+    def validate_member(self, member):
+        """
+        The member must belong to the task's team: the assignment's task on
+        update, `team_id` from the context on create.
+        """
+        team_id = self.instance.task.team_id if self.instance is not None else self.context.get("team_id")
+        if team_id is not None and member.team_id != team_id:
+            raise serializers.ValidationError("Member not found in this team.")
+        return member
+
+
+class TaskAssignmentTransitionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TaskAssignmentTransition
+        fields = ("id", "from_status", "to_status", "changed_by", "created_at",)
+        read_only_fields = fields
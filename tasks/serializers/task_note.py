@@ -7,3 +7,22 @@ class TaskNoteSerializer(serializers.ModelSerializer):
         model = TaskNote
         fields = ("id", "task", "assignment", "author", "content", "is_read", "created_at",)
         read_only_fields = ("id", "is_read", "created_at", 'task', "author")
+
+
+class MarkNotesReadSerializer(serializers.Serializer):
+    up_to = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        help_text="Mark notes with an id up to this one; all unread notes when omitted.",
+    )
+
+
+class AssignmentUnreadSerializer(serializers.Serializer):
+    assignment = serializers.IntegerField()
+    unread = serializers.IntegerField()
+
+
+class NoteUnreadSerializer(serializers.Serializer):
+    marked = serializers.IntegerField(required=False, help_text="Notes marked read by this request.")
+    unread = serializers.IntegerField()
+    assignments = AssignmentUnreadSerializer(many=True)
@@ -0,0 +1,5 @@
+from .dashboard import TeamDashboard
+from .bulk import BulkResult, bulk_create_tasks, bulk_create_assignments
+from . import note_reads
+from . import activity
+from . import lifecycle
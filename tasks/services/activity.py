@@ -0,0 +1,235 @@
+"""
+Task activity events for the team websocket (ws/teams/<id>/).
+
+Writes to tasks, assignments and notes are recorded as compact changes
+and sent once the transaction commits, one `task_activity` event per
+team per transaction:
+
+    {"event": "task_activity", "changes": [
+        {"type": "task", "id": 7, "action": "updated", "task_id": 7, "status": "active"},
+        {"type": "assignment", "id": 12, "action": "created", "task_id": 7, ...},
+    ]}
+
+Changes carry ids and states only; clients fetch content through the
+REST endpoints. Like those endpoints, owners and admins get every change
+(the team's admins group) while a member gets only the changes about
+their own work (their member group, see chats.services.team_events):
+their assignments, the notes on them or by them, and the tasks they are
+assigned to.
+"""
+import weakref
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Q
+
+from chats.services.team_events import team_admins_group_name, team_group_message, team_member_group_name
+from tasks.models import Task, TaskAssignment, TaskNote
+from utils import metrics
+
+TASK_ACTIVITY = "task_activity"
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+ChangeKey = Tuple[str, int]
+
+
+class _ActivityFlush:
+    """
+    on_commit callback holding the changes recorded at one savepoint
+    level, so a rolled-back savepoint drops its changes with it.
+    """
+
+    def __init__(self, key=None):
+        self.key = key
+        # team id -> {(type, id): change}
+        self.changes: Dict[int, Dict[ChangeKey, dict]] = {}
+        # (type, id) -> members known to see the change, besides the ones
+        # read from it when sent
+        self.members: Dict[ChangeKey, Set[int]] = defaultdict(set)
+
+    def add(self, team_id: int, change: dict, members: Iterable[int] = ()):
+        changes = self.changes.setdefault(team_id, {})
+        key = (change["type"], change["id"])
+        previous = changes.get(key)
+        if previous is not None and previous["action"] == CREATED:
+            if change["action"] == DELETED:
+                del changes[key]  # created and deleted in one transaction
+                self.members.pop(key, None)
+                return
+            change = {**change, "action": CREATED}
+        changes[key] = change
+        self.members[key].update(members)
+        if change["type"] == "task" and change["action"] == DELETED:
+            # its assignments and notes went with it (cascade); their
+            # members still hear about the task
+            for child_key in [k for k, v in changes.items() if k[0] != "task" and v["task_id"] == change["id"]]:
+                child = changes.pop(child_key)
+                self.members[key].update(self.members.pop(child_key, ()))
+                self.members[key].update(_named_members(child))
+
+    def _audiences(self) -> Dict[ChangeKey, Set[int]]:
+        """
+        Member ids each change is sent to, besides the admins: at most one
+        query, for the assignees of updated tasks and the assignment
+        members of notes not known when recorded.
+        """
+        changes = [change for team_changes in self.changes.values() for change in team_changes.values()]
+        assignment_members = {c["id"]: c["member_id"] for c in changes if c["type"] == "assignment"}
+        task_members: Dict[int, Set[int]] = defaultdict(set)
+        for change in changes:
+            if change["type"] == "assignment":
+                task_members[change["task_id"]].add(change["member_id"])
+
+        task_ids = {c["id"] for c in changes if c["type"] == "task" and c["action"] == UPDATED}
+        assignment_ids = {
+            c["assignment_id"] for c in changes
+            if c["type"] == "note" and c["assignment_id"] and not self.members.get((c["type"], c["id"]))
+        } - set(assignment_members)
+        if task_ids or assignment_ids:
+            rows = TaskAssignment.objects.filter(
+                Q(task_id__in=task_ids) | Q(pk__in=assignment_ids)
+            ).values_list("id", "task_id", "member_id")
+            for assignment_id, task_id, member_id in rows:
+                if task_id in task_ids:
+                    task_members[task_id].add(member_id)
+                assignment_members.setdefault(assignment_id, member_id)
+
+        audiences = {}
+        for change in changes:
+            key = (change["type"], change["id"])
+            members = self.members.get(key, set()) | _named_members(change)
+            if change["type"] == "task":
+                members |= task_members.get(change["id"], set())
+            elif change["type"] == "note" and change["assignment_id"] in assignment_members:
+                members.add(assignment_members[change["assignment_id"]])
+            audiences[key] = members
+        return audiences
+
+    def __call__(self):
+        if _pending.get(self.key) is self:
+            del _pending[self.key]
+        if not any(self.changes.values()):
+            return
+        send = async_to_sync(get_channel_layer().group_send)
+        audiences = self._audiences()
+        for team_id, changes in self.changes.items():
+            if not changes:
+                continue
+            send(team_admins_group_name(team_id), _message(changes.values()))
+            by_member = defaultdict(list)
+            for key, change in changes.items():
+                for member_id in audiences[key]:
+                    by_member[member_id].append(change)
+            for member_id, member_changes in by_member.items():
+                send(team_member_group_name(team_id, member_id), _message(member_changes))
+            metrics.inc("task_activity_events_total")
+
+
+def _message(changes: Iterable[dict]) -> dict:
+    return team_group_message(TASK_ACTIVITY, {"changes": list(changes)})
+
+
+def _named_members(change: dict) -> Set[int]:
+    # members a change names itself: an assignment's member, a note's author
+    member_id = change.get("member_id") if change["type"] == "assignment" else change.get("author_id")
+    return {member_id} if member_id is not None else set()
+
+
+# (connection, savepoint ids) -> the flush collecting changes at that
+# savepoint level. Only Django's on_commit list holds a flush strongly,
+# so an entry goes away once Django runs the callback or discards it
+# with a rollback.
+_pending: "weakref.WeakValueDictionary[Tuple[int, Tuple[str, ...]], _ActivityFlush]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _pending_flush(connection) -> _ActivityFlush:
+    # atomic(savepoint=False) blocks (e.g. Collector.delete) add None, which
+    # can't be rolled back on its own
+    key = (id(connection), tuple(sid for sid in connection.savepoint_ids if sid is not None))
+    flush = _pending.get(key)
+    if flush is None:
+        flush = _ActivityFlush(key)
+        _pending[key] = flush
+        transaction.on_commit(flush, using=connection.alias, robust=True)
+    return flush
+
+
+def record(team_id: int, change: dict, using: str = DEFAULT_DB_ALIAS, members: Iterable[int] = ()):
+    """
+    Queue `change` for the team's next task_activity event, sent when the
+    current transaction commits (immediately outside a transaction).
+    `members` are ids of members the change concerns that the change does
+    not name, when known without a query.
+    """
+    if not getattr(settings, "TASK_ACTIVITY_ENABLED", True):
+        return
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        flush = _ActivityFlush()
+        flush.add(team_id, change, members)
+        flush()
+        return
+    _pending_flush(connection).add(team_id, change, members)
+
+
+def task_change(task: Task, action: str) -> dict:
+    return {
+        "type": "task",
+        "id": task.pk,
+        "action": action,
+        "task_id": task.pk,
+        "status": task.status,
+        "due_date": task.due_date.isoformat() if task.due_date else None,
+    }
+
+
+def assignment_change(assignment: TaskAssignment, action: str) -> dict:
+    return {
+        "type": "assignment",
+        "id": assignment.pk,
+        "action": action,
+        "task_id": assignment.task_id,
+        "member_id": assignment.member_id,
+        "status": assignment.status,
+        "progress": assignment.progress,
+    }
+
+
+def note_change(note: TaskNote, action: str) -> dict:
+    return {
+        "type": "note",
+        "id": note.pk,
+        "action": action,
+        "task_id": note.task_id,
+        "assignment_id": note.assignment_id,
+        "author_id": note.author_id,
+    }
+
+
+def note_members(note: TaskNote) -> Set[int]:
+    """
+    Member of the note's assignment, when loaded; otherwise it is read
+    when the event is sent.
+    """
+    if note.assignment_id is not None and TaskNote.assignment.is_cached(note):
+        return {note.assignment.member_id}
+    return set()
+
+
+def team_id_of(instance) -> Optional[int]:
+    """
+    Team of an assignment or note, from its cached task when loaded.
+    None once the task itself is gone (a cascade delete).
+    """
+    if type(instance).task.is_cached(instance):
+        return instance.task.team_id
+    return Task.objects.filter(pk=instance.task_id).values_list("team_id", flat=True).first()
@@ -0,0 +1,145 @@
+"""
+Team analytics read from the summary tables tasks.services.lifecycle
+maintains, so the cost depends on the date range and team size, not on
+the number of assignments:
+
+- throughput, cycle time and overdue ratio per day/week/month bucket,
+  from TeamCycleTime (one grouped query);
+- workload per member, from MemberWorkload (one query);
+- assignments still open on overdue tasks (one query on the partial
+  index of active due dates).
+
+An assignment counts as late (overdue) when it was completed after its
+task's due date as it stood at completion (TaskAssignment.completed_late);
+the ratio is late / completed.
+"""
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from django.db.models import DateField, Sum
+from django.db.models.functions import Coalesce, Trunc
+from django.utils import timezone
+
+from tasks.models import TaskAssignment, TeamCycleTime
+from teams.models import TeamMember
+from .lifecycle import DONE, TRANSITIONS
+
+DAY = "day"
+WEEK = "week"
+MONTH = "month"
+BUCKETS = (DAY, WEEK, MONTH)
+
+OPEN_STATUSES = tuple(status for status in TRANSITIONS if status != DONE)
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    """
+    First day of the bucket containing `day`; weeks start on Monday.
+    """
+    if bucket == WEEK:
+        return day - timedelta(days=day.weekday())
+    if bucket == MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(start: date, bucket: str) -> date:
+    if bucket == WEEK:
+        return start + timedelta(days=7)
+    if bucket == MONTH:
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def bucket_starts(start: date, end: date, bucket: str) -> List[date]:
+    starts, current = [], bucket_start(start, bucket)
+    while current <= end:
+        starts.append(current)
+        current = next_bucket(current, bucket)
+    return starts
+
+
+def _rates(completed: int, late: int, cycle_seconds: int) -> Dict:
+    return {
+        "throughput": completed,
+        "late": late,
+        "overdue_ratio": round(late / completed, 4) if completed else None,
+        "average_cycle_seconds": round(cycle_seconds / completed) if completed else None,
+    }
+
+
+def team_analytics(team_id: int, start: date, end: date, bucket: str = DAY, now=None) -> Dict:
+    """
+    Analytics of team `team_id` for the days `start`..`end` (inclusive,
+    local dates), bucketed by `bucket`; empty buckets are included.
+    """
+    now = now or timezone.now()
+    rows = (
+        TeamCycleTime.objects
+        .filter(team_id=team_id, day__gte=start, day__lte=end)
+        .annotate(bucket=Trunc("day", bucket, output_field=DateField()))
+        .values("bucket")
+        .annotate(
+            completed=Sum("completed"),
+            late=Sum("late"),
+            cycle_seconds=Sum("cycle_seconds"),
+        )
+        .order_by()
+    )
+    by_bucket = {row["bucket"]: row for row in rows}
+    empty = {"completed": 0, "late": 0, "cycle_seconds": 0}
+    totals = dict(empty)
+    buckets = []
+    for bucket_day in bucket_starts(start, end, bucket):
+        row = by_bucket.get(bucket_day, empty)
+        for name in totals:
+            totals[name] += row[name]
+        buckets.append({"start": bucket_day, **_rates(row["completed"], row["late"], row["cycle_seconds"])})
+
+    members = [
+        {
+            "member_id": row["id"],
+            "user_id": row["user_id"],
+            "role": row["role"],
+            **{status: row[status] for status in TRANSITIONS},
+        }
+        for row in (
+            TeamMember.objects
+            .filter(team_id=team_id)
+            .annotate(**{status: Coalesce(f"workload__{status}", 0) for status in TRANSITIONS})
+            .values("id", "user_id", "role", *TRANSITIONS)
+            .order_by("id")
+        )
+    ]
+    open_overdue = (
+        TaskAssignment.objects
+        .filter(
+            task__team_id=team_id,
+            task__status="active",
+            task__due_date__lt=now,
+            status__in=OPEN_STATUSES,
+        )
+        .count()
+    )
+
+    return {
+        "team_id": team_id,
+        "start": start,
+        "end": end,
+        "bucket": bucket,
+        "summary": {
+            **_rates(totals["completed"], totals["late"], totals["cycle_seconds"]),
+            "open": sum(member[status] for member in members for status in OPEN_STATUSES),
+            "open_overdue": open_overdue,
+        },
+        "buckets": buckets,
+        "members": members,
+    }
+
+
+def default_range(days: int = 30, today: Optional[date] = None):
+    """
+    (start, end) of the last `days` days, today included.
+    """
+    today = today or timezone.localdate()
+    return today - timedelta(days=days - 1), today
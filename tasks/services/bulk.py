@@ -0,0 +1,156 @@
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from tasks.models import Task, TaskAssignment
+from tasks.serializers import BulkAssignmentItemSerializer, TaskAssignmentSerializer, TaskSerializer
+from teams.models import TeamMember
+from utils.cache import bump_namespace
+from . import activity, lifecycle
+from .dashboard import TeamDashboard
+from .deadlines import notify_deadline_changes
+
+
+@dataclass
+class BulkResult:
+    """
+    Per-item outcome of a bulk create, in request order: created items
+    carry their id and serialized data, rejected ones their errors.
+    """
+
+    results: List[Dict] = field(default_factory=list)
+
+    @property
+    def created(self) -> int:
+        return sum("id" in result for result in self.results)
+
+    @property
+    def failed(self) -> int:
+        return sum("errors" in result for result in self.results)
+
+    def as_dict(self) -> Dict:
+        return {"created": self.created, "failed": self.failed, "results": self.results}
+
+
+def _batch_size() -> int:
+    return getattr(settings, "TASK_BULK_BATCH_SIZE", 500)
+
+
+def _insert(
+    model,
+    valid: Dict[int, object],
+    errors: Dict[int, Dict],
+    atomic: bool,
+    serializer_class,
+    on_insert: Callable[[List], None],
+) -> BulkResult:
+    """
+    bulk_create the valid instances (index -> unsaved instance) in one
+    transaction, unless `atomic` is set and some item was rejected.
+    `on_insert(instances)` runs inside that transaction.
+    """
+    if errors and atomic:
+        return BulkResult([{"index": index, "errors": errors[index]} for index in sorted(errors)])
+
+    with transaction.atomic():
+        instances = model.objects.bulk_create(valid.values(), batch_size=_batch_size())
+        if instances:
+            on_insert(instances)
+
+    results = [{"index": index, "errors": item_errors} for index, item_errors in errors.items()]
+    results += [
+        {"index": index, "id": instance.pk, "data": serializer_class(instance).data}
+        for index, instance in valid.items()
+    ]
+    return BulkResult(sorted(results, key=lambda result: result["index"]))
+
+
+def bulk_create_tasks(team_id: int, created_by: TeamMember, items: List[Dict], *, atomic: bool = False) -> BulkResult:
+    """
+    Validate and insert a batch of tasks for team `team_id`. Permission
+    checks are the caller's, done once for the whole batch.
+    """
+    valid, errors = {}, {}
+    for index, item in enumerate(items):
+        serializer = TaskSerializer(data=item)
+        if serializer.is_valid():
+            valid[index] = Task(team_id=team_id, created_by=created_by, **serializer.validated_data)
+        else:
+            errors[index] = serializer.errors
+
+    def on_insert(tasks):
+        # bulk_create sends no post_save; do what the Task signals would
+        bump_namespace("tasks")
+        TeamDashboard.invalidate(team_id)
+        transaction.on_commit(lambda: notify_deadline_changes(tasks))
+        for task in tasks:
+            activity.record(team_id, activity.task_change(task, activity.CREATED))
+
+    return _insert(Task, valid, errors, atomic, TaskSerializer, on_insert)
+
+
+def bulk_create_assignments(
+    team_id: int,
+    items: List[Dict],
+    *,
+    atomic: bool = False,
+    changed_by: Optional[TeamMember] = None,
+) -> BulkResult:
+    """
+    Validate and insert a batch of assignments on tasks of team `team_id`.
+    Tasks and members must belong to the team and a member is assigned to
+    a task at most once; each is checked with one query for the batch.
+    Their initial transitions are recorded as by `changed_by`.
+    """
+    parsed, errors = {}, {}
+    for index, item in enumerate(items):
+        serializer = BulkAssignmentItemSerializer(data=item)
+        if serializer.is_valid():
+            parsed[index] = serializer.validated_data
+        else:
+            errors[index] = serializer.errors
+
+    task_ids = {data["task"] for data in parsed.values()}
+    member_ids = {data["member"] for data in parsed.values()}
+    # task id -> due date
+    team_tasks = dict(
+        Task.objects.filter(team_id=team_id, id__in=task_ids).values_list("id", "due_date")
+    ) if task_ids else {}
+    team_member_ids = set(
+        TeamMember.objects.filter(team_id=team_id, id__in=member_ids).values_list("id", flat=True)
+    ) if member_ids else set()
+    assigned = set(
+        TaskAssignment.objects
+        .filter(task_id__in=team_tasks, member_id__in=team_member_ids)
+        .values_list("task_id", "member_id")
+    ) if team_tasks and team_member_ids else set()
+
+    now = timezone.now()
+    valid = {}
+    for index, data in parsed.items():
+        data = dict(data)
+        task_id, member_id = data.pop("task"), data.pop("member")
+        item_errors = {}
+        if task_id not in team_tasks:
+            item_errors["task"] = ["Task not found in this team."]
+        if member_id not in team_member_ids:
+            item_errors["member"] = ["Member not found in this team."]
+        elif (task_id, member_id) in assigned:
+            item_errors["member"] = ["Member is already assigned to this task."]
+        if item_errors:
+            errors[index] = item_errors
+            continue
+        assigned.add((task_id, member_id))
+        data.update(lifecycle.initial_fields(data.get("status", lifecycle.ASSIGNED), now, team_tasks[task_id]))
+        valid[index] = TaskAssignment(task_id=task_id, member_id=member_id, **data)
+
+    def on_insert(assignments):
+        TeamDashboard.invalidate(team_id)
+        lifecycle.created(team_id, assignments, changed_by=changed_by)
+        for assignment in assignments:
+            activity.record(team_id, activity.assignment_change(assignment, activity.CREATED))
+
+    return _insert(TaskAssignment, valid, errors, atomic, TaskAssignmentSerializer, on_insert)
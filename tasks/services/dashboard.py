@@ -0,0 +1,121 @@
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, F, Q
+from django.utils import timezone
+
+from tasks.models import Task, TaskAssignment
+from utils import metrics
+
+TASK_DASHBOARD_CACHE_PREFIX = "task_dashboard"
+
+ASSIGNMENT_STATUSES = tuple(value for value, _ in TaskAssignment.STATUS_CHOICES)
+
+TASK_FIELDS = ("id", "title", "status", "is_team_task", "due_date", "created_at")
+
+
+class TeamDashboard:
+    """
+    A team's task board: every task with its assignment counts by status
+    and average progress, read with one grouped query.
+
+    The grouped rows are cached per team and dropped by the Task and
+    TaskAssignment signals (tasks.signals.dashboard); overdue flags depend
+    on the current time and are derived on every read.
+    """
+
+    @staticmethod
+    def cache_key(team_id: int) -> str:
+        return f"{TASK_DASHBOARD_CACHE_PREFIX}:{team_id}"
+
+    @staticmethod
+    def timeout() -> int:
+        return getattr(settings, "CACHE_QUERYSET_TIMEOUT", 300)
+
+    @staticmethod
+    def queryset(team_id: int):
+        counts = {
+            assignment_status: Count("assignments", filter=Q(assignments__status=assignment_status))
+            for assignment_status in ASSIGNMENT_STATUSES
+        }
+        return (
+            Task.objects
+            .filter(team_id=team_id)
+            .values(*TASK_FIELDS)
+            .annotate(
+                assignments_total=Count("assignments"),
+                average_progress=Avg("assignments__progress"),
+                **counts,
+            )
+            .order_by(F("due_date").asc(nulls_last=True), "id")
+        )
+
+    @classmethod
+    def _rows(cls, team_id: int) -> List[Dict]:
+        key = cls.cache_key(team_id)
+        rows = cache.get(key)
+        if rows is not None:
+            metrics.inc("cache_hits_total", namespace="tasks")
+            return rows
+
+        metrics.inc("cache_misses_total", namespace="tasks")
+        rows = list(cls.queryset(team_id))
+        cache.set(key, rows, cls.timeout())
+        return rows
+
+    @classmethod
+    def invalidate(cls, team_id: int):
+        """
+        Drop the team's cached board, now and again on commit so a reader
+        racing the transaction cannot leave pre-commit rows cached.
+        """
+        key = cls.cache_key(team_id)
+        cache.delete(key)
+        transaction.on_commit(lambda: cache.delete(key))
+
+    @staticmethod
+    def _task(row: Dict, now) -> Dict:
+        counts = {assignment_status: row[assignment_status] for assignment_status in ASSIGNMENT_STATUSES}
+        total = row["assignments_total"]
+        average = row["average_progress"]
+        is_overdue = (
+            row["status"] == "active"
+            and row["due_date"] is not None
+            and row["due_date"] < now
+            and (total == 0 or counts["done"] < total)
+        )
+        return {
+            **{name: row[name] for name in TASK_FIELDS},
+            "assignments": {"total": total, **counts},
+            "average_progress": round(average, 1) if average is not None else None,
+            "is_overdue": is_overdue,
+        }
+
+    @classmethod
+    def build(cls, team_id: int) -> Dict:
+        now = timezone.now()
+        rows = cls._rows(team_id)
+        tasks = [cls._task(row, now) for row in rows]
+
+        assignments = {"total": 0, **{assignment_status: 0 for assignment_status in ASSIGNMENT_STATUSES}}
+        progress_sum = 0.0
+        for row, task in zip(rows, tasks):
+            for name, count in task["assignments"].items():
+                assignments[name] += count
+            if row["average_progress"] is not None:
+                progress_sum += row["average_progress"] * row["assignments_total"]
+
+        return {
+            "team_id": int(team_id),
+            "summary": {
+                "tasks": len(tasks),
+                "overdue": sum(task["is_overdue"] for task in tasks),
+                "assignments": assignments,
+                "average_progress": (
+                    round(progress_sum / assignments["total"], 1) if assignments["total"] else None
+                ),
+            },
+            "tasks": tasks,
+        }
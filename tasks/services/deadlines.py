@@ -0,0 +1,298 @@
+"""
+Due-date reminders and overdue events for tasks.
+
+DeadlineScheduler keeps a min-heap of upcoming deadline events for the
+active tasks due within a lookahead window, loaded in (due_date, id)
+keyset order through the partial index on active due dates. Task writes
+reach it as change notifications and cost one heap push each; stale
+heap entries are skipped when they surface.
+
+DeadlineWorker (`manage.py run_deadline_scheduler`) drives a scheduler:
+it receives the notifications that notify_deadline_changes() sends on
+commit over the channel layer and, at each deadline, sends a team event
+to the team's admins and to the task's assignees (see
+chats.services.team_events).
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from chats.services.team_events import team_audience_groups, team_group_message
+from tasks.models import Task, TaskAssignment
+from utils import metrics
+from utils.cache import bump_namespace
+from . import activity
+from .dashboard import TeamDashboard
+
+logger = logging.getLogger(__name__)
+
+TASK_DUE_SOON = "task_due_soon"
+TASK_OVERDUE = "task_overdue"
+
+# channel-layer group the scheduler worker listens on for task changes
+DEADLINE_CHANGES_GROUP = "task_deadlines"
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def notify_deadline_changes(tasks: Iterable[Task], *, deleted: bool = False):
+    """
+    Tell the scheduler worker about new due dates or statuses, as one
+    channel-layer message. Call after the writes are committed.
+    """
+    if not _setting("TASK_DEADLINES_ENABLED", False):
+        return
+    changes = [
+        {
+            "id": task.pk,
+            "team_id": task.team_id,
+            "due_date": task.due_date.isoformat() if task.due_date else None,
+            "status": "deleted" if deleted else task.status,
+        }
+        for task in tasks
+    ]
+    if changes:
+        async_to_sync(get_channel_layer().group_send)(
+            DEADLINE_CHANGES_GROUP,
+            {"type": "deadline.changed", "tasks": changes},
+        )
+
+
+@dataclass(frozen=True)
+class DeadlineEvent:
+    event: str
+    task_id: int
+    team_id: int
+    due_date: datetime
+
+    def payload(self) -> dict:
+        return {"task_id": self.task_id, "due_date": self.due_date.isoformat()}
+
+
+class DeadlineScheduler:
+    """
+    Min-heap of (fire time, task) events for active tasks due within the
+    loaded window. Not thread-safe; owned by one worker.
+    """
+
+    def __init__(
+        self,
+        *,
+        lead: Optional[timedelta] = None,
+        lookahead: Optional[timedelta] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.lead = lead if lead is not None else timedelta(seconds=_setting("TASK_DEADLINE_REMINDER_LEAD", 3600))
+        self.lookahead = lookahead or timedelta(seconds=_setting("TASK_DEADLINE_LOOKAHEAD", 900))
+        self.batch_size = batch_size or _setting("TASK_DEADLINE_BATCH_SIZE", 1000)
+
+        # (fire time, push number, task id, event); the push number keeps ties
+        # ordered and tells current entries from ones left by a reschedule
+        self._heap: List[Tuple[datetime, int, int, str]] = []
+        # task id -> (team id, due date, push number) of every tracked task
+        self._tasks: Dict[int, Tuple[int, datetime, int]] = {}
+        self._pushes = itertools.count()
+        # (due date, id) of the last task loaded; None id = every task due at that time
+        self._cursor: Optional[Tuple[datetime, Optional[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def start(self, since: datetime):
+        """
+        Track deadlines after `since`; earlier ones are considered handled.
+        """
+        self._cursor = (since, None)
+
+    def _loaded(self, due_date: datetime, task_id: int) -> bool:
+        cursor_due, cursor_id = self._cursor
+        return due_date < cursor_due or (due_date == cursor_due and (cursor_id is None or task_id <= cursor_id))
+
+    def needs_load(self, now: datetime) -> bool:
+        return self._cursor[0] - (now + self.lead) < self.lookahead / 2
+
+    def load(self, now: datetime) -> int:
+        """
+        Load the next tasks due within the window, one batch, continuing
+        from the cursor. Returns the number of tasks loaded.
+        """
+        horizon = now + self.lead + self.lookahead
+        cursor_due, cursor_id = self._cursor
+        after = Q(due_date__gt=cursor_due)
+        if cursor_id is not None:
+            after |= Q(due_date=cursor_due, id__gt=cursor_id)
+        rows = list(
+            Task.objects
+            .filter(after, status="active", due_date__isnull=False, due_date__lte=horizon)
+            .order_by("due_date", "id")
+            .values_list("id", "team_id", "due_date")[:self.batch_size]
+        )
+        for task_id, team_id, due_date in rows:
+            self._push(task_id, team_id, due_date, now)
+
+        if len(rows) == self.batch_size:
+            self._cursor = (rows[-1][2], rows[-1][0])
+        else:
+            self._cursor = (max(horizon, cursor_due), None)
+        metrics.inc("task_deadlines_loaded_total", value=len(rows))
+        return len(rows)
+
+    def _push(self, task_id: int, team_id: int, due_date: datetime, now: datetime):
+        push = next(self._pushes)
+        self._tasks[task_id] = (team_id, due_date, push)
+        if self.lead and due_date > now:
+            heapq.heappush(self._heap, (max(due_date - self.lead, now), push, task_id, TASK_DUE_SOON))
+        heapq.heappush(self._heap, (due_date, push, task_id, TASK_OVERDUE))
+
+    def task_changed(self, task_id: int, team_id: int, due_date: Optional[datetime], status: str, now: datetime):
+        """
+        Apply one task write. O(log n): entries for an old due date are
+        left in the heap and dropped when they surface.
+        """
+        active = status == "active" and due_date is not None
+        if active and self._tasks.get(task_id, ())[:2] == (team_id, due_date):
+            return  # deadline unchanged (e.g. a title edit)
+        self._tasks.pop(task_id, None)
+        if not active or due_date <= now:
+            # a deadline moved into the past is not announced
+            return
+        if self._loaded(due_date, task_id):
+            self._push(task_id, team_id, due_date, now)
+        # otherwise a later load() reads it from the index
+
+    def pop_due(self, now: datetime) -> List[DeadlineEvent]:
+        events = []
+        while self._heap and self._heap[0][0] <= now:
+            _, push, task_id, event = heapq.heappop(self._heap)
+            tracked = self._tasks.get(task_id)
+            if tracked is None or tracked[2] != push:
+                continue  # cancelled or rescheduled
+            team_id, due_date, _ = tracked
+            if event == TASK_OVERDUE:
+                del self._tasks[task_id]
+            events.append(DeadlineEvent(event, task_id, team_id, due_date))
+        return events
+
+    def seconds_until_next(self, now: datetime, max_sleep: float) -> float:
+        wake_at = [self._cursor[0] - self.lead - self.lookahead / 2]
+        if self._heap:
+            wake_at.append(self._heap[0][0])
+        return max(0.0, min(max_sleep, (min(wake_at) - now).total_seconds()))
+
+
+def expire_task(event: DeadlineEvent, status: str) -> bool:
+    """
+    Move an overdue task to `status`, unless it was edited since the
+    deadline was scheduled.
+    """
+    updated = Task.objects.filter(
+        pk=event.task_id, status="active", due_date=event.due_date,
+    ).update(status=status)
+    if updated:
+        # queryset updates send no signals
+        bump_namespace("tasks")
+        TeamDashboard.invalidate(event.team_id)
+        task = Task(pk=event.task_id, team_id=event.team_id, status=status, due_date=event.due_date)
+        activity.record(event.team_id, activity.task_change(task, activity.UPDATED))
+    return bool(updated)
+
+
+def task_assignees(task_id: int) -> List[int]:
+    return list(TaskAssignment.objects.filter(task_id=task_id).values_list("member_id", flat=True))
+
+
+class DeadlineWorker:
+    """
+    Async loop around a DeadlineScheduler: applies change notifications,
+    loads the window as time advances and sends due events.
+    """
+
+    # channel-layer group memberships expire; renew well before that
+    GROUP_RENEW_SECONDS = 3600
+
+    def __init__(
+        self,
+        scheduler: Optional[DeadlineScheduler] = None,
+        *,
+        channel_layer=None,
+        expire_status: Optional[str] = None,
+        max_sleep: float = 60.0,
+    ):
+        self.scheduler = scheduler if scheduler is not None else DeadlineScheduler()
+        self.channel_layer = channel_layer or get_channel_layer()
+        self.expire_status = expire_status if expire_status is not None else _setting("TASK_DEADLINE_EXPIRE_STATUS", "")
+        self.max_sleep = max_sleep
+        self.channel_name = None
+        self._group_added_at = 0.0
+        self._stopped = False
+
+    async def _join(self):
+        if self.channel_name is None:
+            self.channel_name = await self.channel_layer.new_channel()
+        if not self._group_added_at or time.monotonic() - self._group_added_at > self.GROUP_RENEW_SECONDS:
+            await self.channel_layer.group_add(DEADLINE_CHANGES_GROUP, self.channel_name)
+            self._group_added_at = time.monotonic()
+
+    def apply(self, message: dict, now: datetime):
+        if message.get("type") != "deadline.changed":
+            return
+        for change in message["tasks"]:
+            due_date = parse_datetime(change["due_date"]) if change["due_date"] else None
+            self.scheduler.task_changed(change["id"], change["team_id"], due_date, change["status"], now)
+
+    async def fire(self, event: DeadlineEvent):
+        payload = event.payload()
+        if event.event == TASK_OVERDUE and self.expire_status:
+            if await database_sync_to_async(expire_task)(event, self.expire_status):
+                payload["status"] = self.expire_status
+        assignees = await database_sync_to_async(task_assignees)(event.task_id)
+        message = team_group_message(event.event, payload)
+        for group in team_audience_groups(event.team_id, assignees):
+            await self.channel_layer.group_send(group, message)
+        metrics.inc("task_deadline_events_total", event=event.event)
+
+    async def tick(self, now: Optional[datetime] = None) -> List[DeadlineEvent]:
+        """
+        Load the window if needed and send every event due by `now`.
+        """
+        now = now or timezone.now()
+        while self.scheduler.needs_load(now):
+            loaded = await database_sync_to_async(self.scheduler.load)(now)
+            if loaded < self.scheduler.batch_size:
+                break
+        events = self.scheduler.pop_due(now)
+        for event in events:
+            await self.fire(event)
+        return events
+
+    async def run(self, since: Optional[datetime] = None):
+        since = since or timezone.now()
+        self.scheduler.start(since)
+        logger.info("Scheduling task deadlines after %s", since.isoformat())
+        while not self._stopped:
+            await self._join()
+            await self.tick()
+            timeout = self.scheduler.seconds_until_next(timezone.now(), self.max_sleep)
+            try:
+                message = await asyncio.wait_for(self.channel_layer.receive(self.channel_name), timeout)
+            except asyncio.TimeoutError:
+                continue
+            self.apply(message, timezone.now())
+
+    def stop(self):
+        self._stopped = True
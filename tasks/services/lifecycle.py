@@ -0,0 +1,331 @@
+"""
+Assignment lifecycle: the status transitions an assignment may take, the
+timestamps and progress each one implies, an append-only history
+(TaskAssignmentTransition) and the summary tables reporting reads
+instead of rescanning assignments: per-team daily completions and cycle
+times (TeamCycleTime) and per-member counts by status (MemberWorkload),
+both updated with each write.
+
+    assigned    -> in_progress, blocked, done
+    in_progress -> assigned, blocked, done
+    blocked     -> assigned, in_progress
+    done        -> in_progress (reopen)
+
+Entering in_progress or done stamps `started_at` once; entering done
+stamps `completed_at`, sets progress to 100 and records whether it came
+after the task's due date (`completed_late`); leaving it clears both.
+The summaries count that stored flag, so later due-date changes do not
+make them drift.
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Case, Count, DurationField, ExpressionWrapper, F, Q, Sum, Value, When
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from tasks.models import MemberWorkload, Task, TaskAssignment, TaskAssignmentTransition, TeamCycleTime
+from teams.models import TeamMember
+
+ASSIGNED = "assigned"
+IN_PROGRESS = "in_progress"
+DONE = "done"
+BLOCKED = "blocked"
+
+TRANSITIONS = {
+    ASSIGNED: (IN_PROGRESS, BLOCKED, DONE),
+    IN_PROGRESS: (ASSIGNED, BLOCKED, DONE),
+    BLOCKED: (ASSIGNED, IN_PROGRESS),
+    DONE: (IN_PROGRESS,),
+}
+
+
+class InvalidTransition(Exception):
+
+    def __init__(self, from_status: str, to_status: str):
+        self.from_status = from_status
+        self.to_status = to_status
+        super().__init__(f"An assignment cannot move from '{from_status}' to '{to_status}'.")
+
+
+def can_transition(from_status: str, to_status: str) -> bool:
+    return from_status == to_status or to_status in TRANSITIONS.get(from_status, ())
+
+
+def is_late(completed_at: datetime, due_date: Optional[datetime]) -> bool:
+    return due_date is not None and completed_at > due_date
+
+
+def _stamps(status: str, started_at: Optional[datetime], now: datetime, due_date: Optional[datetime]) -> Dict:
+    fields = {
+        "completed_at": now if status == DONE else None,
+        "completed_late": status == DONE and is_late(now, due_date),
+    }
+    if status in (IN_PROGRESS, DONE):
+        fields["started_at"] = started_at or now
+    if status == DONE:
+        fields["progress"] = 100
+    return fields
+
+
+def initial_fields(status: str, now: Optional[datetime] = None, due_date: Optional[datetime] = None) -> Dict:
+    """
+    Timestamps and progress of a new assignment created in `status`, on a
+    task due at `due_date`.
+    """
+    return _stamps(status, None, now or timezone.now(), due_date)
+
+
+def _increment(model, lookup: Dict, deltas: Dict[str, int]):
+    """
+    Add `deltas` to the counters of the `model` row matching `lookup` with
+    F() expressions, creating the row on first use. Decrements never take
+    a counter below zero; a row they would is left for a rebuild.
+    """
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    rows = model.objects.filter(**lookup)
+    updates = {name: F(name) + delta for name, delta in deltas.items()}
+    if any(delta < 0 for delta in deltas.values()):
+        rows.filter(**{f"{name}__gte": -delta for name, delta in deltas.items() if delta < 0}).update(**updates)
+        return
+    if not rows.update(**updates):
+        model.objects.bulk_create([model(**lookup)], ignore_conflicts=True)
+        rows.update(**updates)
+
+
+# (started_at, completed_at, completed_late) of a done assignment
+Completion = Tuple[datetime, datetime, bool]
+
+
+def _add_cycle_times(team_id: int, completions: Iterable[Completion], sign: int):
+    """
+    Add (sign=1) or remove (sign=-1) completions to the team's daily
+    aggregates, one write per day touched.
+    """
+    days: Dict[date, List[int]] = defaultdict(lambda: [0, 0, 0])
+    for started_at, completed_at, late in completions:
+        totals = days[timezone.localdate(completed_at)]
+        totals[0] += 1
+        totals[1] += late
+        totals[2] += max(0, int((completed_at - started_at).total_seconds()))
+
+    for day, (completed, late, seconds) in days.items():
+        _increment(
+            TeamCycleTime,
+            {"team_id": team_id, "day": day},
+            {"completed": sign * completed, "late": sign * late, "cycle_seconds": sign * seconds},
+        )
+
+
+def _add_workloads(deltas: Iterable[Tuple[int, str, int]], *, create: bool = False):
+    """
+    Apply (member id, status, delta) changes to MemberWorkload in one
+    UPDATE, never below zero. `create` first inserts the rows of members
+    that may not have one yet.
+    """
+    members: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for member_id, status, delta in deltas:
+        members[member_id][status] += delta
+    updates = {}
+    for status in TRANSITIONS:
+        whens = [
+            When(member_id=member_id, then=Value(statuses[status]))
+            for member_id, statuses in members.items() if statuses.get(status)
+        ]
+        if whens:
+            updates[status] = Greatest(F(status) + Case(*whens, default=Value(0)), Value(0))
+    if not updates:
+        return
+    if create:
+        MemberWorkload.objects.bulk_create(
+            [MemberWorkload(member_id=member_id) for member_id in members], ignore_conflicts=True,
+        )
+    MemberWorkload.objects.filter(member_id__in=list(members)).update(**updates)
+
+
+def _task_of(assignment: TaskAssignment) -> Optional[Tuple[int, Optional[datetime]]]:
+    """
+    (team id, due date) of the assignment's task, from the cached task when
+    loaded. None once the task itself is gone (a cascade delete).
+    """
+    if TaskAssignment.task.is_cached(assignment):
+        return assignment.task.team_id, assignment.task.due_date
+    return Task.objects.filter(pk=assignment.task_id).values_list("team_id", "due_date").first()
+
+
+def _completion(assignment: TaskAssignment) -> Optional[Completion]:
+    if assignment.status == DONE and assignment.started_at and assignment.completed_at:
+        return assignment.started_at, assignment.completed_at, assignment.completed_late
+    return None
+
+
+def created(team_id: int, assignments: List[TaskAssignment], *, changed_by: Optional[TeamMember] = None):
+    """
+    Record the initial transition of newly inserted assignments (built
+    with initial_fields()) in one INSERT, and count them in the summaries.
+    """
+    now = timezone.now()
+    TaskAssignmentTransition.objects.bulk_create([
+        TaskAssignmentTransition(
+            assignment=assignment, to_status=assignment.status, changed_by=changed_by, created_at=now,
+        )
+        for assignment in assignments
+    ])
+    _add_workloads(((assignment.member_id, assignment.status, 1) for assignment in assignments), create=True)
+
+    _add_cycle_times(team_id, filter(None, map(_completion, assignments)), 1)
+
+
+def _lock(assignment: TaskAssignment):
+    """
+    Lock the assignment's row until the transaction ends and reload it, so
+    concurrent writes decide their transition from the committed state one
+    after the other instead of both from the state they first read.
+    """
+    current = TaskAssignment.objects.select_for_update().get(pk=assignment.pk)
+    for field in TaskAssignment._meta.concrete_fields:
+        setattr(assignment, field.attname, getattr(current, field.attname))
+
+
+def apply(
+    assignment: TaskAssignment,
+    changes: Dict,
+    *,
+    changed_by: Optional[TeamMember] = None,
+    now: Optional[datetime] = None,
+) -> TaskAssignment:
+    """
+    Save validated `changes` to `assignment`, taking its status through the
+    state machine. Progress reported on an assigned assignment starts it.
+    The row is locked and reloaded first, so the transition is checked
+    against its current status. Raises InvalidTransition.
+    """
+    with transaction.atomic():
+        _lock(assignment)
+        return _apply(assignment, changes, changed_by=changed_by, now=now or timezone.now())
+
+
+def _apply(
+    assignment: TaskAssignment, changes: Dict, *, changed_by: Optional[TeamMember], now: datetime,
+) -> TaskAssignment:
+    from_status, from_member = assignment.status, assignment.member_id
+    to_status = changes.get("status", from_status)
+    if "status" not in changes and from_status == ASSIGNED and changes.get("progress"):
+        to_status = IN_PROGRESS
+    if not can_transition(from_status, to_status):
+        raise InvalidTransition(from_status, to_status)
+
+    previous = _completion(assignment)
+    for field, value in changes.items():
+        setattr(assignment, field, value)
+    assignment.status = to_status
+    status_changed = to_status != from_status
+    if not status_changed and assignment.member_id == from_member:
+        assignment.save()
+        return assignment
+
+    task = _task_of(assignment) if status_changed and (previous or to_status == DONE) else None
+    if status_changed:
+        for field, value in _stamps(to_status, assignment.started_at, now, task and task[1]).items():
+            setattr(assignment, field, value)
+    assignment.save()
+    _add_workloads(
+        [(from_member, from_status, -1), (assignment.member_id, to_status, 1)],
+        create=assignment.member_id != from_member,
+    )
+    if not status_changed:
+        return assignment
+
+    TaskAssignmentTransition.objects.create(
+        assignment=assignment,
+        from_status=from_status,
+        to_status=to_status,
+        changed_by=changed_by,
+        created_at=now,
+    )
+    if task is not None:
+        if previous:
+            _add_cycle_times(task[0], [previous], -1)
+        if to_status == DONE:
+            _add_cycle_times(task[0], [_completion(assignment)], 1)
+    return assignment
+
+
+def deleted(assignment: TaskAssignment):
+    """
+    Take a deleted assignment out of the summaries.
+    """
+    _add_workloads([(assignment.member_id, assignment.status, -1)])
+    completion = _completion(assignment)
+    if completion:
+        task = _task_of(assignment)
+        if task:
+            _add_cycle_times(task[0], [completion], -1)
+
+
+def rebuild_cycle_times(team_ids: Optional[Iterable[int]] = None):
+    """
+    Recreate the daily aggregates from the done assignments, for
+    assignments written without this service (bulk_create, data imports).
+    """
+    assignments = TaskAssignment.objects.filter(
+        status=DONE, started_at__isnull=False, completed_at__isnull=False,
+    )
+    aggregates = TeamCycleTime.objects.all()
+    if team_ids is not None:
+        team_ids = list(team_ids)
+        assignments = assignments.filter(task__team_id__in=team_ids)
+        aggregates = aggregates.filter(team_id__in=team_ids)
+
+    rows = (
+        assignments
+        .annotate(team=F("task__team_id"), day=TruncDate("completed_at"))
+        .values("team", "day")
+        .annotate(
+            completed=Count("id"),
+            late=Count("id", filter=Q(completed_late=True)),
+            cycle=Sum(ExpressionWrapper(F("completed_at") - F("started_at"), output_field=DurationField())),
+        )
+        .order_by()
+    )
+    with transaction.atomic():
+        aggregates.delete()
+        TeamCycleTime.objects.bulk_create(
+            [
+                TeamCycleTime(
+                    team_id=row["team"],
+                    day=row["day"],
+                    completed=row["completed"],
+                    late=row["late"],
+                    cycle_seconds=max(0, int(row["cycle"].total_seconds())) if row["cycle"] else 0,
+                )
+                for row in rows
+            ],
+            batch_size=1000,
+        )
+
+
+def rebuild_workloads(team_ids: Optional[Iterable[int]] = None):
+    """
+    Recreate MemberWorkload from the assignments, like rebuild_cycle_times().
+    """
+    assignments = TaskAssignment.objects.all()
+    workloads = MemberWorkload.objects.all()
+    if team_ids is not None:
+        team_ids = list(team_ids)
+        assignments = assignments.filter(member__team_id__in=team_ids)
+        workloads = workloads.filter(member__team_id__in=team_ids)
+
+    rows = (
+        assignments
+        .values("member_id")
+        .annotate(**{status: Count("id", filter=Q(status=status)) for status in TRANSITIONS})
+        .order_by()
+    )
+    with transaction.atomic():
+        workloads.delete()
+        MemberWorkload.objects.bulk_create([MemberWorkload(**row) for row in rows], batch_size=1000)
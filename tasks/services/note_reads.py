@@ -0,0 +1,125 @@
+from typing import Iterable, Optional
+
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+from tasks.models import TaskNote, TaskNoteUnreadCounter
+from teams.services.membership import ADMIN_ROLES
+
+READER_MEMBER = TaskNoteUnreadCounter.READER_MEMBER
+READER_ADMINS = TaskNoteUnreadCounter.READER_ADMINS
+
+
+def reader_of(author_role: str) -> str:
+    """
+    Which side of an assignment reads a note written by `author_role`.
+    """
+    return READER_MEMBER if author_role in ADMIN_ROLES else READER_ADMINS
+
+
+def _authored_for(reader: str) -> Q:
+    admin_authored = Q(author__role__in=ADMIN_ROLES)
+    return admin_authored if reader == READER_MEMBER else ~admin_authored
+
+
+def _add(assignment_id: int, reader: str, delta: int):
+    counters = TaskNoteUnreadCounter.objects.filter(assignment_id=assignment_id, reader=reader)
+    if delta < 0:
+        counters.filter(unread__gte=-delta).update(unread=F("unread") + delta)
+        return
+    if counters.update(unread=F("unread") + delta):
+        return
+    _, created = TaskNoteUnreadCounter.objects.get_or_create(
+        assignment_id=assignment_id, reader=reader, defaults={"unread": delta},
+    )
+    if not created:
+        counters.update(unread=F("unread") + delta)
+
+
+def note_created(note: TaskNote):
+    if note.assignment_id and not note.is_read:
+        _add(note.assignment_id, reader_of(note.author.role), 1)
+
+
+def note_deleted(note: TaskNote):
+    if note.assignment_id and not note.is_read:
+        _add(note.assignment_id, reader_of(note.author.role), -1)
+
+
+def mark_read(note: TaskNote) -> bool:
+    """
+    Mark one note read. Re-reading a note that is already read issues no
+    write, and the UPDATE is conditional so concurrent readers decrement
+    the counter once.
+    """
+    if note.is_read:
+        return False
+    marked = TaskNote.objects.filter(pk=note.pk, is_read=False).update(is_read=True)
+    note.is_read = True
+    if marked and note.assignment_id:
+        _add(note.assignment_id, reader_of(note.author.role), -1)
+    return bool(marked)
+
+
+def recount(counters):
+    """
+    Recompute the unread counters in the `counters` queryset from the
+    notes table, as a single UPDATE.
+    """
+    def unread(reader):
+        return Coalesce(Subquery(
+            TaskNote.objects
+            .filter(_authored_for(reader), assignment_id=OuterRef("assignment_id"), is_read=False)
+            .values("assignment_id")
+            .annotate(count=Count("id"))
+            .values("count")
+        ), 0)
+
+    counters.update(unread=Case(
+        When(reader=READER_MEMBER, then=unread(READER_MEMBER)),
+        default=unread(READER_ADMINS),
+    ))
+
+
+def mark_read_up_to(notes, counters, up_to: Optional[int] = None) -> int:
+    """
+    Mark every unread note of `notes` (the notes one reader sees) with an
+    id up to `up_to` read in one UPDATE, then recount that reader's
+    `counters`. Returns the number of notes marked.
+    """
+    unread = notes.filter(is_read=False)
+    if up_to is not None:
+        unread = unread.filter(id__lte=up_to)
+    marked = unread.update(is_read=True)
+    if marked:
+        recount(counters)
+    return marked
+
+
+def rebuild_unread_counters(assignment_ids: Optional[Iterable[int]] = None):
+    """
+    Recreate the counters from scratch, for notes written without signals
+    (bulk_create, data imports).
+    """
+    notes = TaskNote.objects.filter(assignment__isnull=False, is_read=False)
+    counters = TaskNoteUnreadCounter.objects.all()
+    if assignment_ids is not None:
+        assignment_ids = list(assignment_ids)
+        notes = notes.filter(assignment_id__in=assignment_ids)
+        counters = counters.filter(assignment_id__in=assignment_ids)
+
+    rows = (
+        notes
+        .annotate(reader=Case(
+            When(author__role__in=ADMIN_ROLES, then=Value(READER_MEMBER)),
+            default=Value(READER_ADMINS),
+        ))
+        .values("assignment_id", "reader")
+        .annotate(unread=Count("id"))
+        .order_by()
+    )
+    counters.delete()
+    TaskNoteUnreadCounter.objects.bulk_create(
+        [TaskNoteUnreadCounter(**row) for row in rows],
+        batch_size=1000,
+    )
@@ -0,0 +1,6 @@
+from . import cache_invalidation  # noqa: F401
+from . import dashboard  # noqa: F401
+from . import note_counters  # noqa: F401
+from . import deadlines  # noqa: F401
+from . import activity  # noqa: F401
+from . import lifecycle  # noqa: F401
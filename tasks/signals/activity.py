@@ -0,0 +1,38 @@
+from django.db.models.signals import post_delete, post_save
+
+from tasks.models import Task, TaskAssignment, TaskNote
+from tasks.services import activity
+
+
+def _task_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        activity.record(instance.team_id, activity.task_change(instance, activity.CREATED if created else activity.UPDATED))
+
+
+def _task_deleted(sender, instance, **kwargs):
+    activity.record(instance.team_id, activity.task_change(instance, activity.DELETED))
+
+
+def _child_changed(change, members=lambda instance: ()):
+    def receiver(sender, instance, created=False, raw=False, signal=None, **kwargs):
+        if raw:
+            return
+        team_id = activity.team_id_of(instance)
+        if team_id is None:
+            return
+        if signal is post_delete:
+            action = activity.DELETED
+        else:
+            action = activity.CREATED if created else activity.UPDATED
+        activity.record(team_id, change(instance, action), members=members(instance))
+    return receiver
+
+
+post_save.connect(_task_saved, sender=Task, dispatch_uid="task_activity:task_saved")
+post_delete.connect(_task_deleted, sender=Task, dispatch_uid="task_activity:task_deleted")
+for model, receiver in (
+    (TaskAssignment, _child_changed(activity.assignment_change)),
+    (TaskNote, _child_changed(activity.note_change, activity.note_members)),
+):
+    post_save.connect(receiver, sender=model, weak=False, dispatch_uid=f"task_activity:{model._meta.model_name}_saved")
+    post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=f"task_activity:{model._meta.model_name}_deleted")
@@ -0,0 +1,4 @@
+from tasks.models import Task
+from utils.cache import invalidate_on_change
+
+invalidate_on_change(Task, "tasks")
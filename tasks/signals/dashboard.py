@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+
+from tasks.models import Task, TaskAssignment
+from tasks.services import TeamDashboard
+from tasks.services.activity import team_id_of
+
+
+def _task_changed(sender, instance, **kwargs):
+    TeamDashboard.invalidate(instance.team_id)
+
+
+def _assignment_changed(sender, instance, **kwargs):
+    # None when the task itself is being deleted; its own signal covers that
+    team_id = team_id_of(instance)
+    if team_id is not None:
+        TeamDashboard.invalidate(team_id)
+
+
+post_save.connect(_task_changed, sender=Task, dispatch_uid="task_dashboard:task")
+post_delete.connect(_task_changed, sender=Task, dispatch_uid="task_dashboard:task")
+post_save.connect(_assignment_changed, sender=TaskAssignment, dispatch_uid="task_dashboard:assignment")
+post_delete.connect(_assignment_changed, sender=TaskAssignment, dispatch_uid="task_dashboard:assignment")
@@ -0,0 +1,18 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from tasks.models import Task
+from tasks.services.deadlines import notify_deadline_changes
+
+
+def _task_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(lambda: notify_deadline_changes([instance]))
+
+
+def _task_deleted(sender, instance, **kwargs):
+    transaction.on_commit(lambda: notify_deadline_changes([instance], deleted=True))
+
+
+post_save.connect(_task_saved, sender=Task, dispatch_uid="task_deadlines:saved")
+post_delete.connect(_task_deleted, sender=Task, dispatch_uid="task_deadlines:deleted")
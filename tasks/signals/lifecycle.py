@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete
+
+from tasks.models import TaskAssignment
+from tasks.services import lifecycle
+
+
+def _assignment_deleted(sender, instance, **kwargs):
+    lifecycle.deleted(instance)
+
+
+post_delete.connect(_assignment_deleted, sender=TaskAssignment, dispatch_uid="task_lifecycle:assignment_deleted")
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+
+from tasks.models import TaskNote
+from tasks.services import note_reads
+
+
+def _note_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        note_reads.note_created(instance)
+
+
+def _note_deleted(sender, instance, **kwargs):
+    note_reads.note_deleted(instance)
+
+
+post_save.connect(_note_saved, sender=TaskNote, dispatch_uid="task_note_unread:saved")
+post_delete.connect(_note_deleted, sender=TaskNote, dispatch_uid="task_note_unread:deleted")
@@ -0,0 +1,224 @@
+from unittest.mock import AsyncMock, patch
+
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from chats.routing import websocket_urlpatterns
+from teams.models import Team, TeamMember
+from tasks.models import Task, TaskAssignment, TaskNote
+from tasks.services import bulk_create_tasks
+from users.tests.factories import UserFactory
+
+
+class TaskActivityTestCase(TestCase):
+
+    def setUp(self):
+        self.team = Team.objects.create(title="Team")
+        self.owner = TeamMember.objects.create(team=self.team, user=UserFactory(), role="owner")
+        self.member = TeamMember.objects.create(team=self.team, user=UserFactory(), role="member")
+
+        self.group_send = AsyncMock()
+        patcher = patch(
+            "tasks.services.activity.get_channel_layer",
+            return_value=AsyncMock(group_send=self.group_send),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _sent(self):
+        return [call.args for call in self.group_send.await_args_list]
+
+    def _admins(self, team=None):
+        return f"team_{(team or self.team).id}_admins"
+
+    def _member(self, member):
+        return f"team_{member.team_id}_member_{member.id}"
+
+    def test_one_coalesced_event_per_transaction(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                task = Task.objects.create(title="Task", team=self.team, created_by=self.owner)
+                assignment = TaskAssignment.objects.create(task=task, member=self.member)
+                assignment.status = "in_progress"
+                assignment.save()
+                note = TaskNote.objects.create(task=task, assignment=assignment, author=self.member, content="hi")
+            self.group_send.assert_not_awaited()
+
+        (group, message), (member_group, member_message) = self._sent()
+        self.assertEqual((group, member_group), (self._admins(), self._member(self.member)))
+        self.assertEqual(member_message, message)  # every change is about the member's work
+        self.assertEqual(message["type"], "team.event")
+        self.assertEqual(message["data"]["event"], "task_activity")
+        changes = message["data"]["changes"]
+        self.assertEqual(
+            [(change["type"], change["id"], change["action"]) for change in changes],
+            [("task", task.id, "created"), ("assignment", assignment.id, "created"), ("note", note.id, "created")],
+        )
+        self.assertEqual(changes[1]["status"], "in_progress")  # latest state
+        self.assertNotIn("content", changes[2])
+
+    def test_rolled_back_savepoint_is_not_published(self):
+        task = Task.objects.create(title="Task", team=self.team)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                task.status = "inactive"
+                task.save()
+                try:
+                    with transaction.atomic():
+                        TaskAssignment.objects.create(task=task, member=self.member)
+                        raise ValueError
+                except ValueError:
+                    pass
+
+        [(_, message)] = self._sent()
+        self.assertEqual(
+            [(change["type"], change["action"]) for change in message["data"]["changes"]],
+            [("task", "updated")],
+        )
+
+    def test_created_and_deleted_cancel_out(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Task.objects.create(title="Task", team=self.team).delete()
+        self.group_send.assert_not_awaited()
+
+    def test_task_delete_hides_cascaded_children(self):
+        task = Task.objects.create(title="Task", team=self.team)
+        assignment = TaskAssignment.objects.create(task=task, member=self.member)
+        TaskNote.objects.create(task=task, assignment=assignment, author=self.member, content="hi")
+        task_id = task.id
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                task.delete()
+
+        sent = self._sent()
+        self.assertEqual([group for group, _ in sent], [self._admins(), self._member(self.member)])
+        for _, message in sent:
+            self.assertEqual(
+                [(change["type"], change["id"], change["action"]) for change in message["data"]["changes"]],
+                [("task", task_id, "deleted")],
+            )
+
+    def test_one_event_per_team(self):
+        other = Team.objects.create(title="Other")
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Task.objects.create(title="A", team=self.team)
+                Task.objects.create(title="B", team=other)
+        self.assertEqual(sorted(group for group, _ in self._sent()), sorted([self._admins(), self._admins(other)]))
+
+    def test_bulk_create_publishes_one_event(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_create_tasks(self.team.id, self.owner, [{"title": f"Task {n}"} for n in range(20)])
+        [(_, message)] = self._sent()
+        self.assertEqual(len(message["data"]["changes"]), 20)
+
+    def test_members_only_get_changes_about_their_work(self):
+        other = TeamMember.objects.create(team=self.team, user=UserFactory(), role="member")
+        mine = Task.objects.create(title="Mine", team=self.team)
+        theirs = Task.objects.create(title="Theirs", team=self.team)
+        assignment = TaskAssignment.objects.create(task=mine, member=self.member)
+        TaskAssignment.objects.create(task=theirs, member=other)
+        note = TaskNote.objects.create(task=mine, assignment=assignment, author=self.owner, content="hi")
+        note = TaskNote.objects.get(pk=note.pk)  # assignment not loaded
+        self.group_send.reset_mock()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                for task in (mine, theirs):
+                    task.status = "inactive"
+                    task.save()
+                note.save()
+
+        sent = dict(self._sent())
+        self.assertEqual(set(sent), {self._admins(), self._member(self.member), self._member(other), self._member(self.owner)})
+
+        def changes(group):
+            return [(change["type"], change["id"]) for change in sent[group]["data"]["changes"]]
+
+        self.assertEqual(changes(self._admins()), [("task", mine.id), ("task", theirs.id), ("note", note.id)])
+        self.assertEqual(changes(self._member(self.member)), [("task", mine.id), ("note", note.id)])
+        self.assertEqual(changes(self._member(other)), [("task", theirs.id)])
+
+    def test_savepoint_levels_and_transactions_do_not_share_buffers(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Task.objects.create(title="Rolled back", team=self.team)
+                    raise ValueError
+            except ValueError:
+                pass
+            with transaction.atomic():
+                task = Task.objects.create(title="Kept", team=self.team)
+
+        [(_, message)] = self._sent()
+        self.assertEqual([change["id"] for change in message["data"]["changes"]], [task.id])
+
+    @override_settings(TASK_ACTIVITY_ENABLED=False)
+    def test_disabled(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(title="Task", team=self.team)
+        self.group_send.assert_not_awaited()
+
+
+class TaskActivityRollbackTestCase(TransactionTestCase):
+
+    def setUp(self):
+        self.team = Team.objects.create(title="Team")
+        self.group_send = AsyncMock()
+        patcher = patch(
+            "tasks.services.activity.get_channel_layer",
+            return_value=AsyncMock(group_send=self.group_send),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_rolled_back_transaction_leaves_no_buffer(self):
+        try:
+            with transaction.atomic():
+                Task.objects.create(title="Rolled back", team=self.team)
+                raise ValueError
+        except ValueError:
+            pass
+        with transaction.atomic():
+            task = Task.objects.create(title="Kept", team=self.team)
+
+        [(_, message)] = [call.args for call in self.group_send.await_args_list]
+        self.assertEqual([change["id"] for change in message["data"]["changes"]], [task.id])
+
+
+class TaskActivityWebsocketTestCase(TransactionTestCase):
+
+    def setUp(self):
+        self.admin_user = UserFactory()
+        self.user = UserFactory()
+        self.team = Team.objects.create(title="Team")
+        TeamMember.objects.create(team=self.team, user=self.admin_user, role="admin")
+        self.member = TeamMember.objects.create(team=self.team, user=self.user, role="member")
+
+    async def _connect(self, user):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), f"/ws/teams/{self.team.id}/")
+        communicator.scope["user"] = user
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator
+
+    async def test_activity_is_scoped_by_role(self):
+        admin = await self._connect(self.admin_user)
+        member = await self._connect(self.user)
+
+        task = await database_sync_to_async(Task.objects.create)(title="Task", team=self.team)
+        event = await admin.receive_json_from()
+        self.assertEqual(event["event"], "task_activity")
+        self.assertEqual(event["changes"][0]["id"], task.id)
+        self.assertTrue(await member.receive_nothing())
+
+        assignment = await database_sync_to_async(TaskAssignment.objects.create)(task=task, member=self.member)
+        for communicator in (admin, member):
+            event = await communicator.receive_json_from()
+            self.assertEqual(event["changes"][0]["id"], assignment.id)
+        await admin.disconnect()
+        await member.disconnect()
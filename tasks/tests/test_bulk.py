@@ -0,0 +1,135 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from teams.models import Team, TeamMember
+from tasks.models import Task, TaskAssignment
+from users.tests.factories import UserFactory
+
+
+class BulkTaskCreateTestCase(APITestCase):
+
+    def setUp(self):
+        self.owner = UserFactory()
+        self.team = Team.objects.create(title="Sprint")
+        self.owner_member = TeamMember.objects.create(team=self.team, user=self.owner, role="owner")
+        self.url = reverse("tasks:team_tasks_bulk", kwargs={"team_id": self.team.id})
+        self.client.force_authenticate(self.owner)
+
+    def test_creates_valid_items_and_reports_invalid(self):
+        items = [{"title": "One"}, {"title": ""}, {"title": "Three", "status": "inactive"}]
+        response = self.client.post(self.url, {"items": items}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        data = response.data["data"]
+        self.assertEqual((data["created"], data["failed"]), (2, 1))
+        self.assertEqual([result["index"] for result in data["results"]], [0, 1, 2])
+        self.assertIn("title", data["results"][1]["errors"])
+        self.assertEqual(data["results"][2]["data"]["status"], "inactive")
+
+        tasks = Task.objects.filter(team=self.team).order_by("id")
+        self.assertEqual([task.title for task in tasks], ["One", "Three"])
+        self.assertEqual(data["results"][0]["id"], tasks[0].id)
+        self.assertTrue(all(task.created_by_id == self.owner_member.id for task in tasks))
+
+    def test_atomic_creates_nothing_on_error(self):
+        items = [{"title": "One"}, {"status": "unknown"}]
+        response = self.client.post(self.url, {"items": items, "atomic": True}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"]["code"], "TASK_001015")
+        self.assertEqual([result["index"] for result in response.data["error"]["detail"]], [1])
+        self.assertFalse(Task.objects.exists())
+
+    def test_query_count_independent_of_batch_size(self):
+        def queries(count):
+            items = [{"title": f"Task {n}"} for n in range(count)]
+            cache.clear()  # memberships are cached after the first request
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.post(self.url, {"items": items}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            return len(captured.captured_queries)
+
+        self.assertEqual(queries(2), queries(50))
+        self.assertEqual(Task.objects.count(), 52)
+
+    @override_settings(TASK_BULK_MAX_ITEMS=2)
+    def test_batch_limit(self):
+        response = self.client.post(self.url, {"items": [{"title": "x"}] * 3}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"]["code"], "TASK_001014")
+
+    def test_member_forbidden(self):
+        member = TeamMember.objects.create(team=self.team, user=UserFactory(), role="member")
+        self.client.force_authenticate(member.user)
+        response = self.client.post(self.url, {"items": [{"title": "x"}]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Task.objects.exists())
+
+
+class BulkAssignmentCreateTestCase(APITestCase):
+
+    def setUp(self):
+        self.owner = UserFactory()
+        self.team = Team.objects.create(title="Sprint")
+        self.owner_member = TeamMember.objects.create(team=self.team, user=self.owner, role="owner")
+        self.members = [
+            TeamMember.objects.create(team=self.team, user=UserFactory(), role="member")
+            for _ in range(2)
+        ]
+        self.task = Task.objects.create(title="Task", team=self.team, created_by=self.owner_member)
+
+        other_team = Team.objects.create(title="Other")
+        self.outsider = TeamMember.objects.create(team=other_team, user=UserFactory(), role="member")
+        self.foreign_task = Task.objects.create(title="Foreign", team=other_team)
+
+        self.url = reverse("tasks:team_assignments_bulk", kwargs={"team_id": self.team.id})
+        self.client.force_authenticate(self.owner)
+
+    def test_validates_team_and_duplicates(self):
+        TaskAssignment.objects.create(task=self.task, member=self.members[0])
+        items = [
+            {"task": self.task.id, "member": self.members[1].id, "status": "in_progress", "progress": 10},
+            {"task": self.task.id, "member": self.members[0].id},  # already assigned
+            {"task": self.task.id, "member": self.members[1].id},  # duplicate within the batch
+            {"task": self.task.id, "member": self.outsider.id},
+            {"task": self.foreign_task.id, "member": self.owner_member.id},
+            {"task": self.task.id},
+        ]
+        response = self.client.post(self.url, {"items": items}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        results = response.data["data"]["results"]
+        self.assertEqual(results[0]["data"]["status"], "in_progress")
+        self.assertEqual(
+            [sorted(result.get("errors", {})) for result in results],
+            [[], ["member"], ["member"], ["member"], ["task"], ["member"]],
+        )
+        self.assertEqual(TaskAssignment.objects.filter(task=self.task).count(), 2)
+        self.assertFalse(TaskAssignment.objects.filter(member=self.outsider).exists())
+
+    def test_query_count_independent_of_batch_size(self):
+        tasks = Task.objects.bulk_create([
+            Task(title=f"Task {n}", team=self.team, created_by=self.owner_member) for n in range(40)
+        ])
+
+        def queries(batch):
+            items = [{"task": task.id, "member": member.id} for task in batch for member in self.members]
+            cache.clear()  # memberships are cached after the first request
+            with CaptureQueriesContext(connection) as captured:
+                response = self.client.post(self.url, {"items": items}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            return len(captured.captured_queries)
+
+        self.assertEqual(queries(tasks[:1]), queries(tasks[1:]))
+        self.assertEqual(TaskAssignment.objects.count(), 80)
+
+    def test_all_invalid(self):
+        response = self.client.post(
+            self.url, {"items": [{"task": self.foreign_task.id, "member": self.outsider.id}]}, format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"]["code"], "TASK_001015")
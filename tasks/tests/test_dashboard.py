@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from teams.models import Team, TeamMember
+from tasks.models import Task, TaskAssignment
+from tasks.services import TeamDashboard
+from users.tests.factories import UserFactory
+from utils import metrics
+from utils.metrics import InMemoryBackend
+
+
+class TeamDashboardTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.owner = UserFactory()
+        self.team = Team.objects.create(title="Board")
+        self.owner_member = TeamMember.objects.create(team=self.team, user=self.owner, role="owner")
+        self.members = [
+            TeamMember.objects.create(team=self.team, user=UserFactory(), role="member")
+            for _ in range(3)
+        ]
+        now = timezone.now()
+        self.overdue = Task.objects.create(
+            title="Overdue", team=self.team, created_by=self.owner_member, due_date=now - timedelta(days=1),
+        )
+        self.finished = Task.objects.create(
+            title="Finished late", team=self.team, created_by=self.owner_member, due_date=now - timedelta(days=2),
+        )
+        self.open = Task.objects.create(title="No deadline", team=self.team, created_by=self.owner_member)
+
+        for member, (assignment_status, progress) in zip(
+            self.members, (("assigned", 0), ("in_progress", 40), ("done", 100))
+        ):
+            TaskAssignment.objects.create(task=self.overdue, member=member, status=assignment_status, progress=progress)
+        for member in self.members[:2]:
+            TaskAssignment.objects.create(task=self.finished, member=member, status="done", progress=100)
+
+        self.url = reverse("tasks:team_dashboard", kwargs={"team_id": self.team.id})
+        self.client.force_authenticate(self.owner)
+
+    def test_dashboard_stats(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data["data"]
+
+        tasks = {task["id"]: task for task in data["tasks"]}
+        # ordered by deadline, tasks without one last
+        self.assertEqual([task["id"] for task in data["tasks"]], [self.finished.id, self.overdue.id, self.open.id])
+
+        overdue = tasks[self.overdue.id]
+        self.assertEqual(
+            overdue["assignments"],
+            {"total": 3, "assigned": 1, "in_progress": 1, "done": 1, "blocked": 0},
+        )
+        self.assertEqual(overdue["average_progress"], 46.7)
+        self.assertTrue(overdue["is_overdue"])
+
+        self.assertFalse(tasks[self.finished.id]["is_overdue"])  # every assignee is done
+        self.assertEqual(tasks[self.open.id]["assignments"]["total"], 0)
+        self.assertIsNone(tasks[self.open.id]["average_progress"])
+        self.assertFalse(tasks[self.open.id]["is_overdue"])
+
+        summary = data["summary"]
+        self.assertEqual(summary["tasks"], 3)
+        self.assertEqual(summary["overdue"], 1)
+        self.assertEqual(summary["assignments"]["done"], 3)
+        self.assertEqual(summary["average_progress"], 68.0)
+
+    def test_one_grouped_query_and_cached(self):
+        with CaptureQueriesContext(connection) as captured:
+            TeamDashboard.build(self.team.id)
+        self.assertEqual(len(captured.captured_queries), 1)
+
+        with self.assertNumQueries(0):
+            TeamDashboard.build(self.team.id)
+
+    def test_cache_hits_and_misses_are_counted(self):
+        backend = InMemoryBackend()
+        metrics.configure(backend=backend, enabled=True)
+        self.addCleanup(metrics.configure, backend=None, enabled=False)
+
+        TeamDashboard.build(self.team.id)
+        TeamDashboard.build(self.team.id)
+        self.assertEqual(backend.get("cache_misses_total", namespace="tasks"), 1)
+        self.assertEqual(backend.get("cache_hits_total", namespace="tasks"), 1)
+
+    def test_invalidated_on_assignment_write(self):
+        self.client.get(self.url)
+        assignment = self.overdue.assignments.get(status="assigned")
+        assignment.status = "done"
+        assignment.save()
+
+        data = self.client.get(self.url).data["data"]
+        overdue = next(task for task in data["tasks"] if task["id"] == self.overdue.id)
+        self.assertEqual(overdue["assignments"]["done"], 2)
+
+    def test_invalidated_on_task_write(self):
+        self.client.get(self.url)
+        Task.objects.create(title="New", team=self.team, created_by=self.owner_member)
+        self.assertEqual(self.client.get(self.url).data["data"]["summary"]["tasks"], 4)
+
+        self.overdue.delete()
+        self.assertEqual(self.client.get(self.url).data["data"]["summary"]["tasks"], 3)
+
+    def test_member_forbidden(self):
+        self.client.force_authenticate(self.members[0].user)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,166 @@
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from teams.models import Team, TeamMember
+from tasks.models import Task, TaskAssignment
+from tasks.services.deadlines import (
+    DEADLINE_CHANGES_GROUP,
+    TASK_DUE_SOON,
+    TASK_OVERDUE,
+    DeadlineScheduler,
+    DeadlineWorker,
+)
+from users.tests.factories import UserFactory
+
+
+class DeadlineSchedulerTestCase(TestCase):
+
+    def setUp(self):
+        self.team = Team.objects.create(title="Team")
+        self.now = timezone.now()
+        self.scheduler = DeadlineScheduler(lead=timedelta(minutes=30), lookahead=timedelta(hours=1), batch_size=100)
+        self.scheduler.start(self.now)
+
+    def _task(self, minutes, **kwargs):
+        return Task.objects.create(
+            title="Task", team=self.team, due_date=self.now + timedelta(minutes=minutes), **kwargs
+        )
+
+    def _events(self, minutes):
+        return [(event.event, event.task_id) for event in self.scheduler.pop_due(self.now + timedelta(minutes=minutes))]
+
+    def test_loads_active_tasks_within_window(self):
+        soon = self._task(40)
+        self._task(200)  # beyond lead + lookahead
+        self._task(20, status="inactive")
+        self._task(-10)  # already passed
+        Task.objects.create(title="No deadline", team=self.team)
+
+        self.assertEqual(self.scheduler.load(self.now), 1)
+        self.assertEqual(self._events(9), [])
+        self.assertEqual(self._events(10), [(TASK_DUE_SOON, soon.id)])
+        self.assertEqual(self._events(40), [(TASK_OVERDUE, soon.id)])
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_keyset_batches(self):
+        tasks = [self._task(45) for _ in range(5)]
+        scheduler = DeadlineScheduler(lead=timedelta(0), lookahead=timedelta(hours=1), batch_size=2)
+        scheduler.start(self.now)
+
+        self.assertEqual([scheduler.load(self.now) for _ in range(4)], [2, 2, 1, 0])
+        events = scheduler.pop_due(self.now + timedelta(minutes=45))
+        self.assertEqual([event.task_id for event in events], [task.id for task in tasks])
+
+    def test_reschedule_and_cancel(self):
+        moved = self._task(40)
+        cancelled = self._task(50)
+        self.scheduler.load(self.now)
+
+        self.scheduler.task_changed(moved.id, self.team.id, self.now + timedelta(minutes=60), "active", self.now)
+        self.scheduler.task_changed(cancelled.id, self.team.id, cancelled.due_date, "cancelled", self.now)
+        # an unrelated edit of a task does not schedule it twice
+        self.scheduler.task_changed(moved.id, self.team.id, self.now + timedelta(minutes=60), "active", self.now)
+
+        self.assertEqual(self._events(40), [(TASK_DUE_SOON, moved.id)])
+        self.assertEqual(self._events(60), [(TASK_OVERDUE, moved.id)])
+
+    def test_changes_beyond_loaded_window_are_loaded_later(self):
+        self.scheduler.load(self.now)
+        task = self._task(150)
+        self.scheduler.task_changed(task.id, self.team.id, task.due_date, "active", self.now)
+        self.assertEqual(len(self.scheduler), 0)
+
+        later = self.now + timedelta(minutes=100)
+        self.assertTrue(self.scheduler.needs_load(later))
+        self.scheduler.load(later)
+        self.assertEqual(self._events(150), [(TASK_DUE_SOON, task.id), (TASK_OVERDUE, task.id)])
+
+
+class DeadlineWorkerTestCase(TransactionTestCase):
+
+    def setUp(self):
+        self.team = Team.objects.create(title="Team")
+        self.now = timezone.now()
+        self.task = Task.objects.create(title="Task", team=self.team, due_date=self.now + timedelta(minutes=5))
+        self.layer = AsyncMock()
+
+    def _worker(self, **kwargs):
+        scheduler = DeadlineScheduler(lead=timedelta(minutes=10), lookahead=timedelta(hours=1))
+        scheduler.start(self.now)
+        return DeadlineWorker(scheduler, channel_layer=self.layer, **kwargs)
+
+    def test_sends_events_to_admins_and_assignees(self):
+        assignee = TeamMember.objects.create(team=self.team, user=UserFactory(), role="member")
+        TeamMember.objects.create(team=self.team, user=UserFactory(), role="member")
+        TaskAssignment.objects.create(task=self.task, member=assignee)
+        worker = self._worker(expire_status="")
+        async_to_sync(worker.tick)(self.now)
+        async_to_sync(worker.tick)(self.now + timedelta(minutes=5))
+
+        sent = [call.args for call in self.layer.group_send.await_args_list]
+        self.assertEqual(
+            [group for group, _ in sent],
+            [f"team_{self.team.id}_admins", f"team_{self.team.id}_member_{assignee.id}"] * 2,
+        )
+        self.assertEqual([message["data"]["event"] for _, message in sent[::2]], [TASK_DUE_SOON, TASK_OVERDUE])
+        self.assertEqual(sent[2][1]["data"]["task_id"], self.task.id)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, "active")
+
+    def test_expires_overdue_task(self):
+        worker = self._worker(expire_status="inactive")
+        async_to_sync(worker.tick)(self.now)
+        async_to_sync(worker.tick)(self.now + timedelta(minutes=5))
+
+        _, message = self.layer.group_send.await_args.args
+        self.assertEqual(message["data"]["status"], "inactive")
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, "inactive")
+
+    def test_applies_change_notifications(self):
+        worker = self._worker()
+        async_to_sync(worker.tick)(self.now)
+        worker.apply({
+            "type": "deadline.changed",
+            "tasks": [{"id": self.task.id, "team_id": self.team.id, "due_date": None, "status": "deleted"}],
+        }, self.now)
+        self.assertEqual(async_to_sync(worker.tick)(self.now + timedelta(minutes=5)), [])
+
+
+class DeadlineNotificationTestCase(TestCase):
+
+    def setUp(self):
+        self.team = Team.objects.create(title="Team")
+        owner = TeamMember.objects.create(team=self.team, user=UserFactory(), role="owner")
+        self.task = Task.objects.create(title="Task", team=self.team, created_by=owner)
+
+        self.group_send = AsyncMock()
+        patcher = patch(
+            "tasks.services.deadlines.get_channel_layer",
+            return_value=AsyncMock(group_send=self.group_send),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @override_settings(TASK_DEADLINES_ENABLED=True)
+    def test_task_write_notifies_worker_on_commit(self):
+        due_date = timezone.now() + timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.due_date = due_date
+            self.task.save()
+            self.group_send.assert_not_awaited()
+
+        group, message = self.group_send.await_args.args
+        self.assertEqual(group, DEADLINE_CHANGES_GROUP)
+        self.assertEqual(
+            message["tasks"],
+            [{"id": self.task.id, "team_id": self.team.id, "due_date": due_date.isoformat(), "status": "active"}],
+        )
+
+    def test_disabled(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.save()
+        self.group_send.assert_not_awaited()
@@ -0,0 +1,262 @@
+import threading
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TransactionTestCase, skipUnlessDBFeature
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.tests.factories import UserFactory
+from teams.models import Team, TeamMember
+from tasks.models import MemberWorkload, Task, TaskAssignment, TaskAssignmentTransition, TeamCycleTime
+from tasks.services import bulk_create_assignments, lifecycle
+
+
+class AssignmentLifecycleTestCase(APITestCase):
+
+    def setUp(self):
+        self.admin_user = UserFactory()
+        self.member_user = UserFactory()
+        self.team = Team.objects.create(title="Team")
+        self.admin = TeamMember.objects.create(team=self.team, user=self.admin_user, role="admin")
+        self.member = TeamMember.objects.create(team=self.team, user=self.member_user, role="member")
+        self.task = Task.objects.create(title="Task", team=self.team, created_by=self.admin)
+        self.assignment = TaskAssignment.objects.create(task=self.task, member=self.member)
+        self.url = reverse("tasks:task_assignment_detail", kwargs={"pk": self.assignment.id})
+        self.now = timezone.now()
+
+    def _aggregate(self):
+        return list(TeamCycleTime.objects.filter(team=self.team).values_list("completed", "cycle_seconds"))
+
+    def test_patch_stamps_and_records(self):
+        self.client.force_authenticate(self.member_user)
+        response = self.client.patch(self.url, {"status": "in_progress"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(response.data["data"]["started_at"])
+
+        response = self.client.patch(self.url, {"status": "done"}, format="json")
+        self.assertEqual(response.data["data"]["progress"], 100)
+        self.assertIsNotNone(response.data["data"]["completed_at"])
+
+        self.assertEqual(
+            list(self.assignment.transitions.values_list("from_status", "to_status", "changed_by")),
+            [("assigned", "in_progress", self.member.id), ("in_progress", "done", self.member.id)],
+        )
+        self.assertEqual(self._aggregate()[0][0], 1)
+
+    def test_invalid_transition(self):
+        lifecycle.apply(self.assignment, {"status": "blocked"})
+        self.client.force_authenticate(self.member_user)
+        response = self.client.patch(self.url, {"status": "done"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"]["code"], "TASK_001016")
+        self.assignment.refresh_from_db()
+        self.assertEqual(self.assignment.status, "blocked")
+
+    def test_progress_starts_assignment(self):
+        lifecycle.apply(self.assignment, {"progress": 20}, now=self.now)
+        self.assignment.refresh_from_db()
+        self.assertEqual(self.assignment.status, "in_progress")
+        self.assertEqual(self.assignment.started_at, self.now)
+
+    def test_incremental_cycle_times(self):
+        lifecycle.apply(self.assignment, {"status": "in_progress"}, now=self.now - timedelta(hours=2))
+        lifecycle.apply(self.assignment, {"status": "done"}, now=self.now)
+        self.assertEqual(self._aggregate(), [(1, 7200)])
+
+        # reopening takes it out of the aggregate, finishing again counts the new span
+        lifecycle.apply(self.assignment, {"status": "in_progress"}, now=self.now)
+        self.assertEqual(self._aggregate(), [(0, 0)])
+        self.assertIsNone(self.assignment.completed_at)
+        lifecycle.apply(self.assignment, {"status": "done"}, now=self.now + timedelta(hours=1))
+        self.assertEqual(self._aggregate(), [(1, 3 * 3600)])
+
+        # an unchanged status writes no history
+        lifecycle.apply(self.assignment, {"answer": "Here", "status": "done"})
+        self.assertEqual(self.assignment.transitions.count(), 4)
+
+    def test_transition_is_decided_from_the_current_row(self):
+        # two requests loaded the assignment before either wrote
+        first = TaskAssignment.objects.get(pk=self.assignment.pk)
+        second = TaskAssignment.objects.get(pk=self.assignment.pk)
+        stale = TaskAssignment.objects.get(pk=self.assignment.pk)
+        lifecycle.created(self.team.id, [self.assignment])
+        lifecycle.apply(first, {"status": "done"}, now=self.now)
+
+        lifecycle.apply(second, {"status": "done"}, now=self.now)
+        self.assertEqual(self.assignment.transitions.count(), 2)
+        self.assertEqual(self._aggregate(), [(1, 0)])
+        self.assertEqual(MemberWorkload.objects.get(member=self.member).done, 1)
+
+        with self.assertRaises(lifecycle.InvalidTransition):
+            lifecycle.apply(stale, {"status": "blocked"})
+
+    def test_delete_removes_from_aggregate(self):
+        lifecycle.apply(self.assignment, {"status": "done"}, now=self.now)
+        self.assertEqual(self._aggregate(), [(1, 0)])
+        self.task.delete()
+        self.assertEqual(self._aggregate(), [(0, 0)])
+
+    def test_create_and_bulk_create(self):
+        other = TeamMember.objects.create(team=self.team, user=UserFactory(), role="member")
+        task = Task.objects.create(title="Other", team=self.team)
+
+        self.client.force_authenticate(self.admin_user)
+        url = reverse("tasks:task_assignments", kwargs={"task_id": task.id})
+        response = self.client.post(url, {"member": self.member.id, "status": "done"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIsNotNone(response.data["data"]["completed_at"])
+
+        result = bulk_create_assignments(
+            self.team.id,
+            [{"task": task.id, "member": other.id, "status": "in_progress"}],
+            changed_by=self.admin,
+        )
+        self.assertEqual(result.created, 1)
+        created = TaskAssignment.objects.get(task=task, member=other)
+        self.assertIsNotNone(created.started_at)
+        self.assertEqual(
+            list(
+                TaskAssignmentTransition.objects
+                .filter(assignment__task=task)
+                .values_list("from_status", "to_status", "changed_by")
+            ),
+            [("", "done", self.admin.id), ("", "in_progress", self.admin.id)],
+        )
+        self.assertEqual(self._aggregate()[0][0], 1)
+
+    def test_late_completions(self):
+        self.task.due_date = self.now - timedelta(hours=1)
+        self.task.save()
+        lifecycle.apply(self.assignment, {"status": "done"}, now=self.now)
+        self.assertEqual(TeamCycleTime.objects.get(team=self.team).late, 1)
+        self.assertTrue(self.assignment.completed_late)
+
+    def test_late_flag_survives_due_date_changes(self):
+        self.task.due_date = self.now - timedelta(hours=1)
+        self.task.save()
+        lifecycle.apply(self.assignment, {"status": "done"}, now=self.now)
+
+        # extending the deadline neither changes the recorded completion
+        # nor what reopening takes out of the aggregate
+        self.task.due_date = self.now + timedelta(days=1)
+        self.task.save()
+        self.assignment.refresh_from_db()
+        lifecycle.apply(self.assignment, {"status": "in_progress"}, now=self.now)
+        lifecycle.apply(self.assignment, {"status": "done"}, now=self.now)
+        self.assertFalse(self.assignment.completed_late)
+
+        totals = TeamCycleTime.objects.values_list("completed", "late")
+        self.assertEqual(list(totals.filter(team=self.team)), [(1, 0)])
+        lifecycle.rebuild_cycle_times()
+        self.assertEqual(list(totals.filter(team=self.team)), [(1, 0)])
+
+    def test_workload_follows_status_and_member(self):
+        other = TeamMember.objects.create(team=self.team, user=UserFactory(), role="member")
+        lifecycle.created(self.team.id, [self.assignment])
+        lifecycle.apply(self.assignment, {"status": "in_progress"})
+        lifecycle.apply(self.assignment, {"member": other})
+        lifecycle.apply(self.assignment, {"status": "done"})
+
+        workloads = {
+            row["member"]: row
+            for row in MemberWorkload.objects.values("member", "assigned", "in_progress", "done")
+        }
+        self.assertEqual(workloads[self.member.id], {"member": self.member.id, "assigned": 0, "in_progress": 0, "done": 0})
+        self.assertEqual(workloads[other.id], {"member": other.id, "assigned": 0, "in_progress": 0, "done": 1})
+
+        self.assignment.delete()
+        self.assertEqual(MemberWorkload.objects.get(member=other).done, 0)
+
+    def test_rebuild_matches_incremental(self):
+        lifecycle.created(self.team.id, [self.assignment])
+        lifecycle.apply(self.assignment, {"status": "in_progress"}, now=self.now - timedelta(minutes=30))
+        lifecycle.apply(self.assignment, {"status": "done"}, now=self.now)
+        incremental = self._aggregate()
+        workloads = list(MemberWorkload.objects.values())
+        TeamCycleTime.objects.all().delete()
+        MemberWorkload.objects.all().delete()
+        lifecycle.rebuild_cycle_times()
+        lifecycle.rebuild_workloads()
+        self.assertEqual(self._aggregate(), incremental)
+        self.assertEqual(list(MemberWorkload.objects.values()), workloads)
+
+    def test_transition_history_endpoint(self):
+        lifecycle.created(self.team.id, [self.assignment])
+        lifecycle.apply(self.assignment, {"status": "in_progress"}, changed_by=self.member)
+        lifecycle.apply(self.assignment, {"status": "done"}, changed_by=self.member)
+        url = reverse("tasks:task_assignment_transitions", kwargs={"pk": self.assignment.id})
+
+        self.client.force_authenticate(self.admin_user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        history = [("", "assigned"), ("assigned", "in_progress"), ("in_progress", "done")]
+        self.assertEqual([(row["from_status"], row["to_status"]) for row in response.data["data"]], history)
+
+        # oldest first across pages too
+        rows = []
+        response = self.client.get(url, {"page_size": 2})
+        while True:
+            rows += [(row["from_status"], row["to_status"]) for row in response.data["data"]]
+            if not response.data["pagination"]["next"]:
+                break
+            response = self.client.get(response.data["pagination"]["next"])
+        self.assertEqual(rows, history)
+
+        self.client.force_authenticate(UserFactory())
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_history_is_append_only(self):
+        lifecycle.apply(self.assignment, {"status": "in_progress"})
+        transition = self.assignment.transitions.get()
+        transition.to_status = "done"
+        with self.assertRaises(ValueError):
+            transition.save()
+
+
+@skipUnlessDBFeature("has_select_for_update")
+class ConcurrentTransitionTestCase(TransactionTestCase):
+
+    def setUp(self):
+        team = Team.objects.create(title="Team")
+        self.member = TeamMember.objects.create(team=team, user=UserFactory(), role="member")
+        task = Task.objects.create(title="Task", team=team, created_by=self.member)
+        self.assignment = TaskAssignment.objects.create(task=task, member=self.member)
+        lifecycle.created(team.id, [self.assignment])
+
+    def test_concurrent_completions_are_applied_once(self):
+        barrier = threading.Barrier(2, timeout=1)
+        add_workloads = lifecycle._add_workloads
+
+        def add_workloads_together(*args, **kwargs):
+            # without the row lock both writers get here before either commits
+            try:
+                barrier.wait()
+            except threading.BrokenBarrierError:
+                pass
+            add_workloads(*args, **kwargs)
+
+        errors = []
+
+        def complete():
+            try:
+                lifecycle.apply(TaskAssignment.objects.get(pk=self.assignment.pk), {"status": "done"})
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        with patch.object(lifecycle, "_add_workloads", add_workloads_together):
+            threads = [threading.Thread(target=complete) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self.assignment.transitions.count(), 2)
+        workload = MemberWorkload.objects.get(member=self.member)
+        self.assertEqual((workload.assigned, workload.done), (0, 1))
+        self.assertEqual(sum(TeamCycleTime.objects.values_list("completed", flat=True)), 1)
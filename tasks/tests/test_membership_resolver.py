@@ -0,0 +1,80 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.tests.factories import UserFactory
+from teams.models import Team, TeamMember
+from teams.services import MembershipResolver
+from tasks.models import Task, TaskAssignment, TaskNote
+
+
+def team_member_queries(context):
+    table = TeamMember._meta.db_table
+    return [q["sql"] for q in context.captured_queries if f'FROM "{table}"' in q["sql"]]
+
+
+class MembershipResolverTestCase(TestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.owned = Team.objects.create(title="Owned")
+        self.joined = Team.objects.create(title="Joined")
+        TeamMember.objects.create(team=self.owned, user=self.user, role="owner")
+        TeamMember.objects.create(team=self.joined, user=self.user, role="member")
+
+    def test_roles_are_loaded_with_one_query(self):
+        resolver = MembershipResolver(self.user)
+        with self.assertNumQueries(1):
+            self.assertEqual(resolver.role(self.owned.id), "owner")
+            self.assertEqual(resolver.role(str(self.joined.id)), "member")
+            self.assertIsNone(resolver.role(0))
+            self.assertTrue(resolver.is_admin(self.owned.id))
+            self.assertFalse(resolver.is_admin(self.joined.id))
+            self.assertEqual(resolver.team_ids(), {self.owned.id, self.joined.id})
+            self.assertEqual(resolver.admin_team_ids(), {self.owned.id})
+
+    def test_memberships_are_cached_until_a_membership_changes(self):
+        MembershipResolver(self.user).memberships
+        with self.assertNumQueries(0):
+            self.assertEqual(MembershipResolver(self.user).role(self.joined.id), "member")
+
+        TeamMember.objects.filter(team=self.joined, user=self.user).get().delete()
+        with self.assertNumQueries(1):
+            self.assertFalse(MembershipResolver(self.user).is_member(self.joined.id))
+
+        TeamMember.objects.create(team=self.joined, user=self.user, role="admin")
+        self.assertTrue(MembershipResolver(self.user).is_admin(self.joined.id))
+
+
+class MembershipResolverRequestTestCase(APITestCase):
+
+    def setUp(self):
+        self.admin_user = UserFactory()
+        self.member_user = UserFactory()
+        self.team = Team.objects.create(title="Team")
+        admin = TeamMember.objects.create(team=self.team, user=self.admin_user, role="admin")
+        member = TeamMember.objects.create(team=self.team, user=self.member_user, role="member")
+
+        self.task = Task.objects.create(title="Task", team=self.team, created_by=admin)
+        self.assignment = TaskAssignment.objects.create(task=self.task, member=member)
+        self.note = TaskNote.objects.create(
+            task=self.task, assignment=self.assignment, author=member, content="note"
+        )
+
+    def test_note_retrieve_loads_memberships_once(self):
+        self.client.force_authenticate(user=self.admin_user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("tasks:task_note_detail", kwargs={"pk": self.note.id}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(team_member_queries(context)), 1)
+
+    def test_task_retrieve_loads_memberships_once(self):
+        self.client.force_authenticate(user=self.admin_user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("tasks:task", kwargs={"pk": self.task.id}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(team_member_queries(context)), 1)
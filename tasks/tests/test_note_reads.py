@@ -0,0 +1,117 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.tests.factories import UserFactory
+from teams.models import Team, TeamMember
+from tasks.models import Task, TaskAssignment, TaskNote, TaskNoteUnreadCounter
+from tasks.services.note_reads import rebuild_unread_counters
+
+
+class TaskNoteReadsTestCase(APITestCase):
+
+    def setUp(self):
+        self.admin_user = UserFactory()
+        self.member_user = UserFactory()
+        self.team = Team.objects.create(title="Team")
+        self.admin = TeamMember.objects.create(team=self.team, user=self.admin_user, role="admin")
+        self.member = TeamMember.objects.create(team=self.team, user=self.member_user, role="member")
+        self.task = Task.objects.create(title="Task", team=self.team, created_by=self.admin)
+        self.assignment = TaskAssignment.objects.create(task=self.task, member=self.member)
+
+        self.admin_notes = [
+            TaskNote.objects.create(task=self.task, assignment=self.assignment, author=self.admin, content=f"a{n}")
+            for n in range(5)
+        ]
+        self.member_notes = [
+            TaskNote.objects.create(task=self.task, assignment=self.assignment, author=self.member, content=f"m{n}")
+            for n in range(3)
+        ]
+        self.read_url = reverse("tasks:task_notes_read", kwargs={"task_id": self.task.id})
+        self.unread_url = reverse("tasks:task_notes_unread", kwargs={"task_id": self.task.id})
+
+    def _counter(self, reader):
+        return TaskNoteUnreadCounter.objects.get(assignment=self.assignment, reader=reader).unread
+
+    def test_counters_follow_note_writes(self):
+        self.assertEqual(self._counter("member"), 5)
+        self.assertEqual(self._counter("admins"), 3)
+
+        self.member_notes[0].delete()
+        self.assertEqual(self._counter("admins"), 2)
+
+    def test_unread_counts(self):
+        self.client.force_authenticate(self.member_user)
+        response = self.client.get(self.unread_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["data"],
+            {"unread": 5, "assignments": [{"assignment": self.assignment.id, "unread": 5}]},
+        )
+
+        self.client.force_authenticate(self.admin_user)
+        self.assertEqual(self.client.get(self.unread_url).data["data"]["unread"], 3)
+
+    def test_mark_read_up_to_single_update(self):
+        self.client.force_authenticate(self.member_user)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.post(self.read_url, {"up_to": self.admin_notes[2].id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["marked"], 3)
+        self.assertEqual(response.data["data"]["unread"], 2)
+
+        note_updates = [
+            query for query in captured.captured_queries
+            if query["sql"].startswith(f'UPDATE "{TaskNote._meta.db_table}" ')
+        ]
+        self.assertEqual(len(note_updates), 1)
+
+        read = set(TaskNote.objects.filter(is_read=True).values_list("id", flat=True))
+        self.assertEqual(read, {note.id for note in self.admin_notes[:3]})
+        self.assertEqual(self._counter("member"), 2)
+        self.assertEqual(self._counter("admins"), 3)  # the other side is untouched
+
+    def test_mark_all_read(self):
+        self.client.force_authenticate(self.admin_user)
+        response = self.client.post(self.read_url, {}, format="json")
+        self.assertEqual(response.data["data"]["marked"], 3)
+        self.assertEqual(self._counter("admins"), 0)
+        self.assertFalse(TaskNote.objects.filter(author=self.member, is_read=False).exists())
+
+    def test_retrieve_marks_read_once(self):
+        self.client.force_authenticate(self.member_user)
+        url = reverse("tasks:task_note_detail", kwargs={"pk": self.admin_notes[0].id})
+
+        self.assertTrue(self.client.get(url).data["data"]["is_read"])
+        self.assertEqual(self._counter("member"), 4)
+
+        # already read: no further write, counter unchanged
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(url)
+        self.assertFalse(any(query["sql"].startswith("UPDATE") for query in captured.captured_queries))
+        self.assertEqual(self._counter("member"), 4)
+
+    def test_retrieve_without_marking(self):
+        self.client.force_authenticate(self.member_user)
+        url = reverse("tasks:task_note_detail", kwargs={"pk": self.admin_notes[0].id})
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url, {"mark_read": "false"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["data"]["is_read"])
+        self.assertFalse(any(query["sql"].startswith("UPDATE") for query in captured.captured_queries))
+        self.assertEqual(self._counter("member"), 5)
+
+    def test_outsider_forbidden(self):
+        self.client.force_authenticate(UserFactory())
+        self.assertEqual(self.client.get(self.unread_url).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.post(self.read_url, {}, format="json").status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_rebuild(self):
+        TaskNote.objects.bulk_create([
+            TaskNote(task=self.task, assignment=self.assignment, author=self.admin, content="bulk")
+        ])
+        TaskNoteUnreadCounter.objects.all().delete()
+        rebuild_unread_counters()
+        self.assertEqual(self._counter("member"), 6)
+        self.assertEqual(self._counter("admins"), 3)
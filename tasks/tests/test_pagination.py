@@ -0,0 +1,113 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.tests.factories import UserFactory
+from teams.models import Team, TeamMember
+from tasks.models import Task, TaskAssignment, TaskNote
+
+
+@override_settings(API_PAGE_SIZE=5, API_MAX_PAGE_SIZE=10)
+class TaskListPaginationTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.team = Team.objects.create(title="Team")
+        self.owner = TeamMember.objects.create(team=self.team, user=self.user, role="owner")
+        Task.objects.bulk_create([
+            Task(
+                title=f"Task {i}",
+                team=self.team,
+                created_by=self.owner,
+                status="cancelled" if i % 4 == 0 else "active",
+            )
+            for i in range(23)
+        ])
+        self.url = reverse("tasks:team_tasks", kwargs={"team_id": self.team.id})
+        self.client.force_authenticate(self.user)
+
+    def test_pages_cover_all_tasks_once(self):
+        ids, url, pages = [], self.url, 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(task["id"] for task in response.data["data"])
+            pagination = response.data["pagination"]
+            self.assertEqual(pagination["has_more"], pagination["next"] is not None)
+            url, pages = pagination["next"], pages + 1
+
+        self.assertEqual(pages, 5)
+        self.assertEqual(ids, sorted(Task.objects.values_list("id", flat=True), reverse=True))
+
+    def test_page_size_is_capped(self):
+        response = self.client.get(self.url, {"page_size": 1000})
+        self.assertEqual(len(response.data["data"]), 10)
+        self.assertTrue(response.data["pagination"]["has_more"])
+
+    def test_filter_by_status(self):
+        response = self.client.get(self.url, {"status": "cancelled", "page_size": 10})
+        self.assertEqual(len(response.data["data"]), 6)
+        self.assertFalse(response.data["pagination"]["has_more"])
+        self.assertTrue(all(task["status"] == "cancelled" for task in response.data["data"]))
+
+        response = self.client.get(self.url, {"status": "cancelled,active", "page_size": 10})
+        self.assertEqual(len(response.data["data"]), 10)
+
+    def test_invalid_filter_value_is_rejected(self):
+        response = self.client.get(self.url, {"status": "archived"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.data["success"])
+        self.assertIsNone(response.data["data"])
+        self.assertEqual(response.data["error"]["code"], "TASK_001017")
+        self.assertIn("status", response.data["error"]["detail"])
+
+        response = self.client.get(self.url, {"is_team_task": "maybe"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("is_team_task", response.data["error"]["detail"])
+
+
+@override_settings(API_PAGE_SIZE=2)
+class TaskChildListPaginationTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.team = Team.objects.create(title="Team")
+        self.owner = TeamMember.objects.create(team=self.team, user=self.user, role="owner")
+        self.task = Task.objects.create(title="Task", team=self.team, created_by=self.owner)
+        members = [
+            TeamMember.objects.create(team=self.team, user=UserFactory(), role="member")
+            for _ in range(3)
+        ]
+        TaskAssignment.objects.bulk_create([
+            TaskAssignment(task=self.task, member=member, status="done" if i == 0 else "assigned")
+            for i, member in enumerate(members)
+        ])
+        # owners see the notes written by members
+        TaskNote.objects.bulk_create([
+            TaskNote(task=self.task, author=members[0], content=f"note {i}", is_read=i < 2)
+            for i in range(3)
+        ])
+        self.client.force_authenticate(self.user)
+
+    def test_assignments_are_paginated_and_filterable(self):
+        url = reverse("tasks:task_assignments", kwargs={"task_id": self.task.id})
+        response = self.client.get(url)
+        self.assertEqual(len(response.data["data"]), 2)
+        self.assertTrue(response.data["pagination"]["has_more"])
+
+        response = self.client.get(url, {"status": "done"})
+        self.assertEqual([a["status"] for a in response.data["data"]], ["done"])
+
+    def test_notes_are_paginated_and_filterable(self):
+        url = reverse("tasks:task_notes", kwargs={"task_id": self.task.id})
+        response = self.client.get(url)
+        self.assertEqual([n["content"] for n in response.data["data"]], ["note 2", "note 1"])
+        self.assertTrue(response.data["pagination"]["has_more"])
+
+        response = self.client.get(url, {"is_read": "false"})
+        self.assertEqual([n["content"] for n in response.data["data"]], ["note 2"])
+        self.assertFalse(response.data["pagination"]["has_more"])
+
+        response = self.client.get(url, {"is_read": "maybe"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"]["code"], "TASK_003004")
@@ -0,0 +1,113 @@
+import logging
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.tests.factories import UserFactory
+from teams.models import Team, TeamMember
+from tasks.models import Task, TaskAssignment, TaskNote, TeamCycleTime
+from tasks.views import TaskViewSet
+from utils.profiling import QueryBudget, QueryBudgetExceeded
+
+
+@override_settings(REQUEST_PROFILING_ENABLED=True, QUERY_BUDGET_MODE="raise")
+class QueryBudgetTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.team = Team.objects.create(title="Team")
+        self.owner = TeamMember.objects.create(team=self.team, user=self.user, role="owner")
+        self.client.force_authenticate(self.user)
+
+    def _populate(self, tasks: int, members: int):
+        assignees = [
+            TeamMember.objects.create(team=self.team, user=UserFactory(), role="member")
+            for _ in range(members)
+        ]
+        for n in range(tasks):
+            task = Task.objects.create(title=f"Task {n}", team=self.team, created_by=self.owner)
+            for member in assignees:
+                assignment = TaskAssignment.objects.create(task=task, member=member)
+                TaskNote.objects.create(task=task, assignment=assignment, author=member, content="note")
+        return task
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse("tasks:team_tasks", kwargs={"team_id": self.team.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r'sql;dur=[\d.]+;desc="3 queries"')
+        self.assertRegex(timing, r'mongo;dur=[\d.]+;desc="0 commands"')
+        self.assertRegex(timing, r"total;dur=[\d.]+")
+
+    def test_list_endpoints_stay_within_budget_as_data_grows(self):
+        task = self._populate(tasks=15, members=6)
+        urls = [
+            reverse("tasks:team_tasks", kwargs={"team_id": self.team.id}),
+            reverse("tasks:team_dashboard", kwargs={"team_id": self.team.id}),
+            reverse("teams:team-analytics", kwargs={"pk": self.team.id}),
+            reverse("tasks:task_assignments", kwargs={"task_id": task.id}),
+            reverse("tasks:task_notes", kwargs={"task_id": task.id}),
+            reverse("teams:team-my-teams"),
+            reverse("teams:membership_request_list"),
+        ]
+        for url in urls:
+            # raises QueryBudgetExceeded on an N+1
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK, url)
+
+    def test_assignment_writes_stay_within_budget(self):
+        member_user = UserFactory()
+        member = TeamMember.objects.create(team=self.team, user=member_user, role="member")
+        other = TeamMember.objects.create(team=self.team, user=UserFactory(), role="member")
+        task = Task.objects.create(title="Task", team=self.team, created_by=self.owner)
+
+        # budgets are checked with cold membership caches
+        # creating a done assignment also opens the day's cycle-time row
+        cache.clear()
+        response = self.client.post(
+            reverse("tasks:task_assignments", kwargs={"task_id": task.id}),
+            {"member": member.id, "status": "done"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        url = reverse("tasks:task_assignment_detail", kwargs={"pk": response.data["data"]["id"]})
+
+        self.client.force_authenticate(member_user)
+        for changes in ({"status": "in_progress"}, {"status": "done"}, {"status": "in_progress"}):
+            cache.clear()
+            self.assertEqual(self.client.patch(url, changes, format="json").status_code, status.HTTP_200_OK)
+
+        # reassigning and finishing on a new day: new workload row, new cycle-time row
+        self.client.force_authenticate(self.user)
+        TeamCycleTime.objects.all().delete()
+        cache.clear()
+        response = self.client.patch(url, {"member": other.id, "status": "done"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        TeamCycleTime.objects.all().delete()
+        cache.clear()
+        response = self.client.post(
+            reverse("tasks:team_assignments_bulk", kwargs={"team_id": self.team.id}),
+            {"items": [{"task": task.id, "member": self.owner.id, "status": "done"}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_exceeding_budget_raises(self):
+        with mock.patch.object(TaskViewSet.list, "_query_budget", QueryBudget(sql=1)):
+            with self.assertRaisesMessage(QueryBudgetExceeded, "TaskViewSet.list issued 3 SQL queries (budget 1)"):
+                self.client.get(reverse("tasks:team_tasks", kwargs={"team_id": self.team.id}))
+
+    @override_settings(QUERY_BUDGET_MODE="log")
+    def test_exceeding_budget_logs_in_log_mode(self):
+        with mock.patch.object(TaskViewSet.list, "_query_budget", QueryBudget(sql=1)):
+            with self.assertLogs("utils.profiling", level=logging.WARNING):
+                response = self.client.get(reverse("tasks:team_tasks", kwargs={"team_id": self.team.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(REQUEST_PROFILING_ENABLED=False)
+    def test_disabled(self):
+        response = self.client.get(reverse("tasks:team_tasks", kwargs={"team_id": self.team.id}))
+        self.assertNotIn("Server-Timing", response)
@@ -0,0 +1,48 @@
+import random
+
+from django.db.models import F
+from django.test import TestCase
+from users.models import Profile, User
+from teams.models import TeamMember
+from tasks.models import Task, TaskAssignment
+from chats.models import ChatMember
+from utils.seed import DataSeeder, SeedConfig, parse_distribution, sample_fixture
+
+
+class DistributionTestCase(TestCase):
+
+    def test_specs(self):
+        rng = random.Random(1)
+        self.assertEqual(parse_distribution("7")(rng), 7)
+        self.assertTrue(all(3 <= parse_distribution("uniform:3-5")(rng) <= 5 for _ in range(50)))
+        samples = [parse_distribution("pareto:20")(rng) for _ in range(5000)]
+        self.assertLess(abs(sum(samples) / len(samples) - 20), 6)
+        self.assertGreater(max(samples), 60)  # heavy tail
+
+    def test_invalid_spec(self):
+        for spec in ("normal:3", "uniform:3", "pareto:x", ""):
+            with self.assertRaises(ValueError):
+                parse_distribution(spec)
+
+
+class DataSeederTestCase(TestCase):
+
+    def test_seeds_consistent_dataset(self):
+        config = SeedConfig(users=30, teams=4, team_size="uniform:3-8", tasks_per_team="5", assignees_per_task="2")
+        counts = DataSeeder(config).run()
+
+        self.assertEqual(User.objects.count(), 30)
+        self.assertEqual(Profile.objects.count(), 30)
+        self.assertEqual(Task.objects.count(), 20)
+        self.assertEqual(counts["tasks"], 20)
+        self.assertEqual(counts["assignments"], 40)
+        self.assertEqual(ChatMember.objects.count(), TeamMember.objects.count())
+        # assignees always belong to the task's team
+        self.assertFalse(
+            TaskAssignment.objects.exclude(member__team_id=F("task__team_id")).exists()
+        )
+
+        sample = sample_fixture()
+        self.assertTrue(sample.admin.role in ("owner", "admin"))
+        self.assertEqual(sample.task.team_id, sample.team.id)
+        self.assertEqual(sample.chat.members.filter(user=sample.admin_user).count(), 1)
@@ -3,7 +3,7 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 from users.tests.factories import UserFactory
 from teams.models import Team, TeamMember
-from tasks.models import Task, TaskAssignment
+from tasks.models import MemberWorkload, Task, TaskAssignment
 
 
 class TaskAssignmentViewSetTestCase(APITestCase):
@@ -136,6 +136,36 @@ class TaskAssignmentViewSetTestCase(APITestCase):
         response = self.client.patch(self.detail_url(self.assignment_member.id), data, format="json")
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
+    def test_member_of_another_team_cannot_be_assigned(self):
+        outsider = TeamMember.objects.create(
+            team=Team.objects.create(title="Other Team"), user=self.non_member_user, role="member"
+        )
+        self.client.force_authenticate(user=self.owner_user)
+        response = self.client.post(self.list_create_url, {"member": outsider.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("member", response.data["error"]["detail"])
+
+        response = self.client.patch(
+            self.detail_url(self.assignment_member.id), {"member": outsider.id}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.task.assignments.get().member.user, self.member_user)
+        self.assertFalse(MemberWorkload.objects.filter(member=outsider).exists())
+
+    def test_only_admins_reassign(self):
+        admin = TeamMember.objects.get(team=self.team, user=self.admin_user)
+        self.client.force_authenticate(user=self.member_user)
+        response = self.client.patch(self.detail_url(self.assignment_member.id), {"member": admin.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assignment_member.refresh_from_db()
+        self.assertEqual(self.assignment_member.member.user, self.member_user)
+
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.patch(self.detail_url(self.assignment_member.id), {"member": admin.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assignment_member.refresh_from_db()
+        self.assertEqual(self.assignment_member.member, admin)
+
     def test_unauthenticated_user_cannot_access(self):
         self.client.logout()
         # List
@@ -8,6 +8,12 @@ urlpatterns = [
         "get": "list",
         "post": "create",
     }), name="task_notes"),
+    path("tasks/<int:task_id>/notes/read/", TaskNoteViewSet.as_view({
+        "post": "mark_read",
+    }), name="task_notes_read"),
+    path("tasks/<int:task_id>/notes/unread/", TaskNoteViewSet.as_view({
+        "get": "unread",
+    }), name="task_notes_unread"),
 
     path("notes/<int:pk>/", TaskNoteViewSet.as_view({
         "get": "retrieve",
@@ -22,10 +28,22 @@ urlpatterns = [
         "get": "retrieve",
         "patch": "partial_update",
     }), name="task_assignment_detail"),
+    path("assignments/<int:pk>/transitions/", TaskAssignmentViewSet.as_view({
+        "get": "transitions",
+    }), name="task_assignment_transitions"),
     path("teams/<int:team_id>/", TaskViewSet.as_view({
         "get": "list",
         "post": "create",
     }), name="team_tasks"),
+    path("teams/<int:team_id>/bulk/", TaskViewSet.as_view({
+        "post": "bulk_create",
+    }), name="team_tasks_bulk"),
+    path("teams/<int:team_id>/assignments/bulk/", TaskAssignmentViewSet.as_view({
+        "post": "bulk_create",
+    }), name="team_assignments_bulk"),
+    path("teams/<int:team_id>/dashboard/", TaskViewSet.as_view({
+        "get": "dashboard",
+    }), name="team_dashboard"),
     path("<int:pk>/", TaskViewSet.as_view({
         "get": "retrieve",
         "patch": "partial_update",
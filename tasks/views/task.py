@@ -3,11 +3,20 @@ from rest_framework import status
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
 from tasks.models import Task
-from tasks.serializers import TaskSerializer
+from tasks.serializers import (
+    BulkRequestSerializer,
+    BulkResultSerializer,
+    TaskSerializer,
+    TeamDashboardSerializer,
+)
+from tasks.services import TeamDashboard, bulk_create_tasks
 from tasks.permissions import IsTaskTeamOwnerOrAdmin,IsTeamOwnerOrAdmin
 from teams.models import Team
+from teams.services import get_membership_resolver
 from users.permissions import IsAuthenticated
+from utils.filters import InvalidFilter
 from utils.response import success_response, error_response
+from utils.profiling import query_budget
 from tasks.errors.loader import get_error
 
 
@@ -16,19 +25,21 @@ class TaskViewSet(ModelViewSet):
     Task management API.
 
     This ViewSet provides APIs to:
-    - Create tasks for a team
+    - Create tasks for a team, one at a time or in bulk
     - List tasks of a team
     - Retrieve task details
     - Partially update a task
+    - Read the team's task dashboard
 
     Access Rules:
     - Only authenticated users can access the endpoints
-    - Only team owners or admins can create or list tasks
+    - Only team owners or admins can create or list tasks, or read the dashboard
     - Only team owners or admins can retrieve or update a task
     """
 
     serializer_class = TaskSerializer
     permission_classes = (IsAuthenticated,)
+    filter_fields = {"status": "status", "is_team_task": "is_team_task"}
 
     def get_queryset(self):
         """
@@ -36,8 +47,8 @@ class TaskViewSet(ModelViewSet):
         Prevents unauthorized access to tasks of other teams.
         """
         return Task.objects.filter(
-            team__members__user=self.request.user
-        ).select_related("team").distinct()
+            team_id__in=get_membership_resolver(self.request).team_ids()
+        ).select_related("team")
 
     def get_permissions(self):
         """
@@ -47,7 +58,7 @@ class TaskViewSet(ModelViewSet):
 
         if self.action in ["retrieve", "partial_update"]:
             permissions.append(IsTaskTeamOwnerOrAdmin())
-        elif self.action in ["create", "list"]:
+        elif self.action in ["create", "bulk_create", "list", "dashboard"]:
             permissions.append(IsTeamOwnerOrAdmin())
 
         return permissions
@@ -75,6 +86,7 @@ class TaskViewSet(ModelViewSet):
             ),
         },
     )
+    @query_budget(4)
     def create(self, request, *args, **kwargs):
         team_id = self.kwargs.get("team_id")
 
@@ -96,7 +108,7 @@ class TaskViewSet(ModelViewSet):
         if serializer.is_valid():
             serializer.save(
                 team=team,
-                created_by=team.members.get(user=request.user)
+                created_by=get_membership_resolver(request).membership(team.id)
             )
             return success_response(
                 serializer.data,
@@ -108,6 +120,51 @@ class TaskViewSet(ModelViewSet):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+    @extend_schema(
+        summary="Create tasks in bulk",
+        description=(
+            "Validate a batch of tasks for a team and insert the valid ones in one "
+            "transaction. Each item gets its own result (id and data, or errors). "
+            "With `atomic`, nothing is created unless every item is valid. "
+            "Only team owners or administrators are allowed to create tasks."
+        ),
+        request=BulkRequestSerializer,
+        responses={
+            201: OpenApiResponse(
+                description="Valid items created",
+                response=BulkResultSerializer
+            ),
+            400: OpenApiResponse(
+                description="Malformed request, or no item could be created"
+            ),
+            403: OpenApiResponse(
+                description="Permission denied"
+            ),
+        },
+    )
+    @query_budget(6)
+    def bulk_create(self, request, *args, **kwargs):
+        envelope = BulkRequestSerializer(data=request.data)
+        if not envelope.is_valid():
+            return error_response(
+                error_dict=get_error("TASK_001014", details=envelope.errors),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        team_id = self.kwargs["team_id"]
+        result = bulk_create_tasks(
+            team_id,
+            get_membership_resolver(request).membership(team_id),
+            envelope.validated_data["items"],
+            atomic=envelope.validated_data["atomic"],
+        )
+        if not result.created:
+            return error_response(
+                error_dict=get_error("TASK_001015", details=result.results),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return success_response(result.as_dict(), status=status.HTTP_201_CREATED)
+
     @extend_schema(
         summary="List team tasks",
         description=(
@@ -119,6 +176,9 @@ class TaskViewSet(ModelViewSet):
                 description="Tasks retrieved successfully",
                 response=TaskSerializer(many=True)
             ),
+            400: OpenApiResponse(
+                description="Invalid filter value"
+            ),
             403: OpenApiResponse(
                 description="Permission denied"
             ),
@@ -127,6 +187,7 @@ class TaskViewSet(ModelViewSet):
             ),
         },
     )
+    @query_budget(4)
     def list(self, request, *args, **kwargs):
         team_id = self.kwargs.get("team_id")
 
@@ -144,9 +205,16 @@ class TaskViewSet(ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        tasks = team.tasks.all()
-        serializer = self.get_serializer(tasks, many=True)
-        return success_response(serializer.data)
+        try:
+            queryset = self.filter_queryset(team.tasks.all())
+        except InvalidFilter as exc:
+            return error_response(
+                error_dict=get_error(key="TASK_001017", details=exc.detail),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @extend_schema(
         summary="Retrieve task details",
@@ -167,6 +235,7 @@ class TaskViewSet(ModelViewSet):
             ),
         },
     )
+    @query_budget(3)
     def retrieve(self, request, *args, **kwargs):
         task = self.get_object()
         serializer = self.get_serializer(task)
@@ -195,6 +264,7 @@ class TaskViewSet(ModelViewSet):
             ),
         },
     )
+    @query_budget(4)
     def partial_update(self, request, *args, **kwargs):
         task = self.get_object()
         serializer = self.get_serializer(
@@ -211,3 +281,25 @@ class TaskViewSet(ModelViewSet):
             error_dict=get_error("TASK_001003", details=serializer.errors),
             status=status.HTTP_400_BAD_REQUEST
         )
+
+    @extend_schema(
+        summary="Team task dashboard",
+        description=(
+            "All tasks of a team with their assignment counts by status, average "
+            "progress and an overdue flag, plus team-wide totals. Served from a "
+            "per-team cache that task and assignment writes invalidate. "
+            "Only team owners or administrators can access this endpoint."
+        ),
+        responses={
+            200: OpenApiResponse(
+                description="Dashboard retrieved successfully",
+                response=TeamDashboardSerializer
+            ),
+            403: OpenApiResponse(
+                description="Permission denied"
+            ),
+        },
+    )
+    @query_budget(3)
+    def dashboard(self, request, *args, **kwargs):
+        return success_response(TeamDashboard.build(self.kwargs["team_id"]))
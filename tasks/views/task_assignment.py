@@ -1,26 +1,53 @@
+from django.db import transaction
 from rest_framework.viewsets import ModelViewSet
 from rest_framework import status
 from rest_framework.exceptions import PermissionDenied
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 from tasks.models import TaskAssignment, Task
-from tasks.serializers import TaskAssignmentSerializer
+from tasks.serializers import (
+    BulkRequestSerializer,
+    BulkResultSerializer,
+    TaskAssignmentSerializer,
+    TaskAssignmentTransitionSerializer,
+)
+from tasks.permissions import IsTeamOwnerOrAdmin
+from tasks.services import bulk_create_assignments, lifecycle
+from utils.filters import InvalidFilter
+from utils.pagination import EnvelopeCursorPagination
 from utils.response import success_response, error_response
+from utils.profiling import query_budget
 from tasks.errors.loader import get_error
-from teams.models import TeamMember
+from teams.services import get_membership_resolver
 from users.permissions import IsAuthenticated
 
 
+class TransitionPagination(EnvelopeCursorPagination):
+    # history reads oldest first
+    ordering = ("created_at", "id")
+
+
 class TaskAssignmentViewSet(ModelViewSet):
     """
     TaskAssignment CRUD operations.
 
     Permissions:
     - Only task owner/admin or assigned member can view or update the assignment.
-    - Only task owner/admin can create new assignments for a task.
+    - Only task owner/admin can create new assignments for a task or move an
+      assignment to another member; the member must belong to the task's team.
+    - Only team owner/admin can create assignments in bulk.
+    - Status changes follow tasks.services.lifecycle, which stamps
+      started_at/completed_at and records each transition.
     """
 
     serializer_class = TaskAssignmentSerializer
     permission_classes = (IsAuthenticated,)
+    filter_fields = {"status": "status"}
+
+    def get_permissions(self):
+        permissions = super().get_permissions()
+        if self.action == "bulk_create":
+            permissions.append(IsTeamOwnerOrAdmin())
+        return permissions
 
     def get_queryset(self):
         """
@@ -39,42 +66,62 @@ class TaskAssignmentViewSet(ModelViewSet):
             except Task.DoesNotExist:
                 return TaskAssignment.objects.none()
 
-            try:
-                membership = TeamMember.objects.get(team=task.team, user=user)
-            except TeamMember.DoesNotExist:
+            resolver = get_membership_resolver(self.request)
+            if not resolver.is_member(task.team_id):
                 # Non-member sees nothing
                 return TaskAssignment.objects.none()
 
-            if membership.role in ("owner", "admin"):
+            if resolver.is_admin(task.team_id):
                 return qs.filter(task=task)
             else:
                 # Only assigned member can see their own assignment
                 return qs.filter(task=task, member__user=user)
 
-        return qs
+        # detail routes check access through the task and member
+        return qs.select_related("task", "member")
+
+    def get_task(self):
+        """
+        Task of the task_id route, loaded once per request; None if missing.
+        """
+        if not hasattr(self, "_task"):
+            task_id = self.kwargs.get("task_id")
+            self._task = Task.objects.filter(id=task_id).first() if task_id else None
+        return self._task
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == "create" and self.get_task() is not None:
+            # new assignments take members of the task's team only
+            context["team_id"] = self.get_task().team_id
+        return context
 
     def perform_create(self, serializer):
         """
         Only task owner/admin can create assignment
         """
-        task_id = self.kwargs.get("task_id")
-        if not task_id:
+        if not self.kwargs.get("task_id"):
             raise PermissionDenied("task_id is required.")
 
-        try:
-            task = Task.objects.get(id=task_id)
-        except Task.DoesNotExist:
+        task = self.get_task()
+        if task is None:
             raise PermissionDenied("Task not found.")
 
-        try:
-            membership = TeamMember.objects.get(team=task.team, user=self.request.user)
-        except TeamMember.DoesNotExist:
+        resolver = get_membership_resolver(self.request)
+        if not resolver.is_member(task.team_id):
             raise PermissionDenied("You are not a member of this task's team.")
 
-        if membership.role not in ("owner", "admin"):
+        if not resolver.is_admin(task.team_id):
             raise PermissionDenied("Only team owner or admin can create assignment.")
 
-        serializer.save(task=task)
+        with transaction.atomic():
+            assignment = serializer.save(
+                task=task,
+                **lifecycle.initial_fields(
+                    serializer.validated_data.get("status", lifecycle.ASSIGNED), due_date=task.due_date,
+                ),
+            )
+            lifecycle.created(task.team_id, [assignment], changed_by=resolver.membership(task.team_id))
 
     def get_object(self):
         """
@@ -84,12 +131,7 @@ class TaskAssignmentViewSet(ModelViewSet):
         user = self.request.user
 
         # Owner/Admin of the task team can access all
-        try:
-            membership = TeamMember.objects.get(team=obj.task.team, user=user)
-        except TeamMember.DoesNotExist:
-            membership = None
-
-        if membership and membership.role in ("owner", "admin"):
+        if get_membership_resolver(self.request).is_admin(obj.task.team_id):
             return obj
 
         # Only assigned member can access their assignment
@@ -103,16 +145,25 @@ class TaskAssignmentViewSet(ModelViewSet):
         description="List all assignments of a task. Owner/Admin sees all; members see only their assignment.",
         responses={200: TaskAssignmentSerializer(many=True)}
     )
+    @query_budget(4)
     def list(self, request, *args, **kwargs):
-        assignments = self.get_queryset()
-        serializer = self.get_serializer(assignments, many=True)
-        return success_response(serializer.data)
+        try:
+            queryset = self.filter_queryset(self.get_queryset())
+        except InvalidFilter as exc:
+            return error_response(
+                error_dict=get_error(key="TASK_001017", details=exc.detail),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @extend_schema(
         summary="Retrieve a specific assignment",
         description="Retrieve assignment details if you have access.",
         responses={200: TaskAssignmentSerializer()}
     )
+    @query_budget(4)
     def retrieve(self, request, *args, **kwargs):
         assignment = self.get_object()
         serializer = self.get_serializer(assignment)
@@ -120,10 +171,12 @@ class TaskAssignmentViewSet(ModelViewSet):
 
     @extend_schema(
         summary="Create a new assignment for a task",
-        description="Only team owner/admin can create an assignment.",
+        description="Only team owner/admin can create an assignment, for a member of the task's team.",
         request=TaskAssignmentSerializer,
         responses={201: TaskAssignmentSerializer(), 403: OpenApiResponse(description="Permission denied")}
     )
+    # worst case: a done assignment opening its team's cycle-time row for the day
+    @query_budget(12)
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
@@ -134,19 +187,101 @@ class TaskAssignmentViewSet(ModelViewSet):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+    @extend_schema(
+        summary="Create assignments in bulk",
+        description=(
+            "Assign members to tasks of a team in one request. Every task and member "
+            "must belong to the team and a member can be assigned to a task once. "
+            "Valid items are inserted in one transaction and each item gets its own "
+            "result; with `atomic`, nothing is created unless every item is valid. "
+            "Only team owner/admin."
+        ),
+        request=BulkRequestSerializer,
+        responses={
+            201: BulkResultSerializer(),
+            400: OpenApiResponse(description="Malformed request, or no item could be created"),
+            403: OpenApiResponse(description="Permission denied"),
+        }
+    )
+    # worst case: a done assignment opening its team's cycle-time row for the day
+    @query_budget(13)
+    def bulk_create(self, request, *args, **kwargs):
+        envelope = BulkRequestSerializer(data=request.data)
+        if not envelope.is_valid():
+            return error_response(
+                error_dict=get_error(key="TASK_001014", details=envelope.errors),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        team_id = self.kwargs["team_id"]
+        result = bulk_create_assignments(
+            team_id,
+            envelope.validated_data["items"],
+            atomic=envelope.validated_data["atomic"],
+            changed_by=get_membership_resolver(request).membership(team_id),
+        )
+        if not result.created:
+            return error_response(
+                error_dict=get_error(key="TASK_001015", details=result.results),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return success_response(result.as_dict(), status=status.HTTP_201_CREATED)
+
     @extend_schema(
         summary="Partial update assignment",
-        description="Update assignment status, progress, answer or file. Only assigned member or owner/admin.",
+        description=(
+            "Update assignment status, progress, answer or file. Only assigned member or owner/admin. "
+            "Status moves assigned -> in_progress/blocked/done, in_progress -> assigned/blocked/done, "
+            "blocked -> assigned/in_progress and done -> in_progress; progress on an assigned "
+            "assignment starts it. Only owner/admin can move it to another member of the task's team."
+        ),
         request=TaskAssignmentSerializer,
-        responses={200: TaskAssignmentSerializer(), 403: OpenApiResponse(description="Permission denied")}
+        responses={
+            200: TaskAssignmentSerializer(),
+            400: OpenApiResponse(description="Invalid data, status transition or member of another team"),
+            403: OpenApiResponse(description="Permission denied, or a member reassigning the assignment"),
+        }
     )
+    # worst case: a done assignment opening its team's cycle-time row for the
+    # day, plus the row lock taken before the transition is decided
+    @query_budget(13)
     def partial_update(self, request, *args, **kwargs):
         assignment = self.get_object()
         serializer = self.get_serializer(assignment, data=request.data, partial=True)
-        if serializer.is_valid():
-            serializer.save()
-            return success_response(serializer.data)
-        return error_response(
-            error_dict=get_error(key="TASK_001013", details=serializer.errors),
-            status=status.HTTP_400_BAD_REQUEST
-        )
+        if not serializer.is_valid():
+            return error_response(
+                error_dict=get_error(key="TASK_001013", details=serializer.errors),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        resolver = get_membership_resolver(request)
+        member = serializer.validated_data.get("member")
+        if member is not None and member.pk != assignment.member_id and not resolver.is_admin(assignment.task.team_id):
+            return error_response(
+                error_dict=get_error(key="TASK_001001"),
+                status=status.HTTP_403_FORBIDDEN
+            )
+        try:
+            lifecycle.apply(
+                assignment,
+                serializer.validated_data,
+                changed_by=resolver.membership(assignment.task.team_id),
+            )
+        except lifecycle.InvalidTransition as exc:
+            return error_response(
+                error_dict=get_error(key="TASK_001016", details={"status": [str(exc)]}),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return success_response(serializer.data)
+
+    @extend_schema(
+        summary="Assignment status history",
+        description="Status transitions of an assignment, oldest first. Only assigned member or owner/admin.",
+        responses={200: TaskAssignmentTransitionSerializer(many=True)}
+    )
+    @query_budget(4)
+    def transitions(self, request, *args, **kwargs):
+        assignment = self.get_object()
+        paginator = TransitionPagination()
+        page = paginator.paginate_queryset(assignment.transitions.all(), request, view=self)
+        serializer = TaskAssignmentTransitionSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
@@ -1,14 +1,17 @@
 from rest_framework.viewsets import ModelViewSet
 from rest_framework import status
 from rest_framework.exceptions import PermissionDenied
-from drf_spectacular.utils import extend_schema, OpenApiResponse
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 
-from tasks.models import TaskNote, Task, TaskAssignment
-from tasks.serializers import TaskNoteSerializer
+from tasks.models import TaskNote, Task, TaskAssignment, TaskNoteUnreadCounter
+from tasks.serializers import TaskNoteSerializer, MarkNotesReadSerializer, NoteUnreadSerializer
+from tasks.services import note_reads
 from utils.response import success_response, error_response
+from utils.profiling import query_budget
 from tasks.errors.loader import get_error
-from teams.models import TeamMember
+from teams.services import get_membership_resolver
 from users.permissions import IsAuthenticated
+from utils.filters import BOOLEAN_VALUES, InvalidFilter
 
 
 class TaskNoteViewSet(ModelViewSet):
@@ -19,11 +22,48 @@ class TaskNoteViewSet(ModelViewSet):
     - Only task owner/admin or the assignment member can view notes.
     - Notes created by admins/owners are visible to the assignment member.
     - Notes created by assignment members are visible to admins/owners.
-    - When a note is retrieved by the target user, `is_read` is automatically set to True.
+    - When a note is retrieved by the target user, `is_read` is automatically set to True
+      (unless `?mark_read=false`).
+    - Readers can mark every note up to a given one read in a single request, and read
+      their unread counts per assignment without scanning notes.
     """
 
     serializer_class = TaskNoteSerializer
     permission_classes = (IsAuthenticated,)
+    filter_fields = {"is_read": "is_read"}
+
+    def _reader_scope(self):
+        """
+        (notes, counters) of the task in the URL for the requesting user:
+        the notes they read and their unread counters. None without access.
+        """
+        user = self.request.user
+        qs = TaskNote.objects.select_related("task", "author", "assignment__member")
+        try:
+            task = Task.objects.get(id=self.kwargs.get("task_id"))
+        except Task.DoesNotExist:
+            return None
+
+        if get_membership_resolver(self.request).is_admin(task.team_id):
+            # Admin/Owner sees notes from members
+            return (
+                qs.filter(task=task).exclude(author__role__in=("owner", "admin")),
+                TaskNoteUnreadCounter.objects.filter(
+                    assignment__task=task, reader=note_reads.READER_ADMINS
+                ),
+            )
+
+        # Assigned member sees notes from admins/owners
+        try:
+            assignment = TaskAssignment.objects.get(task=task, member__user=user)
+        except TaskAssignment.DoesNotExist:
+            return None
+        return (
+            qs.filter(task=task, assignment=assignment).exclude(author__user=user),
+            TaskNoteUnreadCounter.objects.filter(
+                assignment=assignment, reader=note_reads.READER_MEMBER
+            ),
+        )
 
     def get_queryset(self):
         """
@@ -31,34 +71,12 @@ class TaskNoteViewSet(ModelViewSet):
         - Owner/Admin sees notes created by members.
         - Assigned member sees notes created by owner/admin.
         """
-        user = self.request.user
-        qs = TaskNote.objects.all()
-
         # Optionally filter by task_id if provided
-        task_id = self.kwargs.get("task_id")
-        if task_id:
-            try:
-                task = Task.objects.get(id=task_id)
-            except Task.DoesNotExist:
-                return TaskNote.objects.none()
-
-            try:
-                membership = TeamMember.objects.get(team=task.team, user=user)
-            except TeamMember.DoesNotExist:
-                membership = None
-
-            if membership and membership.role in ("owner", "admin"):
-                # Admin/Owner sees notes from members
-                return qs.filter(task=task).exclude(author__role__in=("owner", "admin"))
-            else:
-                # Assigned member sees notes from admins/owners
-                try:
-                    assignment = TaskAssignment.objects.get(task=task, member__user=user)
-                except TaskAssignment.DoesNotExist:
-                    return TaskNote.objects.none()
-                return qs.filter(task=task, assignment=assignment).exclude(author__user=user)
-
-        return qs
+        if self.kwargs.get("task_id"):
+            scope = self._reader_scope()
+            return scope[0] if scope else TaskNote.objects.none()
+
+        return TaskNote.objects.select_related("task", "author", "assignment__member")
 
     def perform_create(self, serializer):
         """
@@ -74,9 +92,8 @@ class TaskNoteViewSet(ModelViewSet):
         except Task.DoesNotExist:
             raise PermissionDenied("Task not found.")
 
-        try:
-            membership = TeamMember.objects.get(team=task.team, user=user)
-        except TeamMember.DoesNotExist:
+        membership = get_membership_resolver(self.request).membership(task.team_id)
+        if membership is None:
             raise PermissionDenied("You are not a member of this task's team.")
 
         assignment = None
@@ -96,6 +113,13 @@ class TaskNoteViewSet(ModelViewSet):
             author=membership
         )
 
+    def _marks_read(self) -> bool:
+        """
+        Whether reading a note marks it read; `?mark_read=false` opts out.
+        """
+        value = self.request.query_params.get("mark_read", "true")
+        return BOOLEAN_VALUES.get(value.lower(), True)
+
     def get_object(self):
         """
         Ensure only allowed users can access the note.
@@ -103,26 +127,22 @@ class TaskNoteViewSet(ModelViewSet):
         """
         obj = super().get_object()
         user = self.request.user
-
-        try:
-            membership = TeamMember.objects.get(team=obj.task.team, user=user)
-        except TeamMember.DoesNotExist:
-            membership = None
+        mark_read = self.action == "retrieve" and self._marks_read()
 
         # Admin/Owner sees notes from members
-        if membership and membership.role in ("owner", "admin") and obj.author.user != user:
-            obj.is_read = True
-            obj.save(update_fields=["is_read"])
+        if get_membership_resolver(self.request).is_admin(obj.task.team_id) and obj.author.user_id != user.id:
+            if mark_read:
+                note_reads.mark_read(obj)
             return obj
 
         # Assigned member sees notes from admin/owner
-        if obj.assignment and obj.assignment.member.user == user and obj.author.user != user:
-            obj.is_read = True
-            obj.save(update_fields=["is_read"])
+        if obj.assignment and obj.assignment.member.user_id == user.id and obj.author.user_id != user.id:
+            if mark_read:
+                note_reads.mark_read(obj)
             return obj
 
         # Author always sees their own note
-        if obj.author.user == user:
+        if obj.author.user_id == user.id:
             return obj
 
         raise PermissionDenied("You do not have permission to access this note.")
@@ -132,27 +152,92 @@ class TaskNoteViewSet(ModelViewSet):
         description="List notes for a task visible to the requesting user.",
         responses={200: TaskNoteSerializer(many=True)}
     )
+    @query_budget(5)
     def list(self, request, *args, **kwargs):
-        notes = self.get_queryset()
-        serializer = self.get_serializer(notes, many=True)
-        return success_response(serializer.data)
+        try:
+            queryset = self.filter_queryset(self.get_queryset())
+        except InvalidFilter as exc:
+            return error_response(
+                error_dict=get_error(key="TASK_003004", details=exc.detail),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @extend_schema(
         summary="Retrieve a specific note",
-        description="Retrieve a task note if you have access. Marks note as read automatically.",
+        description=(
+            "Retrieve a task note if you have access. Marks note as read automatically, "
+            "unless `?mark_read=false` is passed."
+        ),
+        parameters=[
+            OpenApiParameter("mark_read", bool, description="Mark the note read (default true)."),
+        ],
         responses={200: TaskNoteSerializer()}
     )
+    @query_budget(4)
     def retrieve(self, request, *args, **kwargs):
         note = self.get_object()
         serializer = self.get_serializer(note)
         return success_response(serializer.data)
 
+    @extend_schema(
+        summary="Mark notes read",
+        description=(
+            "Mark every unread note of the task you read, up to and including `up_to` "
+            "(all of them when omitted), as read in one update."
+        ),
+        request=MarkNotesReadSerializer,
+        responses={200: NoteUnreadSerializer(), 403: OpenApiResponse(description="Permission denied")}
+    )
+    @query_budget(6)
+    def mark_read(self, request, *args, **kwargs):
+        serializer = MarkNotesReadSerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(
+                error_dict=get_error("TASK_003003", details=serializer.errors),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        scope = self._reader_scope()
+        if scope is None:
+            raise PermissionDenied("You do not have access to the notes of this task.")
+
+        notes, counters = scope
+        marked = note_reads.mark_read_up_to(notes, counters, serializer.validated_data.get("up_to"))
+        return success_response(self._unread(counters, marked=marked))
+
+    @extend_schema(
+        summary="Unread note counts",
+        description="Your unread notes on the task, per assignment, read from the unread counters.",
+        responses={200: NoteUnreadSerializer(), 403: OpenApiResponse(description="Permission denied")}
+    )
+    @query_budget(4)
+    def unread(self, request, *args, **kwargs):
+        scope = self._reader_scope()
+        if scope is None:
+            raise PermissionDenied("You do not have access to the notes of this task.")
+        return success_response(self._unread(scope[1]))
+
+    @staticmethod
+    def _unread(counters, **extra):
+        assignments = [
+            {"assignment": assignment_id, "unread": unread}
+            for assignment_id, unread in counters.order_by("assignment_id").values_list("assignment_id", "unread")
+        ]
+        return {
+            **extra,
+            "unread": sum(item["unread"] for item in assignments),
+            "assignments": assignments,
+        }
+
     @extend_schema(
         summary="Create a new note for a task",
         description="Create a note linked to a task and optionally an assignment.",
         request=TaskNoteSerializer,
         responses={201: TaskNoteSerializer(), 403: OpenApiResponse(description="Permission denied")}
     )
+    @query_budget(6)
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
@@ -169,6 +254,7 @@ class TaskNoteViewSet(ModelViewSet):
         request=TaskNoteSerializer,
         responses={200: TaskNoteSerializer(), 403: OpenApiResponse(description="Permission denied")}
     )
+    @query_budget(5)
     def partial_update(self, request, *args, **kwargs):
         note = self.get_object()
         # Only author can update
@@ -24,3 +24,13 @@ class Team(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # public team listing, newest first
+            models.Index(
+                fields=['-id'],
+                condition=models.Q(is_visible=True, is_active=True),
+                name='team_public_idx',
+            ),
+        ]
+
@@ -19,3 +19,7 @@ class TeamMember(models.Model):
 
     class Meta:
         unique_together = ('team', 'user')
+        indexes = [
+            # owners/admins of a team
+            models.Index(fields=['team', 'role'], name='teammember_team_role_idx'),
+        ]
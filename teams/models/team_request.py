@@ -48,3 +48,11 @@ class TeamRequest(models.Model):
     class Meta:
         unique_together = ('team', 'user')
         ordering = ['-created_at']
+        indexes = [
+            # pending requests of a team, newest first (the admin inbox)
+            models.Index(
+                fields=['team', '-id'],
+                condition=models.Q(status='pending'),
+                name='teamrequest_pending_idx',
+            ),
+        ]
@@ -1,5 +1,5 @@
 from .base_permission import BaseCustomPermission
-from teams.models import TeamMember
+from teams.services import get_membership_resolver
 
 
 class IsTeamOwnerOrAdmin(BaseCustomPermission):
@@ -18,14 +18,13 @@ class IsTeamOwnerOrAdmin(BaseCustomPermission):
             self.message = self.deny()
             return False
 
-        try:
-            membership = TeamMember.objects.get(team=obj, user=request.user)
-        except TeamMember.DoesNotExist:
+        role = get_membership_resolver(request).role(obj.id)
+        if role is None:
             self.error_code = "TEAM_001002"
             self.message = self.deny()
             return False
 
-        if membership.role not in ['owner', 'admin']:
+        if role not in ['owner', 'admin']:
             self.error_code = "TEAM_001003"
             self.message = self.deny()
             return False
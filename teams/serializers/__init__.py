@@ -1,3 +1,4 @@
 from .team import TeamSerializer
 from .team_member import TeamMemberSerializer
 from .team_request import TeamRequestSerializer
+from .analytics import TeamAnalyticsQuerySerializer, TeamAnalyticsSerializer
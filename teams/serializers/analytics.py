@@ -0,0 +1,56 @@
+from django.conf import settings
+from rest_framework import serializers
+from tasks.services.analytics import BUCKETS, DAY, bucket_starts, default_range
+
+
+class TeamAnalyticsQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(required=False, help_text="First day (default: 29 days before `end`).")
+    end = serializers.DateField(required=False, help_text="Last day, included (default: today).")
+    bucket = serializers.ChoiceField(choices=BUCKETS, default=DAY)
+
+    def validate(self, attrs):
+        end = attrs.get("end")
+        start, end = default_range(today=end) if end else default_range()
+        start = attrs.get("start", start)
+        if start > end:
+            raise serializers.ValidationError({"start": ["Must not be after end."]})
+        limit = getattr(settings, "TEAM_ANALYTICS_MAX_BUCKETS", 366)
+        if len(bucket_starts(start, end, attrs["bucket"])) > limit:
+            raise serializers.ValidationError({"bucket": [f"At most {limit} buckets per request."]})
+        return {**attrs, "start": start, "end": end}
+
+
+class AnalyticsRatesSerializer(serializers.Serializer):
+    throughput = serializers.IntegerField(help_text="Assignments completed.")
+    late = serializers.IntegerField(help_text="Assignments completed after their task's due date.")
+    overdue_ratio = serializers.FloatField(allow_null=True, help_text="late / throughput.")
+    average_cycle_seconds = serializers.IntegerField(allow_null=True, help_text="Mean started -> completed time.")
+
+
+class AnalyticsBucketSerializer(AnalyticsRatesSerializer):
+    start = serializers.DateField()
+
+
+class AnalyticsSummarySerializer(AnalyticsRatesSerializer):
+    open = serializers.IntegerField(help_text="Assignments not done.")
+    open_overdue = serializers.IntegerField(help_text="Open assignments of active tasks past their due date.")
+
+
+class MemberWorkloadSerializer(serializers.Serializer):
+    member_id = serializers.IntegerField()
+    user_id = serializers.IntegerField()
+    role = serializers.CharField()
+    assigned = serializers.IntegerField()
+    in_progress = serializers.IntegerField()
+    blocked = serializers.IntegerField()
+    done = serializers.IntegerField()
+
+
+class TeamAnalyticsSerializer(serializers.Serializer):
+    team_id = serializers.IntegerField()
+    start = serializers.DateField()
+    end = serializers.DateField()
+    bucket = serializers.ChoiceField(choices=BUCKETS)
+    summary = AnalyticsSummarySerializer()
+    buckets = AnalyticsBucketSerializer(many=True)
+    members = MemberWorkloadSerializer(many=True)
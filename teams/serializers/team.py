@@ -21,4 +21,8 @@ class TeamSerializer(serializers.ModelSerializer):
         ]
 
     def get_members_count(self, obj):
-        return obj.members.count()
+        # annotated by TeamViewSet.get_queryset; fall back for bare instances
+        members_count = getattr(obj, "members_count", None)
+        if members_count is None:
+            members_count = obj.members.count()
+        return members_count
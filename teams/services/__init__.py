@@ -0,0 +1 @@
+from .membership import MembershipResolver, get_membership_resolver
@@ -0,0 +1,74 @@
+from typing import Dict, FrozenSet, Optional
+
+from teams.models import TeamMember
+from utils.cache import cached_queryset
+
+ADMIN_ROLES = ("owner", "admin")
+
+
+class MembershipResolver:
+    """
+    All of a user's TeamMember rows (team_id -> membership), loaded with a
+    single query on first use and kept in the shared cache ("teams"
+    namespace, bumped by every Team/TeamMember write) for later requests.
+
+    Obtain it through get_membership_resolver(request) so permissions,
+    get_queryset and get_object within one request share the same rows.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._memberships: Optional[Dict[int, TeamMember]] = None
+
+    @property
+    def memberships(self) -> Dict[int, TeamMember]:
+        if self._memberships is None:
+            if self.user is None or not self.user.is_authenticated:
+                self._memberships = {}
+            else:
+                self._memberships = {
+                    member.team_id: member
+                    for member in cached_queryset(
+                        TeamMember.objects.filter(user=self.user),
+                        namespace="teams",
+                        key=f"memberships:{self.user.pk}",
+                    )
+                }
+        return self._memberships
+
+    def membership(self, team_id) -> Optional[TeamMember]:
+        return self.memberships.get(int(team_id)) if team_id is not None else None
+
+    def role(self, team_id) -> Optional[str]:
+        membership = self.membership(team_id)
+        return membership.role if membership else None
+
+    def is_member(self, team_id) -> bool:
+        return self.membership(team_id) is not None
+
+    def is_admin(self, team_id) -> bool:
+        """
+        Owner or admin of the team.
+        """
+        return self.role(team_id) in ADMIN_ROLES
+
+    def team_ids(self) -> FrozenSet[int]:
+        return frozenset(self.memberships)
+
+    def admin_team_ids(self) -> FrozenSet[int]:
+        return frozenset(
+            team_id for team_id, member in self.memberships.items()
+            if member.role in ADMIN_ROLES
+        )
+
+
+def get_membership_resolver(request) -> MembershipResolver:
+    """
+    The request's MembershipResolver, created on first use. Stored on the
+    underlying HttpRequest so DRF and plain Django code share it.
+    """
+    http_request = getattr(request, "_request", request)
+    resolver = getattr(http_request, "membership_resolver", None)
+    if resolver is None:
+        resolver = http_request.membership_resolver = MembershipResolver(request.user)
+    return resolver
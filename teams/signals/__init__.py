@@ -0,0 +1 @@
+from . import cache_invalidation  # noqa: F401
@@ -0,0 +1,6 @@
+from teams.models import Team, TeamMember
+from utils.cache import invalidate_on_change
+
+invalidate_on_change(Team, "teams")
+# task visibility follows team membership
+invalidate_on_change(TeamMember, "teams", "tasks")
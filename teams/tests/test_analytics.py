@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from users.tests.factories import UserFactory
+from teams.models import Team, TeamMember
+from tasks.models import Task, TaskAssignment
+from tasks.services import lifecycle
+from tasks.services.analytics import bucket_starts
+
+
+class TeamAnalyticsTestCase(APITestCase):
+
+    def setUp(self):
+        self.owner_user = UserFactory()
+        self.member_user = UserFactory()
+        self.team = Team.objects.create(title="Team")
+        self.owner = TeamMember.objects.create(team=self.team, user=self.owner_user, role="owner")
+        self.member = TeamMember.objects.create(team=self.team, user=self.member_user, role="member")
+        self.url = reverse("teams:team-analytics", kwargs={"pk": self.team.id})
+        self.now = timezone.now()
+        self.today = timezone.localdate(self.now)
+
+        on_time = Task.objects.create(title="On time", team=self.team, due_date=self.now + timedelta(days=5))
+        late = Task.objects.create(title="Late", team=self.team, due_date=self.now - timedelta(days=3))
+        for task, started, finished in ((on_time, 10, 8), (late, 4, 1)):
+            assignment = self._assign(task)
+            lifecycle.apply(assignment, {"status": "in_progress"}, now=self.now - timedelta(days=started))
+            lifecycle.apply(assignment, {"status": "done"}, now=self.now - timedelta(days=finished))
+        self._assign(late)  # still open on an overdue task
+        self.client.force_authenticate(self.owner_user)
+
+    def _assign(self, task):
+        assignment = TaskAssignment(task=task, member=self.member, **lifecycle.initial_fields("assigned"))
+        assignment.save()
+        lifecycle.created(self.team.id, [assignment])
+        return assignment
+
+    def test_daily_buckets(self):
+        response = self.client.get(self.url, {"start": (self.today - timedelta(days=9)).isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data["data"]
+
+        self.assertEqual(len(data["buckets"]), 10)
+        by_day = {bucket["start"]: bucket for bucket in data["buckets"]}
+        self.assertEqual(by_day[self.today - timedelta(days=8)]["throughput"], 1)
+        self.assertEqual(by_day[self.today - timedelta(days=1)]["late"], 1)
+        self.assertIsNone(by_day[self.today]["average_cycle_seconds"])
+
+        summary = data["summary"]
+        self.assertEqual(summary["throughput"], 2)
+        self.assertEqual(summary["late"], 1)
+        self.assertEqual(summary["overdue_ratio"], 0.5)
+        self.assertEqual(summary["average_cycle_seconds"], int(timedelta(days=2.5).total_seconds()))
+        self.assertEqual(summary["open"], 1)
+        self.assertEqual(summary["open_overdue"], 1)
+
+        workload = {member["member_id"]: member for member in data["members"]}
+        self.assertEqual((workload[self.member.id]["assigned"], workload[self.member.id]["done"]), (1, 2))
+        self.assertEqual(workload[self.owner.id]["done"], 0)
+
+    def test_weekly_buckets(self):
+        start = self.today - timedelta(days=20)
+        response = self.client.get(self.url, {"start": start.isoformat(), "bucket": "week"})
+        buckets = response.data["data"]["buckets"]
+        self.assertEqual([bucket["start"] for bucket in buckets], bucket_starts(start, self.today, "week"))
+        self.assertEqual(sum(bucket["throughput"] for bucket in buckets), 2)
+        self.assertEqual(buckets[0]["start"].weekday(), 0)
+
+    def test_monthly_bucket_starts(self):
+        self.assertEqual(
+            bucket_starts(self.today.replace(month=1, day=31), self.today.replace(month=3, day=1), "month"),
+            [self.today.replace(month=m, day=1) for m in (1, 2, 3)],
+        )
+
+    def test_invalid_query(self):
+        response = self.client.get(self.url, {"start": self.today.isoformat(), "end": "2000-01-01"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"]["code"], "TEAM_001013")
+
+        response = self.client.get(self.url, {"start": "1990-01-01"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_members_forbidden(self):
+        self.client.force_authenticate(self.member_user)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from teams.models import Team, TeamMember
+from users.tests.factories import UserFactory
+from utils import metrics
+from utils.cache import bump_namespace, cached_queryset, namespace_version, namespaced_key
+from utils.metrics import InMemoryBackend
+
+
+class CacheNamespaceTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.backend = InMemoryBackend()
+        metrics.configure(backend=self.backend, enabled=True)
+        self.addCleanup(metrics.configure, backend=None, enabled=False)
+
+    def test_bump_changes_keys_of_that_namespace_only(self):
+        teams_key, tasks_key = namespaced_key("teams", "x"), namespaced_key("tasks", "x")
+        bump_namespace("teams")
+        self.assertNotEqual(namespaced_key("teams", "x"), teams_key)
+        self.assertEqual(namespaced_key("tasks", "x"), tasks_key)
+
+    def test_lost_version_does_not_reuse_old_keys(self):
+        version = namespace_version("users")
+        cache.delete("cache_ns:users")
+        self.assertGreater(namespace_version("users"), version)
+
+    def test_unknown_namespace_is_rejected(self):
+        with self.assertRaises(ValueError):
+            namespaced_key("billing", "x")
+
+    def test_cached_queryset_counts_hits_and_misses(self):
+        Team.objects.create(title="A")
+        queryset = Team.objects.filter(title="A")
+
+        cached_queryset(queryset, namespace="teams", key="a")
+        with self.assertNumQueries(0):
+            teams = cached_queryset(queryset, namespace="teams", key="a")
+
+        self.assertEqual([team.title for team in teams], ["A"])
+        self.assertEqual(self.backend.get("cache_misses_total", namespace="teams"), 1)
+        self.assertEqual(self.backend.get("cache_hits_total", namespace="teams"), 1)
+
+
+class TeamListCacheTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = UserFactory()
+        self.client.force_authenticate(user=self.user)
+        self.team = Team.objects.create(title="Visible")
+        self.public_url = reverse("teams:team-public-list")
+        self.my_url = reverse("teams:team-my-teams")
+
+    def test_team_changes_invalidate_public_list(self):
+        self.assertEqual(len(self.client.get(self.public_url).data["data"]), 1)
+
+        self.team.is_visible = False
+        self.team.save()
+        self.assertEqual(self.client.get(self.public_url).data["data"], [])
+
+    def test_membership_changes_invalidate_my_teams(self):
+        self.assertEqual(self.client.get(self.my_url).data["data"], [])
+
+        TeamMember.objects.create(team=self.team, user=self.user, role="member")
+        response = self.client.get(self.my_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([team["id"] for team in response.data["data"]], [self.team.id])
@@ -56,6 +56,12 @@ class TeamViewSetTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn(self.team.title, [t["title"] for t in response.data["data"]])
 
+    def test_invalid_filter_is_answered_in_the_envelope(self):
+        for url in (self.create_url, self.my_teams_url, self.public_teams_url):
+            response = self.client.get(url, {"status": "bogus"})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data["error"]["code"], "TEAM_001014")
+
     def test_partial_update_team_owner(self):
         data = {"description": "Updated Description"}
         response = self.client.patch(self.detail_url(self.team.pk), data, format="json")
@@ -0,0 +1,64 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from teams.models import Team, TeamMember
+from users.tests.factories import UserFactory
+
+
+class TeamListQueryCountTestCase(APITestCase):
+    """
+    List endpoints must cost a constant number of queries per page,
+    independent of the number of teams and members.
+    """
+
+    TEAMS = 1000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.other = UserFactory()
+        # bulk_create skips the per-team group chat signal, which is not under test
+        teams = Team.objects.bulk_create(Team(title=f"Team {i}") for i in range(cls.TEAMS))
+        TeamMember.objects.bulk_create(
+            [TeamMember(team=team, user=cls.user, role="owner") for team in teams]
+            + [TeamMember(team=team, user=cls.other) for team in teams[::2]]
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.user)
+
+    def _walk(self, url, page_size):
+        """
+        Follow `pagination.next` to the end, asserting one query per page.
+        """
+        results, pages = [], 0
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url, {"page_size": page_size} if not pages else None)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            results.extend(response.data["data"])
+            url = response.data["pagination"]["next"]
+            pages += 1
+        return results, pages
+
+    def test_public_teams_pages_with_one_query_each(self):
+        teams, pages = self._walk(reverse("teams:team-public-list"), page_size=200)
+
+        self.assertEqual(len(teams), self.TEAMS)
+        self.assertEqual(pages, 5)
+        self.assertEqual(len({team["id"] for team in teams}), self.TEAMS)
+        counts = {team["members_count"] for team in teams}
+        self.assertEqual(counts, {1, 2})
+
+    def test_my_teams_counts_all_members(self):
+        teams, _ = self._walk(reverse("teams:team-my-teams"), page_size=200)
+
+        self.assertEqual(len(teams), self.TEAMS)
+        self.assertEqual(sum(team["members_count"] for team in teams), self.TEAMS + self.TEAMS // 2)
+
+    def test_page_size_is_capped(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("teams:team-list"), {"page_size": 10000})
+
+        self.assertEqual(len(response.data["data"]), 200)
+        self.assertTrue(response.data["pagination"]["has_more"])
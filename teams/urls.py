@@ -45,4 +45,5 @@ urlpatterns = [
     path("<int:pk>/", TeamViewSet.as_view({"get": "retrieve", "patch": "partial_update"}), name="team-detail"),
     path("<int:pk>/activate/", TeamViewSet.as_view({"patch": "activate"}), name="team-activate"),
     path("<int:pk>/deactivate/", TeamViewSet.as_view({"patch": "deactivate"}), name="team-deactivate"),
+    path("<int:pk>/analytics/", TeamViewSet.as_view({"get": "analytics"}), name="team-analytics"),
 ]
@@ -1,12 +1,16 @@
+from django.db.models import Count
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 from users.permissions import IsAuthenticated
+from utils.filters import InvalidFilter
 from utils.response import success_response, error_response
+from utils.profiling import query_budget
 from teams.errors.loader import get_error
 from teams.models import Team, TeamMember
-from teams.serializers import TeamSerializer
+from teams.serializers import TeamAnalyticsQuerySerializer, TeamAnalyticsSerializer, TeamSerializer
 from teams.permissions import IsTeamOwnerOrAdmin
+from tasks.services.analytics import team_analytics
 
 
 class TeamViewSet(viewsets.ModelViewSet):
@@ -17,27 +21,36 @@ class TeamViewSet(viewsets.ModelViewSet):
     - GET: Retrieve teams or team details
     - POST: Create a new team (Owner member created automatically)
     - PATCH: Partially update a team (Owner/Admin only)
-    - Custom actions: my_teams, public_teams, activate, deactivate
+    - Custom actions: my_teams, public_teams, activate, deactivate, analytics
     """
 
     serializer_class = TeamSerializer
     permission_classes = (IsAuthenticated,)
+    filter_fields = {"status": "status"}
     http_method_names = ["get", "post", "patch"]
 
     def get_queryset(self):
+        """
+        Teams carry a `members_count` annotation (one grouped COUNT for the
+        whole page instead of one COUNT per team).
+        """
         user = self.request.user
         if self.action == "my_teams":
-            return Team.objects.filter(members__user=user)
+            # filter through a subquery: joining members here would make
+            # the annotation count only the requesting user's row
+            queryset = Team.objects.filter(id__in=TeamMember.objects.filter(user=user).values("team_id"))
         elif self.action == "public_teams":
-            return Team.objects.filter(is_visible=True, is_active=True)
-        return Team.objects.all()
+            queryset = Team.objects.filter(is_visible=True, is_active=True)
+        else:
+            queryset = Team.objects.all()
+        return queryset.annotate(members_count=Count("members"))
 
     def get_permissions(self):
         """
-        Owner/Admin required for update, partial_update, activate, deactivate.
+        Owner/Admin required for update, partial_update, activate, deactivate, analytics.
         """
         permissions = list(self.permission_classes)
-        if self.action in ['update', 'partial_update', 'activate', 'deactivate']:
+        if self.action in ['update', 'partial_update', 'activate', 'deactivate', 'analytics']:
             permissions.append(IsTeamOwnerOrAdmin)
         return (perm() for perm in permissions)
 
@@ -73,6 +86,33 @@ class TeamViewSet(viewsets.ModelViewSet):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+    @extend_schema(
+        summary="List teams",
+        description=(
+                "Returns all teams, optionally filtered by `status`. "
+                "An unknown filter value is rejected with a validation error."
+        ),
+        responses={
+            200: OpenApiResponse(
+                description="List of teams (cursor-paginated)",
+                response=serializer_class(many=True)
+            ),
+            400: OpenApiResponse(description="Invalid filter value", response=dict)
+        }
+    )
+    @query_budget(2)
+    def list(self, request, *args, **kwargs):
+        try:
+            queryset = self.filter_queryset(self.get_queryset())
+        except InvalidFilter as exc:
+            return error_response(
+                error_dict=get_error(key="TEAM_001014", details=exc.detail),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     @extend_schema(
         summary="Retrieve teams owned or joined by the user",
         description=(
@@ -81,16 +121,24 @@ class TeamViewSet(viewsets.ModelViewSet):
         ),
         responses={
             200: OpenApiResponse(
-                description="List of teams the user is a member of",
-                response=serializer_class
+                description="List of teams the user is a member of (cursor-paginated)",
+                response=serializer_class(many=True)
             )
         }
     )
     @action(detail=False, methods=['get'])
+    @query_budget(2)
     def my_teams(self, request):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return success_response(serializer.data)
+        try:
+            queryset = self.filter_queryset(self.get_queryset())
+        except InvalidFilter as exc:
+            return error_response(
+                error_dict=get_error(key="TEAM_001014", details=exc.detail),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @extend_schema(
         summary="Retrieve public teams",
@@ -101,16 +149,24 @@ class TeamViewSet(viewsets.ModelViewSet):
         ),
         responses={
             200: OpenApiResponse(
-                description="List of public teams",
-                response=serializer_class
+                description="List of public teams (cursor-paginated)",
+                response=serializer_class(many=True)
             )
         }
     )
     @action(detail=False, methods=['get'])
+    @query_budget(2)
     def public_teams(self, request):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return success_response(serializer.data)
+        try:
+            queryset = self.filter_queryset(self.get_queryset())
+        except InvalidFilter as exc:
+            return error_response(
+                error_dict=get_error(key="TEAM_001014", details=exc.detail),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @extend_schema(
         summary="Activate a team",
@@ -125,6 +181,7 @@ class TeamViewSet(viewsets.ModelViewSet):
         }
     )
     @action(detail=True, methods=['patch'])
+    @query_budget(4)
     def activate(self, request, pk: int = None):
         try:
             team = self.get_object()
@@ -150,6 +207,7 @@ class TeamViewSet(viewsets.ModelViewSet):
         }
     )
     @action(detail=True, methods=['patch'])
+    @query_budget(4)
     def deactivate(self, request, pk: int = None):
         try:
             team = self.get_object()
@@ -182,6 +240,7 @@ class TeamViewSet(viewsets.ModelViewSet):
             404: OpenApiResponse(description="Team not found")
         }
     )
+    @query_budget(4)
     def partial_update(self, request, *args, **kwargs):
         team = self.get_object()
         serializer = self.get_serializer(team, data=request.data, partial=True)
@@ -193,3 +252,31 @@ class TeamViewSet(viewsets.ModelViewSet):
             error_dict=get_error("TEAM_001007", details=serializer.errors),
             status=status.HTTP_400_BAD_REQUEST
         )
+
+    @extend_schema(
+        summary="Team analytics",
+        description=(
+                "Throughput, average cycle time and overdue ratio (assignments completed after their "
+                "task's due date) per day, week or month between `start` and `end`, with totals, open "
+                "and overdue open assignments, and each member's assignments by status. Read from "
+                "summary tables kept up to date by assignment writes. Only team owners and admins."
+        ),
+        parameters=[TeamAnalyticsQuerySerializer],
+        responses={
+            200: OpenApiResponse(description="Team analytics", response=TeamAnalyticsSerializer),
+            400: OpenApiResponse(description="Invalid date range or bucket", response=dict),
+            403: OpenApiResponse(description="Permission denied"),
+            404: OpenApiResponse(description="Team not found")
+        }
+    )
+    @action(detail=True, methods=['get'])
+    @query_budget(5)
+    def analytics(self, request, pk: int = None):
+        team = self.get_object()
+        query = TeamAnalyticsQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return error_response(
+                error_dict=get_error("TEAM_001013", details=query.errors),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return success_response(team_analytics(team.id, **query.validated_data))
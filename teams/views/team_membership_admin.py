@@ -2,11 +2,14 @@ from rest_framework.viewsets import ModelViewSet
 from rest_framework.decorators import action
 from rest_framework import status
 from drf_spectacular.utils import extend_schema, OpenApiResponse
-from teams.models import Team, TeamRequest, TeamMember
+from teams.models import TeamRequest, TeamMember
 from teams.serializers import TeamRequestSerializer
 from teams.permissions import IsTeamOwnerOrAdmin
+from teams.services import get_membership_resolver
 from users.permissions import IsAuthenticated
+from utils.filters import InvalidFilter
 from utils.response import success_response, error_response
+from utils.profiling import query_budget
 from teams.errors.loader import get_error
 
 
@@ -25,6 +28,7 @@ class TeamMembershipAdminViewSet(ModelViewSet):
 
     serializer_class = TeamRequestSerializer
     permission_classes = (IsAuthenticated,)
+    filter_fields = {"team": "team_id"}
 
     def get_queryset(self):
         """
@@ -37,13 +41,11 @@ class TeamMembershipAdminViewSet(ModelViewSet):
         if self.action == 'list_team_requests':
             team_id = self.kwargs.get('pk')
             return TeamRequest.objects.filter(team__id=team_id, status='pending')
-        my_teams = Team.objects.filter(
-            members__user=self.request.user, members__role__in=['owner', 'admin']
-        )
+        my_teams = get_membership_resolver(self.request).admin_team_ids()
         if self.action == 'list':
-            return TeamRequest.objects.filter(team__in=my_teams, status='pending')
+            return TeamRequest.objects.filter(team_id__in=my_teams, status='pending')
         # For retrieve/accept/reject, restrict to requests belonging to user's teams
-        return TeamRequest.objects.filter(team__in=my_teams)
+        return TeamRequest.objects.filter(team_id__in=my_teams)
 
     def get_permissions(self):
         """
@@ -59,12 +61,20 @@ class TeamMembershipAdminViewSet(ModelViewSet):
     @extend_schema(
         summary="List all pending membership requests for teams where the user is owner/admin",
         description="Retrieve all pending membership requests across all teams where the authenticated user has owner or admin rights.",
-        responses={200: OpenApiResponse(description="List of membership requests", response=serializer_class)}
+        responses={200: OpenApiResponse(description="List of membership requests", response=serializer_class(many=True))}
     )
+    @query_budget(3)
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return success_response(serializer.data)
+        try:
+            queryset = self.filter_queryset(self.get_queryset())
+        except InvalidFilter as exc:
+            return error_response(
+                error_dict=get_error(key="TEAM_001014", details=exc.detail),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @extend_schema(
         summary="List all pending membership requests for a specific team",
@@ -73,10 +83,18 @@ class TeamMembershipAdminViewSet(ModelViewSet):
         responses={200: OpenApiResponse(description="List of membership requests", response=serializer_class)}
     )
     @action(detail=False, methods=['get'], url_path='team/(?P<pk>[^/.]+)')
+    @query_budget(3)
     def list_team_requests(self, request, pk: int = None):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return success_response(serializer.data)
+        try:
+            queryset = self.filter_queryset(self.get_queryset())
+        except InvalidFilter as exc:
+            return error_response(
+                error_dict=get_error(key="TEAM_001014", details=exc.detail),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @extend_schema(
         summary="Accept a membership request",
@@ -134,6 +152,7 @@ class TeamMembershipAdminViewSet(ModelViewSet):
         responses={200: OpenApiResponse(description="Membership request details", response=serializer_class)}
     )
     @action(detail=True, methods=['get'])
+    @query_budget(3)
     def retrieve(self, request, pk: int = None):
         instance = self.get_object()
         serializer = self.serializer_class(instance)
@@ -2,7 +2,9 @@ from rest_framework.viewsets import ModelViewSet
 from teams.serializers import TeamRequestSerializer
 from users.permissions import IsAuthenticated
 from teams.models import TeamRequest
+from utils.filters import InvalidFilter
 from utils.response import success_response, error_response
+from utils.profiling import query_budget
 from teams.errors.loader import get_error
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 from rest_framework import status
@@ -22,6 +24,7 @@ class UserMembershipRequestViewSet(ModelViewSet):
 
     serializer_class = TeamRequestSerializer
     permission_classes = (IsAuthenticated,)
+    filter_fields = {"status": "status"}
 
     def get_queryset(self):
         """
@@ -80,13 +83,21 @@ class UserMembershipRequestViewSet(ModelViewSet):
             )
         }
     )
+    @query_budget(2)
     def list(self, request, *args, **kwargs):
         """
         Retrieve all membership requests submitted by the authenticated user.
         """
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return success_response(serializer.data)
+        try:
+            queryset = self.filter_queryset(self.get_queryset())
+        except InvalidFilter as exc:
+            return error_response(
+                error_dict=get_error(key="TEAM_001014", details=exc.detail),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     @extend_schema(
         summary="Retrieve a specific membership request",
@@ -102,6 +113,7 @@ class UserMembershipRequestViewSet(ModelViewSet):
             404: OpenApiResponse(description="Request not found")
         }
     )
+    @query_budget(2)
     def retrieve(self, request, *args, **kwargs):
         """
         Retrieve details of a single membership request for the authenticated user.
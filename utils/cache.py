@@ -0,0 +1,101 @@
+"""
+Shared cache helpers.
+
+Keys live in per-app namespaces ("users", "teams", "tasks", "chats").
+Every namespace has a version number stored in the cache, and keys embed
+it, so invalidating a namespace is a single increment: entries written
+under the old version are never read again and simply expire.
+
+    teams = cached_queryset(
+        Team.objects.filter(is_visible=True),
+        namespace="teams",
+        key="public",
+    )
+
+    invalidate_on_change(Team, "teams")  # bump on save/delete
+"""
+import time
+from typing import List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from utils import metrics
+
+NAMESPACES = ("users", "teams", "tasks", "chats")
+
+
+def _version_key(namespace: str) -> str:
+    return f"cache_ns:{namespace}"
+
+
+def _check_namespace(namespace: str):
+    if namespace not in NAMESPACES:
+        raise ValueError(f"Unknown cache namespace: {namespace!r}")
+
+
+def namespace_version(namespace: str) -> int:
+    _check_namespace(namespace)
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # A lost version key must not resurrect entries written under an
+        # earlier counter, so restart from a time-based value.
+        cache.add(key, time.time_ns() // 1000, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def namespaced_key(namespace: str, *parts) -> str:
+    return ":".join((namespace, f"v{namespace_version(namespace)}", *(str(part) for part in parts)))
+
+
+def bump_namespace(*namespaces: str):
+    """
+    Invalidate every key of the given namespaces.
+    """
+    for namespace in namespaces:
+        _check_namespace(namespace)
+        try:
+            cache.incr(_version_key(namespace))
+        except ValueError:
+            cache.add(_version_key(namespace), time.time_ns() // 1000, timeout=None)
+
+
+def cached_queryset(queryset, *, namespace: str, key, timeout: int = None) -> List:
+    """
+    Evaluate `queryset` once and serve the resulting list from the cache
+    until the namespace is bumped or the entry expires.
+    """
+    cache_key = namespaced_key(namespace, "qs", key)
+    result = cache.get(cache_key)
+    if result is not None:
+        metrics.inc("cache_hits_total", namespace=namespace)
+        return result
+
+    metrics.inc("cache_misses_total", namespace=namespace)
+    result = list(queryset)
+    if timeout is None:
+        timeout = getattr(settings, "CACHE_QUERYSET_TIMEOUT", 300)
+    cache.set(cache_key, result, timeout)
+    return result
+
+
+def invalidate_on_change(model, *namespaces: str):
+    """
+    Bump `namespaces` whenever an instance of `model` is saved or deleted.
+    The bump is repeated on commit so a reader racing the transaction
+    cannot leave pre-commit data cached.
+    """
+    for namespace in namespaces:
+        _check_namespace(namespace)
+
+    def receiver(sender, **kwargs):
+        bump_namespace(*namespaces)
+        transaction.on_commit(lambda: bump_namespace(*namespaces))
+
+    uid = f"cache_invalidation:{model._meta.label}"
+    post_save.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
@@ -0,0 +1,78 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+BOOLEAN_VALUES = {"true": True, "1": True, "false": False, "0": False}
+
+
+class InvalidFilter(ValidationError):
+    """
+    Bad filter values, {param: [messages]} in `detail`. List views catch
+    it to answer in the {success, data, error} envelope with their app's
+    error key; elsewhere DRF turns it into a plain 400.
+    """
+
+
+class QueryParamFilterBackend(BaseFilterBackend):
+    """
+    Exact-match filtering from query parameters declared on the view:
+
+        filter_fields = {"status": "status", "team": "team_id"}
+
+    maps `?status=done` to `.filter(status="done")`. A comma-separated
+    value (`?status=assigned,in_progress`) becomes an `__in` lookup.
+    Values are checked against the model field (type and choices) so a
+    bad value raises InvalidFilter (a 400), never a database error or a
+    silent full scan.
+    Undeclared parameters are ignored.
+    """
+
+    def get_filter_fields(self, view) -> dict:
+        return getattr(view, "filter_fields", None) or {}
+
+    def filter_queryset(self, request, queryset, view):
+        lookups = {}
+        errors = {}
+        for param, lookup in self.get_filter_fields(view).items():
+            raw = request.query_params.get(param)
+            if raw in (None, ""):
+                continue
+            field = queryset.model._meta.get_field(lookup.split("__")[0])
+            try:
+                values = [self._clean(field, value) for value in raw.split(",")]
+            except DjangoValidationError as exc:
+                errors[param] = exc.messages
+                continue
+            if len(values) == 1:
+                lookups[lookup] = values[0]
+            else:
+                lookups[f"{lookup}__in"] = values
+
+        if errors:
+            raise InvalidFilter(errors)
+        return queryset.filter(**lookups) if lookups else queryset
+
+    @staticmethod
+    def _clean(field, value):
+        # FK lookups ("team_id") validate against the target's primary key
+        target = field.target_field if field.is_relation else field
+        value = value.strip()
+        if target.get_internal_type() == "BooleanField":
+            # Django only accepts "True"/"False"/"t"/"f"/"1"/"0"; APIs send "true"/"false"
+            value = BOOLEAN_VALUES.get(value.lower(), value)
+        value = target.to_python(value)
+        if field.choices and value not in dict(field.flatchoices):
+            raise DjangoValidationError(f"Select a valid choice. {value} is not one of the available choices.")
+        return value
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": param,
+                "required": False,
+                "in": "query",
+                "description": f"Filter by {lookup} (comma-separate values to match any)",
+                "schema": {"type": "string"},
+            }
+            for param, lookup in self.get_filter_fields(view).items()
+        ]
@@ -0,0 +1,201 @@
+"""
+Lightweight, pluggable metrics.
+
+Call sites use the module-level helpers::
+
+    from utils import metrics
+
+    metrics.inc("chat_events_total", event="message")
+    with metrics.timer("chat_persist_seconds"):
+        ...
+
+The backend is chosen by ``METRICS_BACKEND`` (dotted path). When
+``METRICS_ENABLED`` is false the helpers return immediately, so
+instrumented hot paths pay for a single attribute check.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    body = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in pairs)
+    return "{" + body + "}"
+
+
+class NullBackend:
+    """
+    Backend that records nothing.
+    """
+
+    def inc(self, name: str, value: float = 1, **labels):
+        pass
+
+    def observe(self, name: str, value: float, **labels):
+        pass
+
+    def render(self) -> str:
+        return ""
+
+
+class InMemoryBackend:
+    """
+    Process-local counters and histograms rendered in the Prometheus
+    text exposition format.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            state = series.get(key)
+            if state is None:
+                # [bucket counts..., sum, count]
+                state = series[key] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def get(self, name: str, **labels):
+        """
+        Return a counter value, or a histogram's observation count.
+        """
+        key = _label_key(labels)
+        if name in self._counters:
+            return self._counters[name].get(key, 0)
+        state = self._histograms.get(name, {}).get(key)
+        return state[-1] if state else 0
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{_format_labels(key)} {value}")
+
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, state in series.items():
+                    for index, bound in enumerate(self.buckets):
+                        lines.append(f"{name}_bucket{_format_labels(key, (('le', bound),))} {state[index]}")
+                    lines.append(f"{name}_bucket{_format_labels(key, (('le', '+Inf'),))} {state[-1]}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {state[-2]}")
+                    lines.append(f"{name}_count{_format_labels(key)} {state[-1]}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+class _Registry:
+    backend = None
+    enabled = False
+
+
+def configure(backend=None, enabled=None):
+    """
+    (Re)build the active backend from settings. Tests may pass a backend.
+    """
+    if enabled is None:
+        enabled = getattr(settings, "METRICS_ENABLED", False)
+    if backend is None:
+        backend = (
+            import_string(getattr(settings, "METRICS_BACKEND", "utils.metrics.InMemoryBackend"))()
+            if enabled else NullBackend()
+        )
+    _Registry.backend = backend
+    _Registry.enabled = enabled
+    return backend
+
+
+def get_backend():
+    if _Registry.backend is None:
+        configure()
+    return _Registry.backend
+
+
+def inc(name: str, value: float = 1, **labels):
+    if _Registry.backend is None:
+        configure()
+    if _Registry.enabled:
+        _Registry.backend.inc(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels):
+    if _Registry.backend is None:
+        configure()
+    if _Registry.enabled:
+        _Registry.backend.observe(name, value, **labels)
+
+
+@contextmanager
+def timer(name: str, **labels):
+    """
+    Observe the wall time of the block, in seconds.
+    """
+    if _Registry.backend is None:
+        configure()
+    if not _Registry.enabled:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _Registry.backend.observe(name, time.perf_counter() - started, **labels)
+
+
+class MetricsASGIMiddleware:
+    """
+    Serve the scrape endpoint (``METRICS_PATH``) directly from the ASGI app,
+    bypassing Django; every other request is passed through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.path = getattr(settings, "METRICS_PATH", "/metrics")
+        get_backend()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != self.path or not _Registry.enabled:
+            return await self.app(scope, receive, send)
+
+        body = get_backend().render().encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; version=0.0.4; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,54 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+from utils.response import success_response
+
+
+class EnvelopeCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination for the {success, data, error} envelope.
+
+    `data` stays the list of results; navigation goes in an extra
+    `pagination` key:
+
+        "pagination": {"next": <url|null>, "previous": <url|null>, "has_more": bool}
+
+    Pages are fetched as `page_size + 1` rows past the cursor position, so
+    no COUNT query is issued. Ordering must be unique (default "-id") for
+    cursors to be stable.
+    """
+
+    ordering = "-id"
+    page_size_query_param = "page_size"
+
+    def get_page_size(self, request):
+        # read per request so settings overrides apply; requested sizes
+        # above max_page_size are clamped by DRF
+        self.page_size = getattr(settings, "API_PAGE_SIZE", 50)
+        self.max_page_size = getattr(settings, "API_MAX_PAGE_SIZE", 200)
+        return super().get_page_size(request)
+
+    def get_paginated_response(self, data):
+        return success_response(data, pagination={
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "has_more": self.has_next,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "success": {"type": "boolean"},
+                "data": schema,
+                "error": {"type": "object", "nullable": True},
+                "pagination": {
+                    "type": "object",
+                    "properties": {
+                        "next": {"type": "string", "nullable": True, "format": "uri"},
+                        "previous": {"type": "string", "nullable": True, "format": "uri"},
+                        "has_more": {"type": "boolean"},
+                    },
+                },
+            },
+        }
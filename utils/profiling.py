@@ -0,0 +1,227 @@
+"""
+Per-request SQL / Mongo / wall-time accounting and query budgets.
+
+RequestProfilingMiddleware counts the SQL queries and Mongo commands a
+request issues and reports them in a ``Server-Timing`` header, e.g.::
+
+    Server-Timing: sql;dur=4.1;desc="3 queries", mongo;dur=0.8;desc="1 commands", total;dur=12.6
+
+View handlers declare how many queries they may issue::
+
+    @query_budget(4)
+    def list(self, request, *args, **kwargs):
+        ...
+
+    @query_budget(2, mongo=1)
+    async def get(self, request, chat_id):
+        ...
+
+Going over budget is logged (``QUERY_BUDGET_MODE = "log"``) or raises
+QueryBudgetExceeded (``"raise"``, for CI so N+1 regressions fail the
+test run). The middleware is only installed when
+``REQUEST_PROFILING_ENABLED`` is on (default: DEBUG).
+"""
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from pymongo import monitoring
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+BUDGET_ATTRIBUTE = "_query_budget"
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    sql: int
+    mongo: Optional[int] = None
+
+
+@dataclass
+class RequestProfile:
+    started: float = field(default_factory=time.perf_counter)
+    sql_count: int = 0
+    sql_seconds: float = 0.0
+    mongo_count: int = 0
+    mongo_seconds: float = 0.0
+    budget: Optional[QueryBudget] = None
+    view_name: str = ""
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+# Set for the duration of a profiled request; copied into sync_to_async /
+# async_to_sync hops, so work done in executor threads is still counted.
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current_profile.get()
+
+
+def query_budget(sql: int, *, mongo: Optional[int] = None):
+    """
+    Declare the maximum number of SQL queries (and optionally Mongo
+    commands) a view handler may issue per request, authentication
+    included.
+    """
+    budget = QueryBudget(sql=sql, mongo=mongo)
+
+    def decorator(handler):
+        setattr(handler, BUDGET_ATTRIBUTE, budget)
+        return handler
+
+    return decorator
+
+
+def _count_sql(execute, sql, params, many, context):
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.sql_count += 1
+        profile.sql_seconds += time.perf_counter() - started
+
+
+def _install_sql_counter(connection, **kwargs):
+    if _count_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_sql)
+
+
+class MongoCommandCounter(monitoring.CommandListener):
+    """
+    pymongo command listener feeding the current request's profile.
+    """
+
+    def started(self, event):
+        pass
+
+    def _record(self, event):
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.mongo_count += 1
+            profile.mongo_seconds += event.duration_micros / 1_000_000
+
+    succeeded = _record
+    failed = _record
+
+
+_mongo_listener = None
+
+
+def _install_mongo_counter():
+    # only clients created after registration report to the listener
+    global _mongo_listener
+    if _mongo_listener is None:
+        _mongo_listener = MongoCommandCounter()
+        monitoring.register(_mongo_listener)
+
+
+def _handler_budget(view_func, method: str) -> tuple:
+    """
+    (budget, name) of the handler a DRF view will dispatch `method` to.
+    """
+    view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    if view_class is None:
+        return getattr(view_func, BUDGET_ATTRIBUTE, None), getattr(view_func, "__name__", "")
+    actions = getattr(view_func, "actions", None)
+    handler_name = actions.get(method) if actions else method
+    handler = getattr(view_class, handler_name or "", None)
+    return getattr(handler, BUDGET_ATTRIBUTE, None), f"{view_class.__name__}.{handler_name}"
+
+
+class RequestProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+        connection_created.connect(_install_sql_counter, dispatch_uid="utils.profiling.sql_counter")
+        for connection in connections.all(initialized_only=True):
+            _install_sql_counter(connection)
+        _install_mongo_counter()
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        return self._finish(response, profile)
+
+    async def __acall__(self, request):
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        return self._finish(response, profile)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Under ASGI this runs on the thread-sensitive executor thread, i.e.
+        # the thread (and connection objects) the view's queries use.
+        for connection in connections.all():
+            _install_sql_counter(connection)
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.budget, profile.view_name = _handler_budget(view_func, request.method.lower())
+        return None
+
+    def _finish(self, response, profile: RequestProfile):
+        response["Server-Timing"] = ", ".join((
+            f'sql;dur={profile.sql_seconds * 1000:.1f};desc="{profile.sql_count} queries"',
+            f'mongo;dur={profile.mongo_seconds * 1000:.1f};desc="{profile.mongo_count} commands"',
+            f"total;dur={profile.elapsed * 1000:.1f}",
+        ))
+        self._check_budget(profile)
+        return response
+
+    @staticmethod
+    def _check_budget(profile: RequestProfile):
+        budget = profile.budget
+        if budget is None:
+            return
+        over = []
+        if profile.sql_count > budget.sql:
+            over.append(f"{profile.sql_count} SQL queries (budget {budget.sql})")
+        if budget.mongo is not None and profile.mongo_count > budget.mongo:
+            over.append(f"{profile.mongo_count} Mongo commands (budget {budget.mongo})")
+        if not over:
+            return
+
+        message = f"{profile.view_name} issued {' and '.join(over)}"
+        metrics.inc("query_budget_exceeded_total", view=profile.view_name)
+        mode = getattr(settings, "QUERY_BUDGET_MODE", "log")
+        if mode == "raise":
+            raise QueryBudgetExceeded(message)
+        if mode == "log":
+            logger.warning(message)
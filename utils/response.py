@@ -1,12 +1,15 @@
 from rest_framework.response import Response
 
 
-def success_response(data=None, status=200):
-    return Response({
+def success_response(data=None, status=200, pagination=None):
+    body = {
         "success": True,
         "data": data,
         "error": None
-    }, status=status)
+    }
+    if pagination is not None:
+        body["pagination"] = pagination
+    return Response(body, status=status)
 
 
 def error_response(error_dict, status=400):
@@ -0,0 +1,346 @@
+"""
+Synthetic data for local load testing (seed_data, explain_querysets,
+benchmark_endpoints).
+
+Volumes are drawn from distributions given as short specs, so team sizes
+and task counts can be skewed like production instead of uniform:
+
+    "20"            always 20
+    "uniform:5-40"  5..40, evenly
+    "pareto:20"     heavy-tailed with mean ~20 (few huge teams, many small)
+
+Everything is written with bulk_create; signals (profile creation, cache
+invalidation, ACL invalidation) do not fire, so profiles and chat
+members are created explicitly and caches should be considered cold.
+"""
+import random
+import secrets
+from dataclasses import dataclass, field
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Callable, Dict
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from chats.models import Chat, ChatMember, GroupChat
+from tasks.models import Task, TaskAssignment, TaskNote
+from tasks.services.lifecycle import is_late, rebuild_cycle_times, rebuild_workloads
+from tasks.services.note_reads import rebuild_unread_counters
+from teams.models import Team, TeamMember, TeamRequest
+from users.models import Profile
+
+User = get_user_model()
+
+BATCH_SIZE = 1000
+# Pareto shape; mean = alpha * scale / (alpha - 1)
+PARETO_ALPHA = 1.5
+
+TASK_STATUS_WEIGHTS = {"active": 70, "inactive": 20, "cancelled": 10}
+ASSIGNMENT_STATUS_WEIGHTS = {"assigned": 40, "in_progress": 30, "done": 25, "blocked": 5}
+
+
+def parse_distribution(spec) -> Callable[[random.Random], int]:
+    """
+    Turn a distribution spec (see module docstring) into a sampler.
+    """
+    spec = str(spec).strip()
+    kind, _, args = spec.partition(":")
+    try:
+        if not args:
+            value = int(kind)
+            return lambda rng: value
+        if kind == "uniform":
+            low, high = (int(part) for part in args.split("-"))
+            return lambda rng: rng.randint(low, high)
+        if kind == "pareto":
+            mean = float(args)
+            scale = mean * (PARETO_ALPHA - 1) / PARETO_ALPHA
+            cap = int(mean * 50)
+            return lambda rng: min(cap, int(round(scale * rng.paretovariate(PARETO_ALPHA))))
+    except ValueError:
+        pass
+    raise ValueError(f"Invalid distribution {spec!r}; use N, uniform:A-B or pareto:MEAN")
+
+
+def _weighted(rng: random.Random, weights: Dict[str, int]) -> str:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+@dataclass
+class SeedConfig:
+    users: int = 1000
+    teams: int = 100
+    team_size: str = "pareto:15"
+    tasks_per_team: str = "uniform:10-60"
+    assignees_per_task: str = "uniform:1-3"
+    notes_per_assignment: str = "uniform:0-4"
+    requests_per_team: str = "uniform:0-5"
+    messages_per_chat: str = "0"
+    admins_per_team: int = 2
+    password: str = "seed-password"
+    random_seed: int = 0
+    # unique per run so repeated seeding never collides on email
+    tag: str = field(default_factory=lambda: secrets.token_hex(3))
+
+
+class DataSeeder:
+    """
+    Generate users, profiles, teams, memberships, membership requests,
+    tasks, assignments, notes, one group chat per team and (optionally)
+    Mongo messages in those chats.
+    """
+
+    def __init__(self, config: SeedConfig, log: Callable[[str], None] = lambda line: None):
+        self.config = config
+        self.log = log
+        self.rng = random.Random(config.random_seed)
+        self.now = timezone.now()
+
+    def run(self) -> Dict[str, int]:
+        counts = {}
+        users = self._users()
+        counts["users"] = len(users)
+
+        teams = Team.objects.bulk_create(
+            [Team(title=f"Team {self.config.tag}-{n}") for n in range(self.config.teams)],
+            batch_size=BATCH_SIZE,
+        )
+        counts["teams"] = len(teams)
+
+        members_by_team = self._members(teams, users)
+        counts["team_members"] = sum(len(members) for members in members_by_team.values())
+        counts["team_requests"] = self._requests(teams, users, members_by_team)
+
+        tasks = self._tasks(members_by_team)
+        counts["tasks"] = len(tasks)
+        assignments = self._assignments(tasks, members_by_team)
+        counts["assignments"] = len(assignments)
+        counts["notes"] = self._notes(assignments, members_by_team)
+
+        chat_ids = self._group_chats(teams, members_by_team)
+        counts["chats"] = len(chat_ids)
+        counts["messages"] = self._messages(chat_ids, members_by_team, teams)
+        return counts
+
+    def _users(self):
+        password = make_password(self.config.password)
+        users = User.objects.bulk_create([
+            User(
+                email=f"seed-{self.config.tag}-{n}@example.com",
+                full_name=f"Seed User {n}",
+                password=password,
+            )
+            for n in range(self.config.users)
+        ], batch_size=BATCH_SIZE)
+        Profile.objects.bulk_create([Profile(user=user) for user in users], batch_size=BATCH_SIZE)
+        self.log(f"users        {len(users):>9,}")
+        return users
+
+    def _members(self, teams, users):
+        sample_size = parse_distribution(self.config.team_size)
+        members = []
+        for team in teams:
+            size = max(1, min(len(users), sample_size(self.rng)))
+            for position, user in enumerate(self.rng.sample(users, size)):
+                if position == 0:
+                    role = "owner"
+                elif position <= self.config.admins_per_team:
+                    role = "admin"
+                else:
+                    role = "member"
+                members.append(TeamMember(team=team, user=user, role=role))
+        members = TeamMember.objects.bulk_create(members, batch_size=BATCH_SIZE)
+
+        members_by_team = {team.id: [] for team in teams}
+        for member in members:
+            members_by_team[member.team_id].append(member)
+        self.log(f"team members {len(members):>9,}")
+        return members_by_team
+
+    def _requests(self, teams, users, members_by_team) -> int:
+        sample_count = parse_distribution(self.config.requests_per_team)
+        requests = []
+        for team in teams:
+            member_ids = {member.user_id for member in members_by_team[team.id]}
+            candidates = [user for user in self.rng.sample(users, min(len(users), 50)) if user.id not in member_ids]
+            for user in candidates[:sample_count(self.rng)]:
+                requests.append(TeamRequest(
+                    team=team,
+                    user=user,
+                    status=_weighted(self.rng, {"pending": 70, "accepted": 20, "rejected": 10}),
+                ))
+        TeamRequest.objects.bulk_create(requests, batch_size=BATCH_SIZE)
+        self.log(f"requests     {len(requests):>9,}")
+        return len(requests)
+
+    def _tasks(self, members_by_team):
+        sample_count = parse_distribution(self.config.tasks_per_team)
+        tasks = []
+        for team_id, members in members_by_team.items():
+            admins = [member for member in members if member.role in ("owner", "admin")]
+            for n in range(sample_count(self.rng)):
+                due_date = None
+                if self.rng.random() < 0.6:
+                    due_date = self.now + timedelta(hours=self.rng.randint(-30 * 24, 30 * 24))
+                tasks.append(Task(
+                    team_id=team_id,
+                    title=f"Task {n}",
+                    description="Seeded task",
+                    is_team_task=self.rng.random() < 0.1,
+                    created_by=self.rng.choice(admins),
+                    status=_weighted(self.rng, TASK_STATUS_WEIGHTS),
+                    due_date=due_date,
+                ))
+        tasks = Task.objects.bulk_create(tasks, batch_size=BATCH_SIZE)
+        self.log(f"tasks        {len(tasks):>9,}")
+        return tasks
+
+    def _assignments(self, tasks, members_by_team):
+        sample_count = parse_distribution(self.config.assignees_per_task)
+        assignments = []
+        for task in tasks:
+            members = members_by_team[task.team_id]
+            for member in self.rng.sample(members, min(len(members), sample_count(self.rng))):
+                status = _weighted(self.rng, ASSIGNMENT_STATUS_WEIGHTS)
+                started_at = completed_at = None
+                if status != "assigned":
+                    started_at = self.now - timedelta(hours=self.rng.randint(1, 60 * 24))
+                if status == "done":
+                    completed_at = started_at + timedelta(hours=self.rng.randint(1, 14 * 24))
+                assignments.append(TaskAssignment(
+                    task=task,
+                    member=member,
+                    status=status,
+                    progress=100 if status == "done" else self.rng.randint(0, 90),
+                    started_at=started_at,
+                    completed_at=completed_at,
+                    completed_late=completed_at is not None and is_late(completed_at, task.due_date),
+                ))
+        assignments = TaskAssignment.objects.bulk_create(assignments, batch_size=BATCH_SIZE)
+        rebuild_cycle_times()
+        rebuild_workloads()
+        self.log(f"assignments  {len(assignments):>9,}")
+        return assignments
+
+    def _notes(self, assignments, members_by_team) -> int:
+        sample_count = parse_distribution(self.config.notes_per_assignment)
+        admins_by_team = {
+            team_id: [member for member in members if member.role in ("owner", "admin")]
+            for team_id, members in members_by_team.items()
+        }
+        notes = []
+        for assignment in assignments:
+            admins = admins_by_team[assignment.task.team_id]
+            for n in range(sample_count(self.rng)):
+                # conversation between the assignee and the team's admins
+                author = assignment.member if n % 2 == 0 else self.rng.choice(admins)
+                notes.append(TaskNote(
+                    task=assignment.task,
+                    assignment=assignment,
+                    author=author,
+                    content=f"Note {n}",
+                    is_read=self.rng.random() < 0.5,
+                ))
+        TaskNote.objects.bulk_create(notes, batch_size=BATCH_SIZE)
+        rebuild_unread_counters()
+        self.log(f"notes        {len(notes):>9,}")
+        return len(notes)
+
+    def _group_chats(self, teams, members_by_team):
+        owners = {
+            member.team_id: member.user_id
+            for members in members_by_team.values()
+            for member in members
+            if member.role == "owner"
+        }
+        chats = Chat.objects.bulk_create(
+            [Chat(type=Chat.GROUP, created_by_id=owners[team.id]) for team in teams],
+            batch_size=BATCH_SIZE,
+        )
+        GroupChat.objects.bulk_create(
+            [GroupChat(chat=chat, title=team.title) for chat, team in zip(chats, teams)],
+            batch_size=BATCH_SIZE,
+        )
+        ChatMember.objects.bulk_create([
+            ChatMember(
+                chat=chat,
+                user_id=member.user_id,
+                role=ChatMember.OWNER if member.role == "owner" else ChatMember.MEMBER,
+            )
+            for chat, team in zip(chats, teams)
+            for member in members_by_team[team.id]
+        ], batch_size=BATCH_SIZE)
+        self.log(f"chats        {len(chats):>9,}")
+        return {team.id: chat.id for chat, team in zip(chats, teams)}
+
+    def _messages(self, chat_ids, members_by_team, teams) -> int:
+        sample_count = parse_distribution(self.config.messages_per_chat)
+        counts = {team.id: sample_count(self.rng) for team in teams}
+        if not any(counts.values()):
+            return 0
+
+        # imported lazily: seeding SQL data must not require MongoDB
+        from chats.mongo.message_repository import MessageRepository
+
+        def messages():
+            for team in teams:
+                senders = [member.user_id for member in members_by_team[team.id]]
+                count = counts[team.id]
+                for n in range(count):
+                    yield {
+                        "chat_id": chat_ids[team.id],
+                        "sender_id": self.rng.choice(senders),
+                        "content": f"Message {n}",
+                        "created_at": self.now - timedelta(seconds=(count - n) * 30),
+                    }
+
+        inserted = MessageRepository.bulk_create_messages(messages())
+        self.log(f"messages     {inserted:>9,}")
+        return inserted
+
+
+def sample_fixture() -> SimpleNamespace:
+    """
+    Representative rows for driving endpoints: a team admin, one of the
+    team's tasks with an assigned member, a note, a pending request and
+    the team's group chat. Returns None if the database has no such team.
+    """
+    admin = (
+        TeamMember.objects
+        .filter(role__in=("owner", "admin"), team__tasks__assignments__isnull=False)
+        .select_related("user", "team")
+        .order_by("id")
+        .first()
+    )
+    if admin is None:
+        return None
+    task = Task.objects.filter(team_id=admin.team_id, assignments__isnull=False).order_by("id").first()
+    assignment = (
+        TaskAssignment.objects
+        .filter(task=task)
+        .exclude(member__user=admin.user)
+        .select_related("member__user")
+        .order_by("id")
+        .first()
+    ) or TaskAssignment.objects.filter(task=task).select_related("member__user").order_by("id").first()
+    chat_member = (
+        ChatMember.objects
+        .filter(user=admin.user, chat__type=Chat.GROUP)
+        .select_related("chat__group")
+        .order_by("id")
+        .first()
+    )
+    return SimpleNamespace(
+        admin=admin,
+        admin_user=admin.user,
+        team=admin.team,
+        task=task,
+        assignment=assignment,
+        member=assignment.member,
+        member_user=assignment.member.user,
+        note=TaskNote.objects.filter(task=task).order_by("id").first(),
+        request=TeamRequest.objects.filter(team_id=admin.team_id).order_by("id").first(),
+        chat=chat_member.chat if chat_member else None,
+    )